@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional
+
+from app.database.connection import get_async_db
+from app.api.responses import FastJSONResponse
+from app.services.detection_retention import detection_retention
+from app.services.detection_sightings import query_sightings
+from app.config import LOGS_MAX_LIMIT
+
+router = APIRouter(prefix="/logs", tags=["logs"], default_response_class=FastJSONResponse)
+
+@router.get("/analytics/sightings")
+async def get_sightings(
+    granularity: str = "day",
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    person_id: Optional[int] = None,
+    source: Optional[str] = None,
+    stream_id: Optional[str] = None,
+    limit: int = 1000,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Aparições por pessoa por dia (ou hora), a partir dos agregados
+
+    Os agregados cobrem intervalos completos até a última execução da retenção.
+    """
+    if granularity not in ("day", "hour"):
+        raise HTTPException(status_code=400, detail="Granularidade inválida. Use: day, hour")
+
+    sightings = await db.run_sync(
+        query_sightings,
+        granularity, start_time, end_time, person_id, source, stream_id,
+        max(1, min(limit, LOGS_MAX_LIMIT))
+    )
+    return FastJSONResponse({
+        "granularity": granularity,
+        "sightings": sightings,
+        "last_rollup": detection_retention.last_run
+    })
+
+@router.post("/maintenance/retention")
+def run_retention():
+    """Executa imediatamente um ciclo de agregação e retenção"""
+    try:
+        return FastJSONResponse({"success": True, **detection_retention.run_once()})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro na retenção: {str(e)}")
@@ -0,0 +1,100 @@
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional, Tuple
+import base64
+import threading
+import time
+
+from app.database.models import DetectionLog
+from app.services.counters import counter_service, DETECTION_LOGS
+from app.services.detection_rollups import as_utc
+from app.config import LOGS_TOTAL_CACHE_TTL
+
+# Cache do total de logs por combinação de filtros: chave -> (timestamp, total)
+_total_cache = {}
+_total_cache_lock = threading.Lock()
+_TOTAL_CACHE_MAX_ENTRIES = 256
+
+def encode_cursor(detected_at: datetime, log_id: int) -> str:
+    """Codifica a posição (detected_at, id) do último registro da página"""
+    raw = f"{detected_at.isoformat()}|{log_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decodifica um cursor gerado por encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        detected_at, log_id = raw.rsplit("|", 1)
+        return as_utc(datetime.fromisoformat(detected_at)), int(log_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+def parse_region(region: Optional[str]) -> Optional[Tuple[int, int, int, int]]:
+    """Converte 'x1,y1,x2,y2' em tupla de inteiros"""
+    if not region:
+        return None
+    try:
+        x1, y1, x2, y2 = (int(v) for v in region.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Região inválida. Use: x1,y1,x2,y2")
+    return x1, y1, x2, y2
+
+def apply_filters(query, person_id: Optional[int], source: Optional[str],
+                  start_time: Optional[datetime], end_time: Optional[datetime],
+                  stream_id: Optional[str] = None, region: Optional[Tuple[int, int, int, int]] = None):
+    """
+    Aplica os filtros de pessoa, origem, stream, intervalo de tempo e região
+
+    Os limites de tempo são convertidos para UTC (sem fuso = UTC): o SQLite
+    guarda detected_at em UTC sem fuso e compara os valores como texto.
+    """
+    if stream_id:
+        query = query.filter(DetectionLog.stream_id == stream_id)
+    if region:
+        # Faces inteiramente contidas na região (coordenadas em pixels)
+        x1, y1, x2, y2 = region
+        query = query.filter(
+            DetectionLog.bbox_x >= x1,
+            DetectionLog.bbox_y >= y1,
+            DetectionLog.bbox_x + DetectionLog.bbox_w <= x2,
+            DetectionLog.bbox_y + DetectionLog.bbox_h <= y2
+        )
+    if person_id:
+        query = query.filter(DetectionLog.person_id == person_id)
+    if source:
+        query = query.filter(DetectionLog.source == source)
+    if start_time:
+        query = query.filter(DetectionLog.detected_at >= as_utc(start_time))
+    if end_time:
+        query = query.filter(DetectionLog.detected_at < as_utc(end_time))
+    return query
+
+async def get_cached_total(db: AsyncSession, person_id: Optional[int], source: Optional[str],
+                     start_time: Optional[datetime], end_time: Optional[datetime],
+                     stream_id: Optional[str] = None,
+                     region: Optional[Tuple[int, int, int, int]] = None) -> int:
+    """Retorna o total de logs para os filtros, recalculado no máximo a cada TTL"""
+    key = (person_id, source, start_time, end_time, stream_id, region)
+    if not any(key):
+        # Sem filtros: contador mantido incrementalmente
+        counters = await db.run_sync(counter_service.get_all)
+        return counters.get(DETECTION_LOGS, 0)
+
+    now = time.time()
+
+    with _total_cache_lock:
+        cached = _total_cache.get(key)
+    if cached and now - cached[0] < LOGS_TOTAL_CACHE_TTL:
+        return cached[1]
+
+    query = apply_filters(select(func.count(DetectionLog.id)), person_id, source,
+                          start_time, end_time, stream_id, region)
+    total = (await db.execute(query)).scalar() or 0
+
+    with _total_cache_lock:
+        if len(_total_cache) >= _TOTAL_CACHE_MAX_ENTRIES:
+            _total_cache.clear()
+        _total_cache[key] = (now, total)
+    return total
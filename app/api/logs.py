@@ -0,0 +1,139 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional
+
+from app.database.connection import get_async_db
+from app.database.models import DetectionLog, Person
+from app.api.responses import FastJSONResponse
+from app.api.log_filters import encode_cursor, decode_cursor, parse_region, apply_filters, get_cached_total
+from app.services.detection_export import detection_export_service
+from app.services.detection_export_formats import MEDIA_TYPES
+from app.config import LOGS_MAX_LIMIT
+
+router = APIRouter(prefix="/logs", tags=["logs"], default_response_class=FastJSONResponse)
+
+@router.get("")
+async def get_detection_logs(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    person_id: Optional[int] = None,
+    source: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    stream_id: Optional[str] = None,
+    region: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retorna logs de detecção, do mais recente para o mais antigo
+
+    A paginação usa cursor (keyset): passe `next_cursor` da resposta anterior
+    em `cursor`. `skip` é mantido apenas por compatibilidade.
+    `total` é recalculado no máximo a cada LOGS_TOTAL_CACHE_TTL segundos.
+    `region` ("x1,y1,x2,y2") retorna apenas faces contidas na região.
+    Registros de streams e vídeos são aparições: `detected_at` a `ended_at`,
+    com `detection_count` detecções e o frame de maior confiança em `frame_ref`.
+    """
+    limit = max(1, min(limit, LOGS_MAX_LIMIT))
+    region_box = parse_region(region)
+
+    # Seleção de colunas evita a construção de objetos ORM por linha
+    query = select(
+        DetectionLog.id,
+        DetectionLog.person_id,
+        Person.name,
+        DetectionLog.confidence,
+        DetectionLog.source,
+        DetectionLog.source_info,
+        DetectionLog.detected_at,
+        DetectionLog.ended_at,
+        DetectionLog.detection_count,
+        DetectionLog.frame_ref,
+        DetectionLog.bbox_x,
+        DetectionLog.bbox_y,
+        DetectionLog.bbox_w,
+        DetectionLog.bbox_h
+    ).outerjoin(Person, DetectionLog.person_id == Person.id)
+
+    query = apply_filters(query, person_id, source, start_time, end_time, stream_id, region_box)
+
+    if cursor:
+        cursor_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            DetectionLog.detected_at < cursor_at,
+            and_(DetectionLog.detected_at == cursor_at, DetectionLog.id < cursor_id)
+        ))
+    elif skip:
+        query = query.offset(skip)
+
+    result = await db.execute(
+        query.order_by(DetectionLog.detected_at.desc(), DetectionLog.id.desc()).limit(limit)
+    )
+    rows = result.all()
+
+    logs = [
+        {
+            "id": row.id,
+            "person_id": row.person_id,
+            "person_name": row.name if row.name else "Desconhecido",
+            "confidence": row.confidence,
+            "source": row.source,
+            "source_info": row.source_info,
+            "detected_at": row.detected_at,
+            "ended_at": row.ended_at,
+            "detection_count": row.detection_count,
+            "frame_ref": row.frame_ref,
+            "bounding_box": DetectionLog.bounding_box_dict(row.bbox_x, row.bbox_y, row.bbox_w, row.bbox_h)
+        }
+        for row in rows
+    ]
+
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.detected_at, last.id)
+
+    response = {
+        "logs": logs,
+        "next_cursor": next_cursor
+    }
+    if include_total:
+        response["total"] = await get_cached_total(db, person_id, source, start_time, end_time, stream_id, region_box)
+
+    return FastJSONResponse(response)
+
+@router.get("/export")
+def export_detection_logs(
+    format: str = "csv",
+    person_id: Optional[int] = None,
+    source: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    stream_id: Optional[str] = None
+):
+    """
+    Exporta logs de detecção (com nome da pessoa) em CSV, NDJSON ou Parquet
+
+    O resultado é transmitido em streaming a partir de um cursor do servidor,
+    sem limite de linhas e com memória constante.
+    """
+    try:
+        detection_export_service.validate_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    content = detection_export_service.stream(
+        format, person_id=person_id, source=source,
+        start_time=start_time, end_time=end_time, stream_id=stream_id
+    )
+    filename = f"detection_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
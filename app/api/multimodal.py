@@ -1,6 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
 from typing import List
 import uuid
 import cv2
@@ -8,8 +7,7 @@ import numpy as np
 from pathlib import Path
 from io import BytesIO
 
-from app.database.connection import get_db
-from app.database.models import DetectionLog, Person
+from app.services.detection_log_writer import detection_log_writer
 from app.services.multimodal_detection import multimodal_service
 from app.config import TEMP_DIR, ALLOWED_EXTENSIONS
 
@@ -18,8 +16,7 @@ router = APIRouter(prefix="/multimodal", tags=["multimodal detection"])
 @router.post("/detect-comprehensive")
 async def comprehensive_detection(
     file: UploadFile = File(...),
-    include_llm_analysis: bool = True,
-    db: Session = Depends(get_db)
+    include_llm_analysis: bool = True
 ):
     """
     Detecção completa: faces + objetos + animais + análise LLM
@@ -73,23 +70,17 @@ async def comprehensive_detection(
             # Gerar resumo
             results["summary"] = multimodal_service._generate_summary(results)
         
-        # Log das detecções (opcional)
+        # Log das detecções (opcional, gravação assíncrona em lote)
         try:
             for obj in results.get("objects", []):
-                detection_log = DetectionLog(
+                bbox = obj["bbox"]
+                detection_log_writer.submit(
                     person_id=None,
                     confidence=obj["confidence"],
                     source='multimodal_upload',
-                    source_info=f"{obj['class']} - {file.filename}"
-                )
-                bbox = obj["bbox"]
-                detection_log.set_bounding_box(
-                    int(bbox[0]), int(bbox[1]), 
-                    int(bbox[2] - bbox[0]), int(bbox[3] - bbox[1])
+                    source_info=f"{obj['class']} - {file.filename}",
+                    bbox=(bbox[0], bbox[1], bbox[2] - bbox[0], bbox[3] - bbox[1])
                 )
-                db.add(detection_log)
-            
-            db.commit()
         except Exception as e:
             # Log error but don't fail the request
             pass
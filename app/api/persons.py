@@ -9,6 +9,8 @@ from app.database.connection import get_db
 from app.database.models import Person, FaceEmbedding
 from app.models.schemas import PersonCreate, PersonUpdate, PersonResponse, ImageUploadResponse, GenericResponse
 from app.services.face_recognition import face_service
+from app.services.counters import counter_service, PERSONS_ACTIVE, FACE_EMBEDDINGS
+from app.services.face_gallery import face_gallery
 from app.config import UPLOADS_DIR, ALLOWED_EXTENSIONS
 
 router = APIRouter(prefix="/persons", tags=["persons"])
@@ -23,6 +25,7 @@ def create_person(person: PersonCreate, db: Session = Depends(get_db)):
     
     db_person = Person(**person.dict())
     db.add(db_person)
+    counter_service.increment(db, PERSONS_ACTIVE, 1)
     db.commit()
     db.refresh(db_person)
     
@@ -60,8 +63,12 @@ def update_person(person_id: int, person_update: PersonUpdate, db: Session = Dep
     for field, value in update_data.items():
         setattr(person, field, value)
     
+    if update_data.get("is_active") is False:
+        counter_service.increment(db, PERSONS_ACTIVE, -1)
+    
     db.commit()
     db.refresh(person)
+    face_gallery.invalidate()
     return person
 
 @router.delete("/{person_id}", response_model=GenericResponse)
@@ -72,7 +79,9 @@ def delete_person(person_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Pessoa não encontrada")
     
     person.is_active = False
+    counter_service.increment(db, PERSONS_ACTIVE, -1)
     db.commit()
+    face_gallery.invalidate()
     
     return GenericResponse(success=True, message="Pessoa removida com sucesso")
 
@@ -151,7 +160,9 @@ async def upload_person_images(
                 temp_path.unlink()
             continue
     
+    counter_service.increment(db, FACE_EMBEDDINGS, faces_added)
     db.commit()
+    face_gallery.invalidate()
     
     return ImageUploadResponse(
         success=True,
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import uuid
 import cv2
@@ -8,10 +9,11 @@ import numpy as np
 from pathlib import Path
 from io import BytesIO
 
-from app.database.connection import get_db
-from app.database.models import Person, FaceEmbedding, DetectionLog
+from app.database.connection import get_async_db
+from app.database.models import Person, FaceEmbedding
 from app.models.schemas import ImageRecognitionResponse, BoundingBox, FaceRecognitionResult
 from app.services.face_recognition import face_service
+from app.services.detection_log_writer import detection_log_writer
 from app.config import TEMP_DIR, ALLOWED_EXTENSIONS
 
 router = APIRouter(prefix="/recognition", tags=["recognition"])
@@ -19,7 +21,7 @@ router = APIRouter(prefix="/recognition", tags=["recognition"])
 @router.post("/recognize-image", response_model=ImageRecognitionResponse)
 async def recognize_faces_in_image(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Reconhece faces em uma imagem enviada"""
     # Verificar extensão do arquivo
@@ -49,11 +51,13 @@ async def recognize_faces_in_image(
         
         # Obter todos os embeddings conhecidos do banco
         known_embeddings = []
-        embeddings_query = db.query(FaceEmbedding, Person).join(
-            Person, FaceEmbedding.person_id == Person.id
-        ).filter(Person.is_active == True).all()
+        embeddings_query = await db.execute(
+            select(FaceEmbedding, Person)
+            .join(Person, FaceEmbedding.person_id == Person.id)
+            .where(Person.is_active == True)
+        )
         
-        for embedding_record, person in embeddings_query:
+        for embedding_record, person in embeddings_query.all():
             embedding_array = embedding_record.get_embedding()
             known_embeddings.append((person.id, person.name, embedding_array))
         
@@ -89,15 +93,14 @@ async def recognize_faces_in_image(
                 if best_match and best_confidence >= 0.4:  # Threshold de reconhecimento
                     person_id, person_name = best_match
                     
-                    # Registrar log de detecção
-                    detection_log = DetectionLog(
+                    # Registrar log de detecção (gravação assíncrona em lote)
+                    detection_log_writer.submit(
                         person_id=person_id,
                         confidence=best_confidence,
                         source='upload',
-                        source_info=file.filename
+                        source_info=file.filename,
+                        bbox=(bbox[0], bbox[1], bbox[2] - bbox[0], bbox[3] - bbox[1])
                     )
-                    detection_log.set_bounding_box(bbox[0], bbox[1], bbox[2] - bbox[0], bbox[3] - bbox[1])
-                    db.add(detection_log)
                     
                     recognitions.append(FaceRecognitionResult(
                         person_id=person_id,
@@ -107,14 +110,13 @@ async def recognize_faces_in_image(
                     ))
                 else:
                     # Face não reconhecida
-                    detection_log = DetectionLog(
+                    detection_log_writer.submit(
                         person_id=None,
                         confidence=detection['confidence'],
                         source='upload',
-                        source_info=file.filename
+                        source_info=file.filename,
+                        bbox=(bbox[0], bbox[1], bbox[2] - bbox[0], bbox[3] - bbox[1])
                     )
-                    detection_log.set_bounding_box(bbox[0], bbox[1], bbox[2] - bbox[0], bbox[3] - bbox[1])
-                    db.add(detection_log)
                     
                     recognitions.append(FaceRecognitionResult(
                         person_id=None,
@@ -131,8 +133,6 @@ async def recognize_faces_in_image(
                     bbox=bbox_obj
                 ))
         
-        db.commit()
-        
         return ImageRecognitionResponse(
             success=True,
             message=f"Processamento concluído. {len(face_detections)} faces detectadas.",
@@ -151,7 +151,7 @@ async def recognize_faces_in_image(
 @router.post("/recognize-image-annotated")
 async def recognize_and_annotate_image(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Reconhece faces e retorna imagem anotada com detecções"""
     # Verificar extensão do arquivo
@@ -177,11 +177,13 @@ async def recognize_and_annotate_image(
         if face_detections:
             # Obter embeddings conhecidos
             known_embeddings = []
-            embeddings_query = db.query(FaceEmbedding, Person).join(
-                Person, FaceEmbedding.person_id == Person.id
-            ).filter(Person.is_active == True).all()
+            embeddings_query = await db.execute(
+                select(FaceEmbedding, Person)
+                .join(Person, FaceEmbedding.person_id == Person.id)
+                .where(Person.is_active == True)
+            )
             
-            for embedding_record, person in embeddings_query:
+            for embedding_record, person in embeddings_query.all():
                 embedding_array = embedding_record.get_embedding()
                 known_embeddings.append((person.id, person.name, embedding_array))
             
@@ -0,0 +1,103 @@
+import gzip
+from typing import Any, Dict
+
+import anyio
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import JSON_COMPRESSION_MIN_SIZE, JSON_COMPRESSION_LEVEL
+from app.services.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """Resposta JSON serializada com orjson, com suporte nativo a numpy"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Codificações aceitas pelo cliente com seus pesos q (ex: 'gzip;q=0.5, br' -> {'gzip': 0.5, 'br': 1.0})"""
+    weights = {}
+    for item in header.split(","):
+        token, *params = (part.strip() for part in item.split(";"))
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[token.lower()] = q
+    return weights
+
+
+class JSONCompressionMiddleware:
+    """
+    Comprime respostas JSON grandes com gzip
+
+    Apenas respostas `application/json` de corpo único acima de `minimum_size`
+    são comprimidas; streams (MJPEG, exportações, clips) passam sem alteração,
+    o que o GZipMiddleware do Starlette não garante (ele também comprime e
+    retém em buffer respostas em streaming).
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = JSON_COMPRESSION_MIN_SIZE,
+                 level: int = JSON_COMPRESSION_LEVEL):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    def _select_encoding(self, scope: Scope) -> str:
+        """'gzip' se o cliente aceita gzip com q > 0 (explicitamente ou via '*')"""
+        weights = parse_accept_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        q = weights.get("gzip", weights.get("x-gzip", weights.get("*", 0.0)))
+        return "gzip" if q > 0 else ""
+
+    def _compress(self, body: bytes) -> bytes:
+        return gzip.compress(body, compresslevel=self.level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._select_encoding(scope)
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                # Adiar o início até conhecer o corpo
+                start_message = message
+                return
+
+            if message["type"] == "http.response.body" and start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                body = message.get("body", b"")
+
+                if (not message.get("more_body", False)
+                        and headers.get("content-type", "").startswith("application/json")
+                        and "content-encoding" not in headers
+                        and len(body) >= self.minimum_size):
+                    body = await anyio.to_thread.run_sync(self._compress, body)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    headers.add_vary_header("Accept-Encoding")
+                    message = {**message, "body": body}
+
+                await send(start_message)
+                start_message = None
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
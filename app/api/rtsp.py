@@ -1,34 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
 from typing import List
 import asyncio
 
-from app.database.connection import get_db
-from app.database.models import DetectionLog, Person
-from app.models.schemas import RTSPStreamRequest, RTSPStreamResponse, RTSPStreamInfo, GenericResponse
+from app.models.schemas import GenericResponse
+from app.models.rtsp_schemas import RTSPStreamRequest, RTSPStreamResponse, RTSPStreamInfo, DetectionZone
 from app.services.rtsp_service import rtsp_processor
-from app.services.face_recognition import face_service
+from app.services.rtsp_session import probe_capture
+from app.services.prometheus_export import to_prometheus
+from app.config import RTSP_TIMEOUT
 
 router = APIRouter(prefix="/rtsp", tags=["rtsp"])
 
-async def detection_callback(stream_id: str, frame, detections, db: Session = None):
-    """Callback chamado quando faces são detectadas em stream RTSP"""
-    if not detections:
-        return
-    
-    # Esta função seria chamada em contexto assíncrono
-    # Por isso, seria necessário criar uma nova sessão de banco aqui
-    # Para simplicidade, vamos pular o log automático por agora
-    pass
-
 @router.post("/streams", response_model=RTSPStreamResponse)
-def add_rtsp_stream(stream_request: RTSPStreamRequest, db: Session = Depends(get_db)):
-    """Adiciona um novo stream RTSP para monitoramento"""
+def add_rtsp_stream(stream_request: RTSPStreamRequest):
+    """
+    Adiciona um novo stream RTSP para monitoramento
+    
+    Retorna imediatamente com o stream em "connecting"; a conexão e as
+    reconexões acontecem em background (acompanhe o campo `state`).
+    """
     success = rtsp_processor.add_stream(
         stream_request.stream_id,
         stream_request.rtsp_url,
-        callback=detection_callback
+        priority=stream_request.priority,
+        target_fps=stream_request.target_fps,
+        latency_budget_ms=stream_request.latency_budget_ms,
+        motion_gating=stream_request.motion_gating,
+        motion_sensitivity=stream_request.motion_sensitivity,
+        motion_mask=stream_request.motion_mask,
+        record_clips=stream_request.record_clips,
+        clip_pre_seconds=stream_request.clip_pre_seconds,
+        clip_post_seconds=stream_request.clip_post_seconds,
+        zones=[zone.model_dump() for zone in stream_request.zones] if stream_request.zones else None,
+        recognize=stream_request.recognize
     )
     
     if success:
@@ -62,12 +67,52 @@ def remove_rtsp_stream(stream_id: str):
             detail="Stream não encontrado"
         )
 
+@router.post("/streams/{stream_id}/restart", response_model=GenericResponse)
+def restart_rtsp_stream(stream_id: str):
+    """Reinicia a conexão de um stream que desistiu após falhas seguidas ("failed")"""
+    if not rtsp_processor.restart_stream(stream_id):
+        raise HTTPException(status_code=404, detail="Stream não encontrado")
+    return GenericResponse(success=True, message=f"Stream {stream_id} reiniciado")
+
 @router.get("/streams", response_model=List[RTSPStreamInfo])
 def list_rtsp_streams():
     """Lista todos os streams RTSP ativos"""
     streams = rtsp_processor.list_streams()
     return [RTSPStreamInfo(**stream) for stream in streams]
 
+@router.get("/metrics")
+def get_rtsp_metrics(format: str = "json"):
+    """
+    Telemetria de todos os streams: FPS de captura e de análise, tempos de
+    leitura, decodificação, espera, detecção e reconhecimento, frames
+    descartados, fila e reconexões
+
+    format: "json" ou "prometheus" (formato de exposição texto)
+    """
+    if format not in ("json", "prometheus"):
+        raise HTTPException(status_code=400, detail="Formato inválido (use json ou prometheus)")
+
+    streams = rtsp_processor.list_streams()
+    if format == "prometheus":
+        return PlainTextResponse(to_prometheus(streams), media_type="text/plain; version=0.0.4")
+    return {
+        "streams": {
+            stream["stream_id"]: {
+                "state": stream["state"],
+                "worker": stream.get("worker"),
+                **(stream.get("metrics") or {})
+            }
+            for stream in streams
+        }
+    }
+
+@router.put("/streams/{stream_id}/zones", response_model=GenericResponse)
+def set_rtsp_stream_zones(stream_id: str, zones: List[DetectionZone]):
+    """Substitui as zonas de interesse de um stream (lista vazia = frame inteiro)"""
+    if not rtsp_processor.set_zones(stream_id, [zone.model_dump() for zone in zones]):
+        raise HTTPException(status_code=404, detail="Stream não encontrado")
+    return GenericResponse(success=True, message=f"{len(zones)} zona(s) definida(s) para o stream {stream_id}")
+
 @router.get("/streams/{stream_id}", response_model=RTSPStreamInfo)
 def get_rtsp_stream_info(stream_id: str):
     """Obtém informações sobre um stream específico"""
@@ -81,87 +126,17 @@ def get_rtsp_stream_info(stream_id: str):
             detail="Stream não encontrado"
         )
 
-@router.get("/streams/{stream_id}/frame")
-def get_latest_frame(stream_id: str):
-    """Obtém o último frame processado de um stream"""
-    frame_bytes = rtsp_processor.get_latest_frame(stream_id)
-    
-    if frame_bytes:
-        def generate():
-            yield frame_bytes
-        
-        return StreamingResponse(
-            generate(),
-            media_type="image/jpeg",
-            headers={"Content-Disposition": f"inline; filename={stream_id}_latest.jpg"}
-        )
-    else:
-        raise HTTPException(
-            status_code=404,
-            detail="Stream não encontrado ou sem frames disponíveis"
-        )
-
-@router.get("/streams/{stream_id}/mjpeg")
-def get_mjpeg_stream(stream_id: str):
-    """Retorna stream MJPEG do processamento em tempo real"""
-    def generate_mjpeg():
-        while True:
-            frame_bytes = rtsp_processor.get_latest_frame(stream_id)
-            if frame_bytes:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            else:
-                # Se não há frame, aguardar um pouco
-                import time
-                time.sleep(0.1)
-    
-    stream_info = rtsp_processor.get_stream_info(stream_id)
-    if not stream_info:
-        raise HTTPException(status_code=404, detail="Stream não encontrado")
-    
-    return StreamingResponse(
-        generate_mjpeg(),
-        media_type="multipart/x-mixed-replace; boundary=frame"
-    )
-
 @router.post("/streams/{stream_id}/test-connection")
-def test_rtsp_connection(stream_id: str, rtsp_url: str):
-    """Testa conexão com uma URL RTSP sem adicionar ao monitoramento"""
-    import cv2
+async def test_rtsp_connection(stream_id: str, rtsp_url: str):
+    """
+    Testa conexão com uma URL RTSP sem adicionar ao monitoramento
     
+    A negociação roda fora do event loop e é limitada a RTSP_TIMEOUT segundos.
+    """
     try:
-        cap = cv2.VideoCapture(rtsp_url)
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        
-        if not cap.isOpened():
-            return {
-                "success": False,
-                "message": "Não foi possível conectar ao stream RTSP",
-                "rtsp_url": rtsp_url
-            }
-        
-        # Tentar ler um frame
-        ret, frame = cap.read()
-        cap.release()
-        
-        if ret:
-            height, width = frame.shape[:2]
-            return {
-                "success": True,
-                "message": "Conexão RTSP bem-sucedida",
-                "rtsp_url": rtsp_url,
-                "resolution": f"{width}x{height}"
-            }
-        else:
-            return {
-                "success": False,
-                "message": "Conectado ao stream mas não foi possível ler frames",
-                "rtsp_url": rtsp_url
-            }
-    
+        result = await asyncio.wait_for(asyncio.to_thread(probe_capture, rtsp_url), timeout=RTSP_TIMEOUT)
+    except asyncio.TimeoutError:
+        result = {"success": False, "message": f"Tempo esgotado após {RTSP_TIMEOUT}s"}
     except Exception as e:
-        return {
-            "success": False,
-            "message": f"Erro ao testar conexão: {str(e)}",
-            "rtsp_url": rtsp_url
-        } 
\ No newline at end of file
+        result = {"success": False, "message": f"Erro ao testar conexão: {str(e)}"}
+    return {**result, "rtsp_url": rtsp_url}
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from typing import List, Optional
+
+from app.models.schemas import GenericResponse
+from app.models.rtsp_schemas import RTSPClipInfo
+from app.services.clip_store import list_clips, get_clip_path, delete_clip
+
+router = APIRouter(prefix="/rtsp", tags=["rtsp"])
+
+@router.get("/clips", response_model=List[RTSPClipInfo])
+def list_rtsp_clips(stream_id: Optional[str] = None, limit: int = 50):
+    """Lista os clips gravados em torno de detecções (mais recentes primeiro)"""
+    return [RTSPClipInfo(**clip) for clip in list_clips(stream_id)[:max(1, limit)]]
+
+@router.get("/clips/{clip_id}")
+def download_rtsp_clip(clip_id: str):
+    """Baixa um clip (AVI Motion-JPEG)"""
+    path = get_clip_path(clip_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Clip não encontrado")
+    return FileResponse(path=str(path), filename=f"{clip_id}.avi", media_type="video/x-msvideo")
+
+@router.delete("/clips/{clip_id}", response_model=GenericResponse)
+def delete_rtsp_clip(clip_id: str):
+    """Remove um clip do disco"""
+    if not delete_clip(clip_id):
+        raise HTTPException(status_code=404, detail="Clip não encontrado")
+    return GenericResponse(success=True, message=f"Clip {clip_id} removido")
@@ -0,0 +1,121 @@
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
+import time
+from anyio import CancelScope, to_thread
+
+from app.services.rtsp_service import rtsp_processor
+from app.services.event_bus import event_bus
+from app.services.serialization import dumps
+from app.config import (
+    RTSP_TIMEOUT, MJPEG_DEFAULT_FPS, MJPEG_MAX_FPS, MJPEG_DEFAULT_QUALITY,
+    EVENT_WS_SEND_TIMEOUT, EVENT_WS_PING_INTERVAL
+)
+
+router = APIRouter(prefix="/rtsp", tags=["rtsp"])
+
+@router.get("/streams/{stream_id}/frame")
+def get_latest_frame(stream_id: str, quality: int = MJPEG_DEFAULT_QUALITY):
+    """Obtém o último frame processado de um stream"""
+    frame_bytes = rtsp_processor.get_latest_frame(stream_id, max(10, min(quality, 95)))
+    
+    if frame_bytes:
+        def generate():
+            yield frame_bytes
+        
+        return StreamingResponse(
+            generate(),
+            media_type="image/jpeg",
+            headers={"Content-Disposition": f"inline; filename={stream_id}_latest.jpg"}
+        )
+    else:
+        raise HTTPException(
+            status_code=404,
+            detail="Stream não encontrado ou sem frames disponíveis"
+        )
+
+@router.get("/streams/{stream_id}/mjpeg")
+def get_mjpeg_stream(stream_id: str, fps: float = MJPEG_DEFAULT_FPS, quality: int = MJPEG_DEFAULT_QUALITY):
+    """
+    Retorna stream MJPEG do processamento em tempo real
+    
+    Cada frame é codificado uma única vez e compartilhado entre os viewers;
+    `fps` limita a taxa deste viewer e `quality` define a qualidade JPEG.
+    """
+    broadcaster = rtsp_processor.get_broadcaster(stream_id)
+    if broadcaster is None:
+        raise HTTPException(status_code=404, detail="Stream não encontrado")
+    
+    interval = 1.0 / max(0.1, min(fps, MJPEG_MAX_FPS))
+    quality = max(10, min(quality, 95))
+    
+    async def generate_mjpeg():
+        version = 0
+        # Fora do event loop: em modo multiprocesso o worker é avisado pelo pipe
+        await to_thread.run_sync(broadcaster.add_viewer)
+        try:
+            while not broadcaster.closed:
+                # Aguardar a próxima versão sem polling (acordado pela captura)
+                if not await broadcaster.wait_newer(version, timeout=RTSP_TIMEOUT):
+                    continue
+                
+                sent_at = time.monotonic()
+                result = await to_thread.run_sync(broadcaster.get_jpeg, quality)
+                if result is None:
+                    continue
+                version, frame_bytes = result
+                yield (b'--frame\r\n'
+                       b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+                
+                # Limite de FPS deste viewer
+                remaining = interval - (time.monotonic() - sent_at)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+        finally:
+            # Protegido do cancelamento da resposta (desconexão do cliente)
+            with CancelScope(shield=True):
+                await to_thread.run_sync(broadcaster.remove_viewer)
+    
+    return StreamingResponse(
+        generate_mjpeg(),
+        media_type="multipart/x-mixed-replace; boundary=frame"
+    )
+
+@router.websocket("/events")
+async def stream_events(websocket: WebSocket, stream_id: Optional[str] = None, types: Optional[str] = None):
+    """
+    Envia em tempo real os eventos dos streams (detecções e mudanças de estado)
+    
+    `stream_id` e `types` aceitam listas separadas por vírgula. Cada cliente tem
+    uma fila limitada: se não acompanhar, os eventos mais antigos são descartados
+    (informado em uma mensagem `dropped`) e, se um envio exceder
+    EVENT_WS_SEND_TIMEOUT, a conexão é encerrada.
+    """
+    await websocket.accept()
+    subscription = event_bus.subscribe(
+        stream_ids=stream_id.split(",") if stream_id else None,
+        event_types=types.split(",") if types else None
+    )
+    reported_drops = 0
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), EVENT_WS_PING_INTERVAL)
+            except asyncio.TimeoutError:
+                event = {"type": "ping", "timestamp": time.time()}
+            
+            if subscription.dropped > reported_drops:
+                await asyncio.wait_for(
+                    websocket.send_text(dumps({"type": "dropped", "count": subscription.dropped - reported_drops}).decode()),
+                    EVENT_WS_SEND_TIMEOUT
+                )
+                reported_drops = subscription.dropped
+            await asyncio.wait_for(websocket.send_text(dumps(event).decode()), EVENT_WS_SEND_TIMEOUT)
+    except asyncio.TimeoutError:
+        # Consumidor lento: liberar a conexão
+        await websocket.close(code=1013)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        event_bus.unsubscribe(subscription)
@@ -8,13 +8,16 @@ from pathlib import Path
 import json
 
 from app.database.connection import get_db
-from app.database.models import Person, FaceEmbedding, DetectionLog
+from app.database.models import Person, FaceEmbedding
 from app.services.video_processing import video_service
+from app.services.job_results import job_result_store
+from app.api.responses import FastJSONResponse
 from app.config import TEMP_DIR
 
-router = APIRouter(prefix="/video", tags=["video processing"])
+router = APIRouter(prefix="/video", tags=["video processing"], default_response_class=FastJSONResponse)
 
-# Armazenamento temporário de jobs de processamento
+# Armazenamento temporário de jobs de processamento (apenas estado e resumo;
+# os resultados completos ficam em disco via job_result_store)
 processing_jobs = {}
 
 @router.post("/process-upload")
@@ -68,7 +71,7 @@ async def process_uploaded_video(
             "max_frames": max_frames,
             "generate_annotated": generate_annotated,
             "report_format": report_format,
-            "results": None,
+            "summary": None,
             "annotated_video_path": None,
             "report_path": None,
             "error": None
@@ -129,7 +132,7 @@ async def process_youtube_video(
         "generate_annotated": generate_annotated,
         "report_format": report_format,
         "video_path": None,
-        "results": None,
+        "summary": None,
         "annotated_video_path": None,
         "report_path": None,
         "error": None
@@ -166,7 +169,12 @@ def get_job_status(job_id: str):
     
     if job["status"] == "completed":
         response.update({
-            "results": job["results"],
+            "summary": job["summary"],
+            "results_urls": {
+                "summary": f"/api/video/job/{job_id}/summary",
+                "frames": f"/api/video/job/{job_id}/frames",
+                "timeline": f"/api/video/job/{job_id}/timeline"
+            },
             "download_urls": {
                 "report": f"/api/video/job/{job_id}/download/report",
                 "annotated_video": f"/api/video/job/{job_id}/download/video" if job["annotated_video_path"] else None
@@ -175,7 +183,8 @@ def get_job_status(job_id: str):
     elif job["status"] == "failed":
         response["error"] = job["error"]
     
-    return response
+    # Resposta direta: evita jsonable_encoder e serializa arrays numpy nativamente
+    return FastJSONResponse(response)
 
 @router.get("/job/{job_id}/download/report")
 def download_report(job_id: str):
@@ -237,19 +246,15 @@ def list_jobs(limit: int = 20):
         elif "youtube_url" in job:
             job_summary["source"] = f"YouTube: {job['youtube_url']}"
         
-        if job["status"] == "completed" and job["results"]:
-            stats = job["results"]["statistics"]
-            job_summary["summary"] = {
-                "faces_detected": stats["total_faces_detected"],
-                "unique_persons": len(stats["unique_persons_found"])
-            }
+        if job["status"] == "completed" and job["summary"]:
+            job_summary["summary"] = job["summary"]
         
         jobs_list.append(job_summary)
     
-    return {
+    return FastJSONResponse({
         "jobs": jobs_list,
         "total_active_jobs": len(processing_jobs)
-    }
+    })
 
 @router.delete("/job/{job_id}")
 def cancel_job(job_id: str):
@@ -282,6 +287,8 @@ def cancel_job(job_id: str):
         except:
             pass
     
+    job_result_store.delete(job_id)
+    
     # Remover job da lista
     del processing_jobs[job_id]
     
@@ -310,6 +317,7 @@ def cleanup_old_jobs(older_than_hours: int = 24):
                     except:
                         pass
             
+            job_result_store.delete(job_id)
             del processing_jobs[job_id]
             removed_jobs.append(job_id)
     
@@ -375,10 +383,10 @@ async def _process_video_job(job_id: str, db: Session):
             job["video_path"],
             known_persons,
             job["frame_interval"],
-            job["max_frames"]
+            job["max_frames"],
+            log_source_info=f"upload_{job_id}"
         )
         
-        job["results"] = results
         job["progress"] = 70
         
         # Gerar relatório
@@ -394,12 +402,18 @@ async def _process_video_job(job_id: str, db: Session):
             )
             job["annotated_video_path"] = annotated_path
         
+        # Persistir resultados em disco e manter apenas o resumo em memória
+        summary = job_result_store.save(job_id, results)
+        job["summary"] = {
+            "faces_detected": summary["faces_detected"],
+            "unique_persons": summary["unique_persons"],
+            "frames_analyzed": summary["frames_analyzed"],
+            "processing_duration": summary["processing_info"]["processing_duration"]
+        }
+        
         job["progress"] = 100
         job["status"] = "completed"
         
-        # Salvar logs no banco (opcional)
-        _save_detection_logs(results, db, f"upload_{job_id}")
-        
     except Exception as e:
         job["status"] = "failed"
         job["error"] = str(e)
@@ -432,32 +446,6 @@ async def _process_youtube_job(job_id: str, db: Session):
         job["error"] = str(e)
         logger.error(f"Erro no job YouTube {job_id}: {e}")
 
-def _save_detection_logs(results: dict, db: Session, source: str):
-    """Salva logs de detecção no banco de dados"""
-    try:
-        for frame_data in results["detections_by_frame"]:
-            for face in frame_data["faces"]:
-                recognition = face.get("recognition")
-                
-                detection_log = DetectionLog(
-                    person_id=recognition["person_id"] if recognition else None,
-                    confidence=recognition["confidence"] if recognition else face["confidence"],
-                    source='video_processing',
-                    source_info=f"{source} - timestamp: {frame_data['timestamp']:.1f}s"
-                )
-                
-                bbox = face["bbox"]
-                detection_log.set_bounding_box(
-                    bbox[0], bbox[1], 
-                    bbox[2] - bbox[0], bbox[3] - bbox[1]
-                )
-                
-                db.add(detection_log)
-        
-        db.commit()
-    except Exception as e:
-        logger.warning(f"Erro ao salvar logs de detecção: {e}")
-
 import time
 import logging
 logger = logging.getLogger(__name__) 
\ No newline at end of file
@@ -0,0 +1,99 @@
+from fastapi import APIRouter, HTTPException
+
+from app.api.responses import FastJSONResponse
+from app.api.video import processing_jobs
+from app.services.job_results import job_result_store
+from app.config import VIDEO_FRAMES_PAGE_SIZE, VIDEO_FRAMES_MAX_PAGE_SIZE
+
+# Resultados paginados de jobs de vídeo concluídos (lidos do disco via job_result_store)
+router = APIRouter(prefix="/video", tags=["video processing"], default_response_class=FastJSONResponse)
+
+def _get_completed_job(job_id: str) -> dict:
+    """Obtém um job concluído ou lança HTTPException"""
+    if job_id not in processing_jobs:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    
+    job = processing_jobs[job_id]
+    if job["status"] != "completed":
+        raise HTTPException(status_code=400, detail="Resultados ainda não disponíveis")
+    
+    return job
+
+@router.get("/job/{job_id}/summary")
+def get_job_summary(job_id: str):
+    """Retorna o resumo completo do processamento (sem detecções por frame)"""
+    _get_completed_job(job_id)
+    
+    summary = job_result_store.load_summary(job_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Resultados não encontrados")
+    
+    return FastJSONResponse({"job_id": job_id, **summary})
+
+@router.get("/job/{job_id}/frames")
+def get_job_frames(job_id: str, offset: int = 0, limit: int = VIDEO_FRAMES_PAGE_SIZE):
+    """Retorna detecções por frame de forma paginada"""
+    _get_completed_job(job_id)
+    
+    offset = max(0, offset)
+    limit = max(1, min(limit, VIDEO_FRAMES_MAX_PAGE_SIZE))
+    page = job_result_store.get_frames(job_id, offset, limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Resultados não encontrados")
+    
+    frames, total = page
+    next_offset = offset + len(frames)
+    return FastJSONResponse({
+        "job_id": job_id,
+        "frames": frames,
+        "offset": offset,
+        "limit": limit,
+        "total": total,
+        "next_offset": next_offset if next_offset < total else None
+    })
+
+@router.get("/job/{job_id}/timeline")
+def get_job_timeline(job_id: str):
+    """Lista as pessoas encontradas com resumo da timeline de cada uma"""
+    _get_completed_job(job_id)
+    
+    summary = job_result_store.load_summary(job_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Resultados não encontrados")
+    
+    persons = [
+        {**person, "timeline_url": f"/api/video/job/{job_id}/timeline/{person['person_id']}"}
+        for person in summary["persons"]
+    ]
+    return FastJSONResponse({"job_id": job_id, "persons": persons})
+
+@router.get("/job/{job_id}/timeline/{person_id}")
+def get_person_timeline(job_id: str, person_id: int, offset: int = 0, limit: int = VIDEO_FRAMES_PAGE_SIZE):
+    """Retorna as aparições de uma pessoa no vídeo de forma paginada"""
+    _get_completed_job(job_id)
+    
+    timeline = job_result_store.get_timeline(job_id)
+    if timeline is None:
+        raise HTTPException(status_code=404, detail="Resultados não encontrados")
+    
+    person_timeline = timeline.get(str(person_id))
+    if person_timeline is None:
+        raise HTTPException(status_code=404, detail="Pessoa não encontrada neste vídeo")
+    
+    offset = max(0, offset)
+    limit = max(1, min(limit, VIDEO_FRAMES_MAX_PAGE_SIZE))
+    appearances = person_timeline["appearances"]
+    next_offset = offset + limit
+    
+    return FastJSONResponse({
+        "job_id": job_id,
+        "person_id": person_id,
+        "name": person_timeline["name"],
+        "total_time": person_timeline["total_time"],
+        "average_confidence": person_timeline["average_confidence"],
+        "appearances": appearances[offset:next_offset],
+        "offset": offset,
+        "limit": limit,
+        "total": len(appearances),
+        "next_offset": next_offset if next_offset < len(appearances) else None
+    })
@@ -0,0 +1,108 @@
+import json
+import logging
+from typing import Dict, Optional
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.database.models import Base
+
+logger = logging.getLogger(__name__)
+
+def ensure_indexes(engine: Engine):
+    """Cria índices declarados nos modelos que ainda não existem em tabelas antigas"""
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                logger.info(f"Criando índice {index.name} em {table.name}")
+                index.create(bind=engine)
+
+def ensure_columns(engine: Engine):
+    """Adiciona colunas anuláveis declaradas nos modelos e ausentes em tabelas antigas"""
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            logger.info(f"Adicionando coluna {table.name}.{column.name}")
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+# Versão do esquema SQLite (PRAGMA user_version) a partir da qual os timestamps estão normalizados
+SQLITE_TIMESTAMPS_VERSION = 1
+
+def normalize_sqlite_timestamps(engine: Engine):
+    """
+    Padroniza detected_at no SQLite para o formato com microssegundos
+
+    Registros antigos (server_default CURRENT_TIMESTAMP) não têm fração de
+    segundo, o que quebra a comparação textual usada na paginação por cursor.
+    Executada uma única vez: a versão aplicada fica em PRAGMA user_version
+    (todas as gravações atuais já informam detected_at com microssegundos).
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        if conn.execute(text("PRAGMA user_version")).scalar() >= SQLITE_TIMESTAMPS_VERSION:
+            return
+        result = conn.execute(text(
+            "UPDATE detection_logs SET detected_at = detected_at || '.000000' "
+            "WHERE length(detected_at) = 19"
+        ))
+        conn.execute(text(f"PRAGMA user_version = {SQLITE_TIMESTAMPS_VERSION}"))
+        if result.rowcount:
+            logger.info(f"{result.rowcount} timestamps de detection_logs normalizados")
+
+# Coluna numérica -> chave do JSON legado de bounding_box
+LEGACY_BBOX_KEYS = {"bbox_x": "x", "bbox_y": "y", "bbox_w": "w", "bbox_h": "h"}
+
+def parse_legacy_bounding_box(value: Optional[str]) -> Dict[str, Optional[int]]:
+    """Converte um bounding_box legado (JSON em texto) para as colunas bbox_x/y/w/h"""
+    data = json.loads(value) if value else {}
+    return {
+        column: int(data[key]) if data.get(key) is not None else None
+        for column, key in LEGACY_BBOX_KEYS.items()
+    }
+
+def migrate_bounding_boxes(engine: Engine):
+    """Converte a coluna legada bounding_box (JSON em texto) para bbox_x/y/w/h e a remove"""
+    inspector = inspect(engine)
+    if not inspector.has_table("detection_logs"):
+        return
+    columns = {column["name"] for column in inspector.get_columns("detection_logs")}
+    if "bounding_box" not in columns:
+        return
+
+    if engine.dialect.name == "sqlite":
+        field = "CAST(json_extract(bounding_box, '$.{0}') AS INTEGER)"
+    else:
+        field = "CAST((CAST(bounding_box AS json) ->> '{0}') AS INTEGER)"
+
+    with engine.begin() as conn:
+        result = conn.execute(text(
+            "UPDATE detection_logs SET "
+            + ", ".join(f"{column} = {field.format(key)}" for column, key in LEGACY_BBOX_KEYS.items())
+            + " WHERE bounding_box IS NOT NULL"
+        ))
+        logger.info(f"{result.rowcount} bounding boxes convertidas para colunas numéricas")
+
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE detection_logs DROP COLUMN bounding_box"))
+    except Exception as e:
+        # SQLite < 3.35 não suporta DROP COLUMN; a coluna legada fica sem uso
+        logger.warning(f"Não foi possível remover a coluna legada bounding_box: {e}")
+
+def run_migrations(engine: Engine):
+    """Executa as migrações leves aplicadas na inicialização"""
+    ensure_columns(engine)
+    ensure_indexes(engine)
+    migrate_bounding_boxes(engine)
+    normalize_sqlite_timestamps(engine)
@@ -1,7 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, LargeBinary, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, LargeBinary, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
-import json
 
 Base = declarative_base()
 
@@ -35,23 +34,77 @@ class FaceEmbedding(Base):
         import numpy as np
         return np.frombuffer(self.embedding, dtype=np.float32)
 
+class SystemCounter(Base):
+    __tablename__ = "system_counters"
+    
+    name = Column(String, primary_key=True)  # 'persons_active', 'face_embeddings', 'detection_logs'
+    value = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class DetectionLog(Base):
     __tablename__ = "detection_logs"
+    __table_args__ = (
+        # Índices compostos para paginação por cursor (detected_at, id) e filtros
+        Index("ix_detection_logs_detected_at_id", "detected_at", "id"),
+        Index("ix_detection_logs_person_detected_at", "person_id", "detected_at"),
+        Index("ix_detection_logs_source_detected_at", "source", "detected_at"),
+        # Consultas espaciais por câmera ("faces nesta região do stream X")
+        Index("ix_detection_logs_stream_bbox", "stream_id", "bbox_x", "bbox_y"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     person_id = Column(Integer, nullable=True, index=True)  # None se pessoa não identificada
     confidence = Column(Float, nullable=False)
     source = Column(String, nullable=False)  # 'upload', 'rtsp', etc.
     source_info = Column(String, nullable=True)  # URL RTSP ou nome do arquivo
-    detected_at = Column(DateTime(timezone=True), server_default=func.now())
-    bounding_box = Column(String, nullable=True)  # JSON com coordenadas da face
+    stream_id = Column(String, nullable=True)  # ID do stream RTSP de origem, se houver
+    detected_at = Column(DateTime(timezone=True), server_default=func.now())  # Início da aparição
+    ended_at = Column(DateTime(timezone=True), nullable=True)  # Fim da aparição (None em detecções avulsas)
+    detection_count = Column(Integer, nullable=True)  # Detecções agregadas na aparição
+    frame_ref = Column(String, nullable=True)  # Referência do frame de maior confiança
+    bbox_x = Column(Integer, nullable=True)  # Coordenadas da face em pixels
+    bbox_y = Column(Integer, nullable=True)
+    bbox_w = Column(Integer, nullable=True)
+    bbox_h = Column(Integer, nullable=True)
     
     def set_bounding_box(self, x, y, w, h):
         """Define as coordenadas da bounding box"""
-        self.bounding_box = json.dumps({"x": x, "y": y, "w": w, "h": h})
+        self.bbox_x, self.bbox_y, self.bbox_w, self.bbox_h = int(x), int(y), int(w), int(h)
     
     def get_bounding_box(self):
         """Retorna as coordenadas da bounding box"""
-        if self.bounding_box:
-            return json.loads(self.bounding_box)
-        return None 
\ No newline at end of file
+        return DetectionLog.bounding_box_dict(self.bbox_x, self.bbox_y, self.bbox_w, self.bbox_h)
+    
+    @staticmethod
+    def bounding_box_dict(x, y, w, h):
+        """Monta o dicionário de bounding box a partir das colunas numéricas"""
+        if x is None:
+            return None
+        return {"x": x, "y": y, "w": w, "h": h} 
+
+class DetectionRollupMixin:
+    """Colunas comuns dos agregados de detecções por intervalo de tempo"""
+    id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # Início do intervalo (UTC)
+    person_id = Column(Integer, nullable=True)  # None para faces não identificadas
+    source = Column(String, nullable=False)
+    stream_id = Column(String, nullable=True)
+    detections = Column(Integer, nullable=False)
+    max_confidence = Column(Float, nullable=False)
+    sum_confidence = Column(Float, nullable=False)  # Permite média ponderada ao reagregar
+    first_seen = Column(DateTime(timezone=True), nullable=False)
+    last_seen = Column(DateTime(timezone=True), nullable=False)
+
+class DetectionRollupHourly(DetectionRollupMixin, Base):
+    __tablename__ = "detection_rollups_hourly"
+    __table_args__ = (
+        Index("ix_detection_rollups_hourly_bucket", "bucket_start"),
+        Index("ix_detection_rollups_hourly_person_bucket", "person_id", "bucket_start"),
+    )
+
+class DetectionRollupDaily(DetectionRollupMixin, Base):
+    __tablename__ = "detection_rollups_daily"
+    __table_args__ = (
+        Index("ix_detection_rollups_daily_bucket", "bucket_start"),
+        Index("ix_detection_rollups_daily_person_bucket", "person_id", "bucket_start"),
+    )
@@ -0,0 +1,91 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, Optional, List
+
+# Esquemas para RTSP
+class DetectionZone(BaseModel):
+    """Região de interesse em pixels do frame: polígono [[x, y], ...] ou retângulo [x, y, w, h]"""
+    name: Optional[str] = Field(None, max_length=50)
+    polygon: Optional[List[List[int]]] = Field(None, min_length=3)
+    rect: Optional[List[int]] = Field(None, min_length=4, max_length=4)
+
+    @model_validator(mode="after")
+    def check_shape(self):
+        if (self.polygon is None) == (self.rect is None):
+            raise ValueError("Informe exatamente um entre polygon e rect")
+        if self.polygon is not None and any(len(point) != 2 for point in self.polygon):
+            raise ValueError("Pontos do polígono devem ser [x, y]")
+        if self.rect is not None and (self.rect[2] <= 0 or self.rect[3] <= 0):
+            raise ValueError("Largura e altura do retângulo devem ser positivas")
+        return self
+
+class RTSPStreamRequest(BaseModel):
+    stream_id: str = Field(..., min_length=1, max_length=50)
+    rtsp_url: str = Field(..., min_length=1)
+    priority: int = Field(1, ge=1, le=10)  # Peso no escalonador de inferência
+    target_fps: Optional[float] = Field(None, gt=0, le=30)  # Taxa máxima de análise
+    latency_budget_ms: Optional[float] = Field(None, gt=0)  # Latência máxima captura -> resultado
+    motion_gating: bool = True  # Pular detecção de faces em cenas estáticas
+    motion_sensitivity: Optional[float] = Field(None, ge=0, le=1)
+    motion_mask: Optional[List[List[List[int]]]] = None  # Polígonos [[x, y], ...] ignorados pelo filtro de movimento
+    record_clips: bool = False  # Gravar clips em torno das detecções (buffer circular em memória)
+    clip_pre_seconds: Optional[float] = Field(None, ge=0, le=60)
+    clip_post_seconds: Optional[float] = Field(None, ge=0, le=60)
+    zones: Optional[List[DetectionZone]] = None  # Detectar apenas nestas regiões (padrão: frame inteiro)
+    recognize: bool = True  # Identificar as faces na galeria de pessoas cadastradas
+
+class RTSPStreamInfo(BaseModel):
+    stream_id: str
+    rtsp_url: str
+    active: bool
+    state: str = "connecting"  # connecting, live, stalled, reconnecting, failed
+    reconnects: int = 0
+    last_error: Optional[str] = None
+    last_frame_age: Optional[float] = None  # Segundos desde o último frame recebido
+    fps: float
+    frame_count: int
+    frames_analyzed: int = 0
+    frames_dropped: int = 0
+    priority: int = 1
+    target_fps: float = 0.0
+    effective_fps: float = 0.0  # Taxa de análise atual (adaptativa)
+    latency_budget_ms: float = 0.0
+    avg_latency_ms: float = 0.0
+    motion_gating: bool = False
+    frames_motion_skipped: int = 0
+    zones: List[Dict[str, Any]] = []  # Zonas de interesse normalizadas ({name, polygon})
+    zone_area_ratio: float = 1.0  # Fração do frame passada ao detector
+    detections_outside_zones: int = 0
+    recognize: bool = True
+    recognitions_run: int = 0  # Embeddings extraídos e comparados com a galeria
+    recognitions_deferred: int = 0  # Reconhecimentos adiados por FACE_RECOGNITION_MAX_PER_FRAME
+    viewers: int = 0  # Viewers MJPEG conectados
+    open_sightings: int = 0  # Aparições em andamento
+    sightings_closed: int = 0  # Aparições encerradas (gravadas em DetectionLog)
+    record_clips: bool = False
+    clip_recording: bool = False  # Clip em andamento
+    clip_buffer_bytes: int = 0  # Memória ocupada pelo buffer de pré-roll
+    clips_saved: int = 0
+    worker: Optional[int] = None  # Processo worker que hospeda o stream (RTSP_WORKER_PROCESSES > 0)
+    metrics: Optional[Dict[str, Any]] = None  # Telemetria na janela deslizante (taxas, percentis e histogramas)
+    uptime: float
+
+class RTSPClipInfo(BaseModel):
+    clip_id: str
+    stream_id: str
+    started_at: float  # Timestamps Unix do primeiro e do último frame
+    ended_at: float
+    duration: float
+    triggered_at: float  # Captura do frame da primeira detecção
+    reason: str
+    frame_ref: Optional[str] = None  # Frame da primeira detecção (stream#sequência)
+    events: int  # Detecções que abriram ou estenderam o clip
+    frames: int
+    fps: float
+    width: int
+    height: int
+    size_bytes: int
+
+class RTSPStreamResponse(BaseModel):
+    success: bool
+    message: str
+    stream_info: Optional[RTSPStreamInfo] = None
@@ -56,24 +56,6 @@ class ImageRecognitionResponse(BaseModel):
     faces_detected: int
     recognitions: List[FaceRecognitionResult]
 
-# Esquemas para RTSP
-class RTSPStreamRequest(BaseModel):
-    stream_id: str = Field(..., min_length=1, max_length=50)
-    rtsp_url: str = Field(..., min_length=1)
-
-class RTSPStreamInfo(BaseModel):
-    stream_id: str
-    rtsp_url: str
-    active: bool
-    fps: float
-    frame_count: int
-    uptime: float
-
-class RTSPStreamResponse(BaseModel):
-    success: bool
-    message: str
-    stream_info: Optional[RTSPStreamInfo] = None
-
 # Esquemas para logs de detecção
 class DetectionLogResponse(BaseModel):
     id: int
@@ -83,6 +65,9 @@ class DetectionLogResponse(BaseModel):
     source: str
     source_info: Optional[str]
     detected_at: datetime
+    ended_at: Optional[datetime] = None
+    detection_count: Optional[int] = None
+    frame_ref: Optional[str] = None
     bounding_box: Optional[dict]
     
     class Config:
@@ -0,0 +1,65 @@
+import struct
+from pathlib import Path
+from typing import List
+
+
+def _chunk(fourcc: bytes, data: bytes) -> bytes:
+    """Chunk RIFF (tamanho em little-endian, conteúdo alinhado em 2 bytes)"""
+    return fourcc + struct.pack("<I", len(data)) + data + (b"\0" if len(data) % 2 else b"")
+
+
+def _list(fourcc: bytes, data: bytes) -> bytes:
+    return _chunk(b"LIST", fourcc + data)
+
+
+def write_mjpeg_avi(path: Path, frames: List[bytes], fps: float, width: int, height: int):
+    """
+    Grava JPEGs já codificados em um AVI Motion-JPEG, sem decodificar nem recodificar
+
+    Cada JPEG vira um chunk '00dc' do stream de vídeo; o índice 'idx1' marca
+    todos os frames como keyframes (MJPEG é intra-frame).
+    """
+    rate = max(1, int(round(fps * 1000)))  # dwRate/dwScale com escala 1000 (FPS fracionário)
+    largest = max((len(frame) for frame in frames), default=0)
+
+    movi = bytearray()
+    index = bytearray()
+    for frame in frames:
+        # Offset relativo ao início do fourcc 'movi'
+        index += b"00dc" + struct.pack("<III", 0x10, 4 + len(movi), len(frame))
+        movi += _chunk(b"00dc", frame)
+
+    avih = struct.pack(
+        "<IIIIIIIIII16x",
+        int(1_000_000 / fps) if fps > 0 else 0,  # dwMicroSecPerFrame
+        int(largest * fps),  # dwMaxBytesPerSec
+        0,  # dwPaddingGranularity
+        0x10,  # dwFlags: AVIF_HASINDEX
+        len(frames),  # dwTotalFrames
+        0,  # dwInitialFrames
+        1,  # dwStreams
+        largest,  # dwSuggestedBufferSize
+        width,
+        height
+    )
+    strh = b"vidsMJPG" + struct.pack(
+        "<IHHIIIIIIIIhhhh",
+        0,  # dwFlags
+        0, 0,  # wPriority, wLanguage
+        0,  # dwInitialFrames
+        1000, rate,  # dwScale, dwRate
+        0, len(frames),  # dwStart, dwLength
+        largest,  # dwSuggestedBufferSize
+        0xFFFFFFFF,  # dwQuality (padrão)
+        0,  # dwSampleSize
+        0, 0, width, height  # rcFrame
+    )
+    strf = struct.pack("<IiiHH4sIiiII", 40, width, height, 1, 24, b"MJPG", width * height * 3, 0, 0, 0, 0)
+
+    hdrl = _list(b"hdrl", _chunk(b"avih", avih) + _list(b"strl", _chunk(b"strh", strh) + _chunk(b"strf", strf)))
+    body = b"AVI " + hdrl + _list(b"movi", bytes(movi)) + _chunk(b"idx1", bytes(index))
+
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(b"RIFF" + struct.pack("<I", len(body)) + body)
+    tmp_path.replace(path)
@@ -0,0 +1,149 @@
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Set
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.config import BULK_ENROLL_BATCH_SIZE
+from app.database.models import Person, FaceEmbedding
+from app.services.bulk_enrollment_worker import ImageResult, extract_images, scan_dataset
+from app.services.counters import counter_service, PERSONS_ACTIVE, FACE_EMBEDDINGS
+
+logger = logging.getLogger(__name__)
+
+
+class BulkEnrollmentService:
+    """
+    Cadastro offline em lote a partir de uma árvore de diretórios `nome/*.jpg`
+
+    - Extração de embeddings com pool de processos
+    - Inserção em lote de FaceEmbedding
+    - Checkpoint em arquivo para retomar execuções interrompidas
+
+    Com `resume=False` nenhuma imagem é pulada: todas são reprocessadas e os
+    embeddings já gravados para cada imagem são substituídos.
+    """
+
+    def __init__(self, db: Session, checkpoint_path: Path, workers: int,
+                 batch_size: int = BULK_ENROLL_BATCH_SIZE, all_faces: bool = False,
+                 resume: bool = True):
+        self.db = db
+        self.resume = resume
+        self.checkpoint_path = Path(checkpoint_path)
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.all_faces = all_faces
+        self._person_ids: Dict[str, int] = {}
+
+    def load_checkpoint(self) -> Set[str]:
+        """Carrega o conjunto de imagens já processadas em execuções anteriores"""
+        done = set()
+        if not self.resume:
+            return done
+
+        if self.checkpoint_path.exists():
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                done.update(line.rstrip('\n') for line in f if line.strip())
+
+        # Imagens já gravadas no banco também contam como processadas, cobrindo
+        # uma interrupção entre o commit do lote e a escrita do checkpoint
+        rows = self.db.query(FaceEmbedding.image_path).distinct().all()
+        done.update(row[0] for row in rows)
+        return done
+
+    def _get_person_id(self, name: str) -> int:
+        """Obtém ou cria a pessoa pelo nome, com cache local"""
+        if name in self._person_ids:
+            return self._person_ids[name]
+
+        person = self.db.query(Person).filter(Person.name == name).first()
+        if person is None:
+            person = Person(name=name, description="Cadastro em lote")
+            self.db.add(person)
+            self.db.flush()
+            counter_service.increment(self.db, PERSONS_ACTIVE, 1)
+        elif not person.is_active:
+            person.is_active = True
+            counter_service.increment(self.db, PERSONS_ACTIVE, 1)
+
+        self._person_ids[name] = person.id
+        return person.id
+
+    def _replace_existing(self, batch: List[ImageResult]):
+        """Remove os embeddings já gravados das imagens reprocessadas (resume=False)"""
+        paths = [image_path for _, image_path, _, error in batch if not error]
+        if paths:
+            result = self.db.execute(delete(FaceEmbedding).where(FaceEmbedding.image_path.in_(paths)))
+            counter_service.increment(self.db, FACE_EMBEDDINGS, -result.rowcount)
+
+    def _flush_batch(self, batch: List[ImageResult]) -> int:
+        """Grava um lote de embeddings no banco e registra o checkpoint"""
+        if not self.resume:
+            self._replace_existing(batch)
+        rows = []
+        for person_name, image_path, faces, _ in batch:
+            if not faces:
+                continue
+            person_id = self._get_person_id(person_name)
+            for embedding, confidence in faces:
+                rows.append({
+                    "person_id": person_id,
+                    "embedding": embedding,
+                    "image_path": image_path,
+                    "confidence": confidence
+                })
+
+        if rows:
+            self.db.execute(insert(FaceEmbedding), rows)
+            counter_service.increment(self.db, FACE_EMBEDDINGS, len(rows))
+        self.db.commit()
+
+        # Checkpoint somente após o commit; imagens com erro serão reprocessadas
+        with open(self.checkpoint_path, 'a', encoding='utf-8') as f:
+            f.writelines(f"{image_path}\n" for _, image_path, _, error in batch if not error)
+
+        return len(rows)
+
+    def run(self, root_dir: Path) -> Dict:
+        """Executa o cadastro em lote e retorna estatísticas da execução"""
+        done = self.load_checkpoint()
+        dataset = list(scan_dataset(root_dir))
+        tasks = [(name, path, self.all_faces) for name, path in dataset if path not in done]
+
+        stats = {
+            "images_total": len(tasks),
+            "images_skipped": len(dataset) - len(tasks),
+            **dict.fromkeys(("images_processed", "images_without_face", "images_failed",
+                             "embeddings_added", "persons"), 0),
+            "duration_seconds": 0.0,
+            "images_per_second": 0.0
+        }
+
+        logger.info(f"{len(tasks)} imagens a processar ({stats['images_skipped']} já processadas)")
+        start_time = time.time()
+
+        batch = []
+        for person_name, image_path, faces, error in extract_images(tasks, self.workers):
+            stats["images_processed"] += 1
+            if error:
+                stats["images_failed"] += 1
+                logger.warning(f"Erro ao processar {image_path}: {error}")
+            elif not faces:
+                stats["images_without_face"] += 1
+
+            batch.append((person_name, image_path, faces, error))
+            if len(batch) >= self.batch_size:
+                stats["embeddings_added"] += self._flush_batch(batch)
+                batch = []
+                logger.info(f"Progresso: {stats['images_processed']}/{len(tasks)} imagens")
+
+        if batch:
+            stats["embeddings_added"] += self._flush_batch(batch)
+
+        duration = time.time() - start_time
+        stats["persons"] = len(self._person_ids)
+        stats["duration_seconds"] = duration
+        stats["images_per_second"] = stats["images_processed"] / duration if duration > 0 else 0.0
+        return stats
@@ -0,0 +1,62 @@
+import multiprocessing
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import ALLOWED_EXTENSIONS
+
+# Resultado de uma imagem: (person_name, image_path, [(embedding_bytes, confidence)], erro)
+ImageResult = Tuple[str, str, List[Tuple[bytes, float]], Optional[str]]
+
+# Serviço de reconhecimento carregado em cada processo worker
+_worker_face_service = None
+
+
+def scan_dataset(root_dir: Path) -> Iterator[Tuple[str, str]]:
+    """Percorre o diretório e retorna tuplas (nome_da_pessoa, caminho_da_imagem)"""
+    for person_dir in sorted(p for p in Path(root_dir).iterdir() if p.is_dir()):
+        for image_path in sorted(person_dir.iterdir()):
+            if image_path.is_file() and image_path.suffix.lower() in ALLOWED_EXTENSIONS:
+                yield person_dir.name, str(image_path.resolve())
+
+
+def init_worker():
+    """Inicializa o modelo InsightFace uma única vez por processo worker"""
+    global _worker_face_service
+    from app.services.face_recognition import face_service
+    _worker_face_service = face_service
+
+
+def extract_image(task: Tuple[str, str, bool]) -> ImageResult:
+    """
+    Extrai embeddings de uma imagem dentro do processo worker
+
+    Falhas de leitura ou do detector voltam como erro (a imagem não entra no
+    checkpoint e é reprocessada); só "nenhuma face" é um resultado válido vazio.
+    """
+    person_name, image_path, all_faces = task
+    try:
+        detections = _worker_face_service.extract_face_embedding(image_path, raise_errors=True)
+        if not all_faces and detections:
+            # Foto rotulada: manter apenas a face de maior confiança
+            detections = [max(detections, key=lambda d: d['confidence'])]
+
+        faces = [
+            (np.asarray(d['embedding'], dtype=np.float32).tobytes(), float(d['confidence']))
+            for d in detections
+        ]
+        return person_name, image_path, faces, None
+    except Exception as e:
+        return person_name, image_path, [], str(e)
+
+
+def extract_images(tasks: List[Tuple[str, str, bool]], workers: int) -> Iterator[ImageResult]:
+    """Distribui as imagens entre processos worker e retorna os resultados na ordem de término"""
+    if not tasks:
+        return
+    # spawn evita herdar estado do ONNX Runtime entre processos
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(workers, initializer=init_worker) as pool:
+        chunksize = max(1, min(32, len(tasks) // (workers * 4)))
+        yield from pool.imap_unordered(extract_image, tasks, chunksize=chunksize)
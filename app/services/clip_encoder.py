@@ -0,0 +1,72 @@
+import logging
+import threading
+from typing import Callable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ClipEncoder:
+    """
+    Thread própria de compressão JPEG dos frames do buffer de clips
+
+    A thread de captura apenas entrega o frame decodificado (`submit`). Só o
+    frame mais recente fica pendente: se a compressão atrasar, os
+    intermediários são descartados em vez de acumular memória ou atrasar a captura.
+
+    Args:
+        name: Nome da thread
+        quality: Qualidade JPEG (0 a 100)
+        on_encoded: Recebe (timestamp, jpeg, (largura, altura)) na thread do encoder
+    """
+
+    def __init__(self, name: str, quality: int, on_encoded: Callable[[float, bytes, Tuple[int, int]], None]):
+        self.name = name
+        self.quality = quality
+        self.on_encoded = on_encoded
+        self._ready = threading.Condition()
+        self._pending: Optional[Tuple[np.ndarray, float]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.frames_skipped = 0
+
+    def submit(self, frame: np.ndarray, timestamp: float):
+        """Entrega um frame para compressão sem bloquear"""
+        with self._ready:
+            if self._closed:
+                return
+            if self._pending is not None:
+                self.frames_skipped += 1
+            self._pending = (frame, timestamp)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._ready.notify()
+
+    def stop(self, timeout: float = 5.0):
+        """Comprime o frame pendente e encerra a thread"""
+        with self._ready:
+            self._closed = True
+            thread = self._thread
+            self._ready.notify()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def _run(self):
+        while True:
+            with self._ready:
+                while self._pending is None and not self._closed:
+                    self._ready.wait()
+                if self._pending is None:
+                    return
+                (frame, timestamp), self._pending = self._pending, None
+
+            ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            if not ok:
+                continue
+            try:
+                self.on_encoded(timestamp, buffer.tobytes(), (frame.shape[1], frame.shape[0]))
+            except Exception as e:
+                logger.error(f"Erro ao armazenar frame comprimido ({self.name}): {e}")
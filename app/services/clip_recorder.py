@@ -0,0 +1,150 @@
+import logging
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.config import (
+    CLIPS_DIR, CLIP_PRE_SECONDS, CLIP_POST_SECONDS, CLIP_MAX_DURATION, CLIP_BUFFER_FPS,
+    CLIP_MAX_BYTES, CLIP_JPEG_QUALITY, CLIP_MAX_PER_STREAM
+)
+from app.services.clip_encoder import ClipEncoder
+from app.services.clip_store import save_clip, prune_clips
+
+logger = logging.getLogger(__name__)
+
+
+class ClipRecorder:
+    """
+    Buffer circular de frames JPEG de um stream e gravação de clips em torno de eventos
+
+    Até CLIP_BUFFER_FPS frames/s entregues em `push` são comprimidos em JPEG
+    (na thread do ClipEncoder) e mantidos por `pre_seconds`. `trigger` abre um
+    clip com o pré-roll e o estende até `post_seconds` após a última detecção
+    (no máximo CLIP_MAX_DURATION). Buffer e clip em andamento dividem o
+    orçamento `max_bytes`; o clip fechado é gravado como AVI MJPEG em background.
+    """
+
+    def __init__(self, stream_id: str, pre_seconds: float = CLIP_PRE_SECONDS,
+                 post_seconds: float = CLIP_POST_SECONDS, fps: float = CLIP_BUFFER_FPS,
+                 max_bytes: int = CLIP_MAX_BYTES, quality: int = CLIP_JPEG_QUALITY,
+                 clips_dir: Path = CLIPS_DIR, on_saved: Optional[Callable[[Dict], None]] = None):
+        self.stream_id = stream_id
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.interval = 1.0 / fps
+        self.max_bytes = max_bytes
+        self.clips_dir = clips_dir
+        self.on_saved = on_saved
+        self.encoder = ClipEncoder(f"clip-encoder-{stream_id}", quality, self._append)
+        self._lock = threading.Lock()
+        self._buffer: deque = deque()  # (timestamp, jpeg)
+        self._bytes = 0  # Buffer + frames mantidos apenas pelo clip em andamento
+        self._last_push = 0.0
+        self._frame_size: Tuple[int, int] = (0, 0)
+        self._clip: Optional[Dict] = None
+        self.clips_saved = 0
+
+    def push(self, frame: np.ndarray, timestamp: float):
+        """Recebe um frame decodificado (thread de captura); encaminha no máximo CLIP_BUFFER_FPS ao encoder"""
+        if timestamp - self._last_push >= self.interval:
+            self._last_push = timestamp
+            self.encoder.submit(frame, timestamp)
+        self.flush(timestamp)
+
+    def _append(self, timestamp: float, jpeg: bytes, frame_size: Tuple[int, int]):
+        """Armazena um frame comprimido (thread do encoder)"""
+        with self._lock:
+            self._frame_size = frame_size
+            self._buffer.append((timestamp, jpeg))
+            self._bytes += len(jpeg)
+            if self._clip is not None:
+                self._clip["frames"].append((timestamp, jpeg))
+            self._evict(timestamp)
+        self.flush(timestamp)
+
+    def _evict(self, now: float):
+        """Descarta frames fora do pré-roll ou, sem clip em andamento, acima do orçamento"""
+        cutoff = now - self.pre_seconds
+        clip_start = self._clip["started_at"] if self._clip is not None else None
+        while self._buffer and (self._buffer[0][0] < cutoff
+                                or (clip_start is None and self._bytes > self.max_bytes)):
+            timestamp, jpeg = self._buffer.popleft()
+            # Frames do clip em andamento continuam em memória até a gravação
+            if clip_start is None or timestamp < clip_start:
+                self._bytes -= len(jpeg)
+
+    def _detach(self) -> Optional[Dict]:
+        """Retira o clip em andamento e libera os frames que só ele mantinha (com o lock)"""
+        clip, self._clip = self._clip, None
+        if clip is not None:
+            oldest = self._buffer[0][0] if self._buffer else float("inf")
+            self._bytes -= sum(len(jpeg) for timestamp, jpeg in clip["frames"] if timestamp < oldest)
+        return clip
+
+    def trigger(self, timestamp: float, reason: str = "detection", frame_ref: Optional[str] = None):
+        """Abre um clip (com pré-roll) ou estende o clip em andamento"""
+        finished = None
+        with self._lock:
+            if self._clip is not None and timestamp - self._clip["started_at"] > CLIP_MAX_DURATION:
+                finished = self._detach()
+            if self._clip is None:
+                frames = [(ts, jpeg) for ts, jpeg in self._buffer if ts >= timestamp - self.pre_seconds]
+                self._clip = {
+                    "started_at": frames[0][0] if frames else timestamp,
+                    "triggered_at": timestamp,
+                    "reason": reason,
+                    "frame_ref": frame_ref,
+                    "events": 0,
+                    "frames": frames
+                }
+            self._clip["events"] += 1
+            self._clip["until"] = timestamp + self.post_seconds
+        if finished is not None:
+            self._save_async(finished)
+
+    def flush(self, now: float):
+        """Grava o clip em andamento se o pós-roll terminou ou o orçamento estourou (também chamado pelo watchdog)"""
+        with self._lock:
+            if self._clip is None or (now <= self._clip["until"] and self._bytes <= self.max_bytes):
+                return
+            clip = self._detach()
+        self._save_async(clip)
+
+    def close(self):
+        """Encerra o encoder e grava o clip em andamento (remoção do stream)"""
+        self.encoder.stop()
+        with self._lock:
+            clip = self._detach()
+            self._buffer.clear()
+            self._bytes = 0
+        if clip is not None:
+            self._save_async(clip)
+
+    @property
+    def recording(self) -> bool:
+        return self._clip is not None
+
+    @property
+    def buffer_bytes(self) -> int:
+        """Memória ocupada pelo buffer e pelo clip em andamento"""
+        return self._bytes
+
+    def _save_async(self, clip: Dict):
+        threading.Thread(target=self._save, args=(clip, self._frame_size),
+                         name=f"clip-writer-{self.stream_id}", daemon=True).start()
+
+    def _save(self, clip: Dict, frame_size: Tuple[int, int]):
+        metadata = save_clip(self.stream_id, clip, frame_size, 1.0 / self.interval, self.clips_dir)
+        if metadata is None:
+            return
+        self.clips_saved += 1
+        logger.info(f"Clip {metadata['clip_id']} gravado ({metadata['frames']} frames, {metadata['duration']:.1f}s)")
+        prune_clips(self.stream_id, CLIP_MAX_PER_STREAM, self.clips_dir)
+        if self.on_saved is not None:
+            try:
+                self.on_saved(metadata)
+            except Exception as e:
+                logger.error(f"Erro ao notificar clip gravado: {e}")
@@ -0,0 +1,97 @@
+import json
+import logging
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.config import CLIPS_DIR
+from app.services.avi_writer import write_mjpeg_avi
+
+logger = logging.getLogger(__name__)
+
+# Identificador de clip: "<stream>-<AAAAMMDDTHHMMSS_mmm>" (sem separadores de caminho)
+_CLIP_ID_PATTERN = re.compile(r"^[\w.-]+$")
+
+
+def save_clip(stream_id: str, clip: Dict, frame_size: Tuple[int, int], default_fps: float,
+              clips_dir: Path = CLIPS_DIR) -> Optional[Dict]:
+    """
+    Grava os JPEGs de um clip como AVI MJPEG e seus metadados em JSON
+
+    Returns:
+        Metadados do clip gravado (None se o clip não tem frames ou a gravação falhou)
+    """
+    frames = clip["frames"]
+    if not frames:
+        return None
+    started_at, ended_at = frames[0][0], frames[-1][0]
+    duration = ended_at - started_at
+    fps = (len(frames) - 1) / duration if duration > 0 else default_fps
+
+    stamp = datetime.fromtimestamp(started_at, tz=timezone.utc).strftime("%Y%m%dT%H%M%S_%f")[:-3]
+    clip_id = f"{re.sub(r'[^A-Za-z0-9_.-]', '_', stream_id)}-{stamp}"
+    try:
+        clips_dir.mkdir(parents=True, exist_ok=True)
+        write_mjpeg_avi(clips_dir / f"{clip_id}.avi", [jpeg for _, jpeg in frames],
+                        fps, frame_size[0], frame_size[1])
+        metadata = {
+            "clip_id": clip_id,
+            "stream_id": stream_id,
+            "started_at": started_at,
+            "ended_at": ended_at,
+            "duration": duration,
+            "triggered_at": clip["triggered_at"],
+            "reason": clip["reason"],
+            "frame_ref": clip["frame_ref"],
+            "events": clip["events"],
+            "frames": len(frames),
+            "fps": fps,
+            "width": frame_size[0],
+            "height": frame_size[1],
+            "size_bytes": (clips_dir / f"{clip_id}.avi").stat().st_size
+        }
+        (clips_dir / f"{clip_id}.json").write_text(json.dumps(metadata))
+    except OSError as e:
+        logger.error(f"Erro ao gravar clip do stream {stream_id}: {e}")
+        return None
+    return metadata
+
+
+def list_clips(stream_id: Optional[str] = None, clips_dir: Path = CLIPS_DIR) -> List[Dict]:
+    """Metadados dos clips gravados, mais recentes primeiro"""
+    clips = []
+    for meta_path in clips_dir.glob("*.json"):
+        try:
+            metadata = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            continue
+        if stream_id is None or metadata.get("stream_id") == stream_id:
+            clips.append(metadata)
+    clips.sort(key=lambda clip: clip["started_at"], reverse=True)
+    return clips
+
+
+def get_clip_path(clip_id: str, clips_dir: Path = CLIPS_DIR) -> Optional[Path]:
+    """Caminho do arquivo de um clip (None se inexistente ou identificador inválido)"""
+    if not _CLIP_ID_PATTERN.match(clip_id):
+        return None
+    path = clips_dir / f"{clip_id}.avi"
+    return path if path.exists() else None
+
+
+def delete_clip(clip_id: str, clips_dir: Path = CLIPS_DIR) -> bool:
+    path = get_clip_path(clip_id, clips_dir)
+    if path is None:
+        return False
+    path.unlink(missing_ok=True)
+    path.with_suffix(".json").unlink(missing_ok=True)
+    return True
+
+
+def prune_clips(stream_id: str, keep: int, clips_dir: Path = CLIPS_DIR) -> int:
+    """Remove os clips mais antigos de um stream além de `keep`"""
+    stale = list_clips(stream_id, clips_dir)[keep:]
+    for clip in stale:
+        delete_clip(clip["clip_id"], clips_dir)
+    return len(stale)
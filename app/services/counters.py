@@ -0,0 +1,59 @@
+import logging
+from typing import Dict
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.database.models import Person, FaceEmbedding, DetectionLog, SystemCounter
+
+logger = logging.getLogger(__name__)
+
+# Nomes dos contadores mantidos incrementalmente
+PERSONS_ACTIVE = "persons_active"
+FACE_EMBEDDINGS = "face_embeddings"
+DETECTION_LOGS = "detection_logs"
+
+
+class CounterService:
+    """
+    Contadores incrementais para /api/stats
+
+    Os incrementos são executados na sessão do chamador e confirmados no mesmo
+    commit da alteração que os originou. Na inicialização, os valores são
+    reconciliados com contagens reais das tabelas.
+    """
+
+    def increment(self, db: Session, name: str, delta: int = 1):
+        """Soma delta ao contador dentro da transação corrente (sem commit)"""
+        if delta:
+            db.execute(
+                update(SystemCounter)
+                .where(SystemCounter.name == name)
+                .values(value=SystemCounter.value + delta)
+            )
+
+    def reconcile(self, db: Session) -> Dict[str, int]:
+        """Recalcula todos os contadores a partir das tabelas"""
+        actual = {
+            PERSONS_ACTIVE: db.query(func.count(Person.id)).filter(Person.is_active == True).scalar() or 0,
+            FACE_EMBEDDINGS: db.query(func.count(FaceEmbedding.id)).scalar() or 0,
+            DETECTION_LOGS: db.query(func.count(DetectionLog.id)).scalar() or 0
+        }
+
+        for name, value in actual.items():
+            counter = db.get(SystemCounter, name)
+            if counter is None:
+                db.add(SystemCounter(name=name, value=value))
+            elif counter.value != value:
+                logger.info(f"Contador {name} reconciliado: {counter.value} -> {value}")
+                counter.value = value
+        db.commit()
+        return actual
+
+    def get_all(self, db: Session) -> Dict[str, int]:
+        """Lê todos os contadores (consulta O(1))"""
+        return {name: value for name, value in db.query(SystemCounter.name, SystemCounter.value).all()}
+
+
+# Instância global do serviço de contadores
+counter_service = CounterService()
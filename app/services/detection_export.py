@@ -0,0 +1,102 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+
+from app.config import EXPORT_BATCH_SIZE, EXPORT_FORMATS
+from app.database.models import DetectionLog, Person
+from app.services.detection_export_formats import FORMAT_WRITERS, PARQUET_AVAILABLE
+from app.services.detection_rollups import as_utc
+
+logger = logging.getLogger(__name__)
+
+
+class DetectionExportService:
+    """
+    Exportação em streaming de detection_logs (com nome da pessoa)
+
+    As linhas são lidas com cursor do lado do servidor (stream_results) em
+    lotes de EXPORT_BATCH_SIZE e serializadas lote a lote, com memória
+    constante independente do tamanho do resultado.
+    """
+
+    def __init__(self, batch_size: int = EXPORT_BATCH_SIZE):
+        self.batch_size = batch_size
+
+    def validate_format(self, fmt: str):
+        """Levanta ValueError para formatos desconhecidos ou indisponíveis"""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Formato inválido. Use: {', '.join(EXPORT_FORMATS)}")
+        if fmt == "parquet" and not PARQUET_AVAILABLE:
+            raise ValueError("Exportação Parquet requer pyarrow (pip install pyarrow)")
+
+    def build_query(self, person_id: Optional[int] = None, source: Optional[str] = None,
+                    start_time: Optional[datetime] = None, end_time: Optional[datetime] = None,
+                    stream_id: Optional[str] = None):
+        """Monta o SELECT da exportação, em ordem cronológica"""
+        query = select(
+            DetectionLog.id,
+            DetectionLog.detected_at,
+            DetectionLog.ended_at,
+            DetectionLog.detection_count,
+            DetectionLog.person_id,
+            Person.name.label("person_name"),
+            DetectionLog.confidence,
+            DetectionLog.source,
+            DetectionLog.source_info,
+            DetectionLog.stream_id,
+            DetectionLog.frame_ref,
+            DetectionLog.bbox_x,
+            DetectionLog.bbox_y,
+            DetectionLog.bbox_w,
+            DetectionLog.bbox_h
+        ).outerjoin(Person, DetectionLog.person_id == Person.id)
+
+        if person_id:
+            query = query.where(DetectionLog.person_id == person_id)
+        if source:
+            query = query.where(DetectionLog.source == source)
+        if stream_id:
+            query = query.where(DetectionLog.stream_id == stream_id)
+        # Limites em UTC, como detected_at (sem fuso = UTC)
+        if start_time:
+            query = query.where(DetectionLog.detected_at >= as_utc(start_time))
+        if end_time:
+            query = query.where(DetectionLog.detected_at < as_utc(end_time))
+
+        return query.order_by(DetectionLog.detected_at, DetectionLog.id)
+
+    def iter_batches(self, query) -> Iterator[List]:
+        """Itera o resultado em lotes usando cursor do lado do servidor"""
+        from app.database.connection import engine
+
+        with engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, yield_per=self.batch_size
+            ).execute(query)
+            for batch in result.partitions():
+                yield batch
+
+    def stream(self, fmt: str, stats: Optional[Dict] = None, **filters) -> Iterator[bytes]:
+        """
+        Gera o conteúdo exportado em blocos de bytes
+
+        Args:
+            fmt: "csv", "ndjson" ou "parquet"
+            stats: Dicionário opcional atualizado com o número de linhas exportadas
+            **filters: person_id, source, start_time, end_time, stream_id
+        """
+        self.validate_format(fmt)
+        if stats is None:
+            stats = {}
+        stats["rows"] = 0
+
+        batches = self.iter_batches(self.build_query(**filters))
+        for chunk in FORMAT_WRITERS[fmt](batches, stats):
+            if chunk:
+                yield chunk
+
+
+# Instância global do serviço de exportação
+detection_export_service = DetectionExportService()
@@ -0,0 +1,119 @@
+import csv
+import io
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+import orjson
+
+# pyarrow é opcional: sem ele a exportação em Parquet fica indisponível
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+EXPORT_COLUMNS = [
+    "id", "detected_at", "ended_at", "detection_count", "person_id", "person_name", "confidence", "source",
+    "source_info", "stream_id", "frame_ref", "bbox_x", "bbox_y", "bbox_w", "bbox_h"
+]
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+
+class _ChunkSink:
+    """Destino de escrita em memória que entrega os bytes por lote (para o ParquetWriter)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_csv(batches, stats: Dict) -> Iterator[bytes]:
+    """CSV com cabeçalho; datetimes em ISO 8601"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        for row in batch:
+            writer.writerow([
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row
+            ])
+        stats["rows"] += len(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    yield buffer.getvalue().encode("utf-8")
+
+
+def stream_ndjson(batches, stats: Dict) -> Iterator[bytes]:
+    """Um objeto JSON por linha"""
+    for batch in batches:
+        yield b"".join(
+            orjson.dumps(dict(zip(EXPORT_COLUMNS, row)), option=orjson.OPT_APPEND_NEWLINE)
+            for row in batch
+        )
+        stats["rows"] += len(batch)
+
+
+def stream_parquet(batches, stats: Dict) -> Iterator[bytes]:
+    """Parquet (zstd) com um row group por lote"""
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("detected_at", pa.timestamp("us", tz="UTC")),
+        ("ended_at", pa.timestamp("us", tz="UTC")),
+        ("detection_count", pa.int32()),
+        ("person_id", pa.int64()),
+        ("person_name", pa.string()),
+        ("confidence", pa.float64()),
+        ("source", pa.string()),
+        ("source_info", pa.string()),
+        ("stream_id", pa.string()),
+        ("frame_ref", pa.string()),
+        ("bbox_x", pa.int32()),
+        ("bbox_y", pa.int32()),
+        ("bbox_w", pa.int32()),
+        ("bbox_h", pa.int32()),
+    ])
+    sink = _ChunkSink()
+    # Cada lote vira um row group; os bytes são entregues assim que escritos
+    with pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd") as writer:
+        for batch in batches:
+            columns = list(zip(*batch))
+            writer.write_batch(pa.record_batch(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            stats["rows"] += len(batch)
+            yield sink.take()
+    yield sink.take()
+
+
+# Serializador de cada formato: (lotes de linhas, estatísticas) -> blocos de bytes
+FORMAT_WRITERS = {"csv": stream_csv, "ndjson": stream_ndjson, "parquet": stream_parquet}
@@ -0,0 +1,149 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import insert
+
+from app.database.models import DetectionLog
+from app.services.counters import counter_service, DETECTION_LOGS
+from app.services.detection_log_spill import DetectionLogSpill, decode_event
+
+logger = logging.getLogger(__name__)
+
+
+class WriterStats:
+    """Contadores do writer, atualizados pelos produtores e pela thread de gravação"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = dict.fromkeys(("written", "dropped", "spilled", "flushes", "errors", "rejected"), 0)
+        self._values["last_flush_ms"] = 0.0
+
+    def count(self, name: str, value: int = 1) -> int:
+        """Soma `value` ao contador e retorna o novo total"""
+        with self._lock:
+            self._values[name] += value
+            return self._values[name]
+
+    def set(self, name: str, value: float):
+        with self._lock:
+            self._values[name] = value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return dict(self._values)
+
+
+class DetectionLogFlusher:
+    """
+    Thread de gravação de um DetectionLogWriter: lotes da fila, inserts e reingestão do spill
+
+    Args:
+        events: Fila preenchida pelos produtores
+        spill: Arquivo de spill (overflow e lotes que falharam)
+        stats: Contadores compartilhados com o writer
+        batch_size, flush_interval, overflow_policy: Configuração do writer
+    """
+
+    def __init__(self, events: queue.Queue, spill: DetectionLogSpill, stats: WriterStats,
+                 batch_size: int, flush_interval: float, overflow_policy: str):
+        self.events = events
+        self.spill = spill
+        self.stats = stats
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+
+    def spill_events(self, events: List[Dict]) -> bool:
+        """Grava eventos no arquivo de spill (False se não foi possível)"""
+        try:
+            self.spill.append(events)
+            self.stats.count("spilled", len(events))
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao gravar spill de logs de detecção: {e}")
+            return False
+
+    def _collect_batch(self) -> List[Dict]:
+        """Aguarda o primeiro evento e coleta até batch_size ou até o intervalo expirar"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.events.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, rows: List[Dict]) -> bool:
+        """Grava um lote com um único insert e commit (False se o lote não foi gravado)"""
+        if not rows:
+            return True
+        from app.database.connection import SessionLocal
+
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            db.execute(insert(DetectionLog), rows)
+            counter_service.increment(db, DETECTION_LOGS, len(rows))
+            db.commit()
+            self.stats.count("written", len(rows))
+            self.stats.count("flushes")
+            return True
+        except Exception as e:
+            db.rollback()
+            self.stats.count("errors")
+            logger.error(f"Erro ao gravar lote de {len(rows)} logs de detecção: {e}")
+            return False
+        finally:
+            db.close()
+            self.stats.set("last_flush_ms", (time.perf_counter() - start) * 1000)
+
+    def _write_or_spill(self, rows: List[Dict]):
+        """Grava um lote da fila; com a política "spill", um lote que falhou vai para o disco"""
+        if not self._write(rows) and self.overflow_policy == "spill":
+            self.spill_events(rows)
+
+    def _drain_spill(self):
+        """Reingere eventos gravados em disco quando a fila tem folga"""
+        if self.events.qsize() > self.batch_size or not self.spill.claim():
+            return
+
+        lines = self.spill.pending_lines()
+        for offset in range(0, len(lines), self.batch_size):
+            rows = []
+            for line in lines[offset:offset + self.batch_size]:
+                try:
+                    rows.append(decode_event(line))
+                except (ValueError, KeyError) as e:
+                    self.stats.count("errors")
+                    logger.error(f"Linha inválida no spill de logs de detecção descartada: {e}")
+            if not self._write(rows):
+                # Manter apenas o que ainda não foi gravado; nova tentativa no próximo ciclo
+                self.spill.keep(lines[offset:])
+                return
+        self.spill.finish()
+
+    def run(self, stop_event: threading.Event):
+        """Loop da thread de gravação até `stop_event`; depois grava o que restou na fila"""
+        while not stop_event.is_set():
+            self._write_or_spill(self._collect_batch())
+            self._drain_spill()
+
+        # Encerramento: gravar tudo o que restou na fila
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.events.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                break
+            self._write_or_spill(batch)
+        self._drain_spill()
@@ -0,0 +1,95 @@
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from app.database.migrations import parse_legacy_bounding_box
+
+
+def encode_bbox(bbox: Optional[Sequence[int]]) -> Dict:
+    """Converte a bounding box para as colunas numéricas de DetectionLog"""
+    if bbox is None:
+        return {"bbox_x": None, "bbox_y": None, "bbox_w": None, "bbox_h": None}
+    x, y, w, h = (int(v) for v in bbox)
+    return {"bbox_x": x, "bbox_y": y, "bbox_w": w, "bbox_h": h}
+
+
+def encode_event(event: Dict) -> str:
+    """Linha JSON de um evento de detecção (datetimes em ISO 8601)"""
+    return json.dumps({
+        **event,
+        "detected_at": event["detected_at"].isoformat(),
+        "ended_at": event["ended_at"].isoformat() if event["ended_at"] else None
+    }) + "\n"
+
+
+def decode_event(line: str) -> Dict:
+    """Evento de detecção a partir de uma linha do spill (ValueError/KeyError se inválida)"""
+    record = json.loads(line)
+    record["detected_at"] = datetime.fromisoformat(record["detected_at"])
+    if record.get("ended_at"):
+        record["ended_at"] = datetime.fromisoformat(record["ended_at"])
+    # Spill gravado por versões anteriores (sem as colunas de aparição)
+    for column in ("ended_at", "detection_count", "frame_ref"):
+        record.setdefault(column, None)
+    if "bounding_box" in record:
+        record.update(parse_legacy_bounding_box(record.pop("bounding_box")))
+    return record
+
+
+class DetectionLogSpill:
+    """
+    Arquivo de spill do DetectionLogWriter
+
+    Eventos são acrescentados a `path`. Para reingerir, o spill é movido para
+    `draining_path`, que só é removido depois que todos os lotes forem
+    gravados; se um lote falhar, o arquivo passa a conter apenas as linhas
+    ainda não gravadas.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.draining_path = self.path.with_suffix(".draining")
+        self._lock = threading.Lock()
+
+    def append(self, events: List[Dict]):
+        """Acrescenta eventos ao spill (uma linha JSON por evento)"""
+        lines = "".join(encode_event(event) for event in events)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+    def claim(self) -> bool:
+        """
+        Move o spill atual para o arquivo de reingestão
+
+        Um arquivo de reingestão deixado por uma execução interrompida é
+        retomado: o spill novo é acrescentado a ele, nunca o substitui.
+        """
+        with self._lock:
+            if self.path.exists():
+                if self.draining_path.exists():
+                    with open(self.path, 'r', encoding='utf-8') as src, \
+                            open(self.draining_path, 'a', encoding='utf-8') as dst:
+                        dst.write(src.read())
+                    self.path.unlink()
+                else:
+                    self.path.replace(self.draining_path)
+        return self.draining_path.exists()
+
+    def pending_lines(self) -> List[str]:
+        """Linhas do arquivo de reingestão"""
+        with open(self.draining_path, 'r', encoding='utf-8') as f:
+            return [line for line in f if line.strip()]
+
+    def keep(self, lines: List[str]):
+        """Substitui o arquivo de reingestão pelas linhas ainda não gravadas"""
+        remaining_path = self.draining_path.with_suffix(".remaining")
+        with open(remaining_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        remaining_path.replace(self.draining_path)
+
+    def finish(self):
+        """Remove o arquivo de reingestão (todos os lotes gravados)"""
+        self.draining_path.unlink()
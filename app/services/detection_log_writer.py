@@ -0,0 +1,138 @@
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from app.config import (
+    DETECTION_LOG_QUEUE_SIZE, DETECTION_LOG_BATCH_SIZE, DETECTION_LOG_FLUSH_INTERVAL,
+    DETECTION_LOG_OVERFLOW_POLICY, DETECTION_LOG_SPILL_PATH
+)
+from app.services.detection_log_flush import DetectionLogFlusher, WriterStats
+from app.services.detection_log_spill import DetectionLogSpill, encode_bbox
+
+logger = logging.getLogger(__name__)
+
+
+class DetectionLogWriter:
+    """
+    Gravação assíncrona e em lote de DetectionLog
+
+    Produtores enfileiram eventos sem bloquear; uma thread dedicada grava os
+    eventos com inserts em lote quando o lote enche ou o intervalo expira.
+    Com a fila cheia, eventos são descartados ("drop") ou gravados em disco
+    ("spill") e reingeridos depois. Com "spill", lotes que falham ao gravar
+    (banco indisponível) também vão para o disco; o arquivo em reingestão só
+    é removido depois que todos os seus lotes forem confirmados (entrega
+    pelo menos uma vez: uma queda no meio da reingestão pode duplicar linhas).
+    """
+
+    def __init__(self, max_queue_size: int = DETECTION_LOG_QUEUE_SIZE,
+                 batch_size: int = DETECTION_LOG_BATCH_SIZE,
+                 flush_interval: float = DETECTION_LOG_FLUSH_INTERVAL,
+                 overflow_policy: str = DETECTION_LOG_OVERFLOW_POLICY,
+                 spill_path: Path = DETECTION_LOG_SPILL_PATH):
+        self.queue: "queue.Queue[Dict]" = queue.Queue(maxsize=max_queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.spill = DetectionLogSpill(spill_path)
+        self.stats = WriterStats()
+        self.flusher = DetectionLogFlusher(self.queue, self.spill, self.stats, batch_size, flush_interval,
+                                           overflow_policy)
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._start_lock = threading.Lock()
+        self._stopped = False
+
+    def start(self):
+        """Inicia a thread de gravação (idempotente; reativa o writer após stop)"""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self.flusher.run, args=(self._stop_event,),
+                                            name="detection-log-writer", daemon=True)
+            self._thread.start()
+            logger.info("Writer de logs de detecção iniciado")
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Para a thread de gravação após gravar todos os eventos pendentes
+
+        Eventos enviados depois disso são recusados até um novo start().
+        """
+        with self._start_lock:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+        if not thread:
+            return
+        self._stop_event.set()
+        thread.join(timeout=timeout)
+        logger.info(f"Writer de logs de detecção parado ({self.stats.snapshot()['written']} gravados)")
+
+    def submit(self, person_id: Optional[int], confidence: float, source: str,
+               source_info: Optional[str] = None, bbox: Optional[Sequence[int]] = None,
+               detected_at: Optional[datetime] = None, stream_id: Optional[str] = None,
+               ended_at: Optional[datetime] = None, detection_count: Optional[int] = None,
+               frame_ref: Optional[str] = None) -> bool:
+        """
+        Enfileira um evento de detecção sem bloquear
+
+        Args:
+            bbox: Tupla (x, y, w, h) da face, se disponível
+            ended_at, detection_count, frame_ref: Preenchidos para aparições agregadas
+
+        Returns:
+            False se o evento foi descartado (fila cheia ou writer parado)
+        """
+        if self._stopped:
+            self.stats.count("rejected")
+            return False
+        if self._thread is None:
+            self.start()
+
+        event = {
+            "person_id": person_id,
+            "confidence": float(confidence),
+            "source": source,
+            "source_info": source_info,
+            "stream_id": stream_id,
+            "detected_at": detected_at or datetime.now(timezone.utc),
+            "ended_at": ended_at,
+            "detection_count": detection_count,
+            "frame_ref": frame_ref,
+            **encode_bbox(bbox)
+        }
+
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except queue.Full:
+            return self._handle_overflow(event)
+
+    def _handle_overflow(self, event: Dict) -> bool:
+        """Aplica a política de overflow quando a fila está cheia"""
+        if self.overflow_policy == "spill" and self.flusher.spill_events([event]):
+            return True
+
+        dropped = self.stats.count("dropped")
+        if dropped % 1000 == 1:
+            logger.warning(f"Fila de logs de detecção cheia: {dropped} eventos descartados")
+        return False
+
+    def get_status(self) -> Dict:
+        """Retorna o estado atual do writer"""
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "queue_size": self.queue.qsize(),
+            "overflow_policy": self.overflow_policy,
+            **self.stats.snapshot()
+        }
+
+
+# Instância global do writer de logs de detecção
+detection_log_writer = DetectionLogWriter()
@@ -0,0 +1,123 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.config import (
+    DETECTION_LOG_RETENTION_DAYS, ROLLUP_HOURLY_RETENTION_DAYS, ROLLUP_LOOKBACK_SECONDS,
+    RETENTION_INTERVAL_SECONDS, RETENTION_DELETE_CHUNK
+)
+from app.database.models import DetectionLog, DetectionRollupHourly, DetectionRollupDaily
+from app.services.detection_rollups import as_utc, truncate_bucket, rollup
+from app.services.counters import counter_service, DETECTION_LOGS
+
+logger = logging.getLogger(__name__)
+
+
+class DetectionRetentionService:
+    """
+    Retenção de detection_logs com agregados por hora e por dia
+
+    - Agrega logs brutos em detection_rollups_hourly (por pessoa, origem e stream),
+      recalculando a janela de lookback para incluir aparições gravadas com atraso
+    - Reagrega os horários em detection_rollups_daily
+    - Remove logs brutos além da janela de retenção (somente já agregados)
+    """
+
+    def __init__(self, lookback: timedelta = timedelta(seconds=ROLLUP_LOOKBACK_SECONDS)):
+        self.lookback = lookback
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.last_run: Optional[Dict] = None
+
+    def _purge_raw(self, db: Session, now: datetime) -> int:
+        """Remove logs brutos antigos já cobertos pelos agregados horários"""
+        cutoff = now - timedelta(days=DETECTION_LOG_RETENTION_DAYS)
+        watermark = db.query(func.max(DetectionRollupHourly.bucket_start)).scalar()
+        if watermark is None:
+            return 0
+        # O último intervalo agregado e a janela de lookback são recalculados; não apagar a partir deles
+        cutoff = min(cutoff, as_utc(watermark), truncate_bucket(now - self.lookback, "hour"))
+
+        removed = 0
+        while True:
+            ids = select(DetectionLog.id).where(DetectionLog.detected_at < cutoff).limit(RETENTION_DELETE_CHUNK)
+            result = db.execute(delete(DetectionLog).where(DetectionLog.id.in_(ids)))
+            counter_service.increment(db, DETECTION_LOGS, -result.rowcount)
+            db.commit()
+            removed += result.rowcount
+            if result.rowcount < RETENTION_DELETE_CHUNK:
+                break
+        return removed
+
+    def _purge_hourly(self, db: Session, now: datetime) -> int:
+        """Remove agregados horários além da retenção (os diários são mantidos)"""
+        cutoff = truncate_bucket(now - timedelta(days=ROLLUP_HOURLY_RETENTION_DAYS), "day")
+        watermark = db.query(func.max(DetectionRollupDaily.bucket_start)).scalar()
+        if watermark is None:
+            return 0
+        cutoff = min(cutoff, as_utc(watermark), truncate_bucket(now - self.lookback, "day"))
+
+        result = db.execute(delete(DetectionRollupHourly).where(DetectionRollupHourly.bucket_start < cutoff))
+        db.commit()
+        return result.rowcount
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict:
+        """Executa um ciclo completo de agregação e retenção"""
+        from app.database.connection import SessionLocal
+
+        now = as_utc(now or datetime.now(timezone.utc))
+        db = SessionLocal()
+        try:
+            hourly = rollup(db, DetectionLog, DetectionRollupHourly, DetectionLog.detected_at, "hour", now,
+                            self.lookback)
+            daily = rollup(db, DetectionRollupHourly, DetectionRollupDaily,
+                           DetectionRollupHourly.bucket_start, "day", now, self.lookback)
+            raw_removed = self._purge_raw(db, now)
+            hourly_removed = self._purge_hourly(db, now)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        self.last_run = {
+            "ran_at": now.isoformat(),
+            "hourly_buckets": hourly,
+            "daily_buckets": daily,
+            "raw_logs_removed": raw_removed,
+            "hourly_rollups_removed": hourly_removed
+        }
+        if raw_removed:
+            logger.info(f"Retenção: {raw_removed} logs brutos removidos")
+        return self.last_run
+
+    def start(self):
+        """Inicia a execução periódica em background"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="detection-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Interrompe a execução periódica"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Erro na retenção de logs de detecção: {e}")
+            self._stop_event.wait(RETENTION_INTERVAL_SECONDS)
+
+
+# Instância global do serviço de retenção
+detection_retention = DetectionRetentionService()
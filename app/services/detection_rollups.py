@@ -0,0 +1,85 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.database.models import DetectionLog
+
+logger = logging.getLogger(__name__)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Normaliza datetimes lidos do banco (SQLite retorna sem fuso) para UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def truncate_bucket(value: datetime, granularity: str) -> datetime:
+    """Início (UTC) da hora ou do dia que contém o instante"""
+    value = as_utc(value).replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        value = value.replace(hour=0)
+    return value
+
+
+def _bucket_expr(db: Session, column, granularity: str):
+    """Expressão SQL que trunca um timestamp para o início da hora/dia"""
+    if db.bind.dialect.name == "sqlite":
+        fmt = "%Y-%m-%d 00:00:00.000000" if granularity == "day" else "%Y-%m-%d %H:00:00.000000"
+        return func.strftime(fmt, column)
+    return func.date_trunc(granularity, column)
+
+
+def rollup(db: Session, source_model, target_model, time_column, granularity: str, now: datetime,
+           lookback: timedelta = timedelta(0)) -> int:
+    """
+    Recalcula os intervalos completos do agregado de destino desde a última marca
+
+    O último intervalo agregado e os que começam dentro de `lookback` antes de
+    `now` são sempre recalculados, cobrindo linhas que chegaram atrasadas.
+    """
+    step = timedelta(days=1) if granularity == "day" else timedelta(hours=1)
+    end = truncate_bucket(now, granularity)
+
+    last_bucket = db.query(func.max(target_model.bucket_start)).scalar()
+    if last_bucket is not None:
+        start = min(as_utc(last_bucket), truncate_bucket(now - lookback, granularity))
+    else:
+        first = db.query(func.min(time_column)).scalar()
+        if first is None:
+            return 0
+        start = truncate_bucket(first, granularity)
+
+    if start >= end:
+        return 0
+
+    bucket = _bucket_expr(db, time_column, granularity).label("bucket_start")
+    is_raw = source_model is DetectionLog
+    # Cada linha bruta é uma aparição com detection_count detecções (None em detecções avulsas)
+    count = func.coalesce(DetectionLog.detection_count, 1)
+    aggregates = [
+        func.sum(count if is_raw else source_model.detections).label("detections"),
+        func.max(source_model.confidence if is_raw else source_model.max_confidence).label("max_confidence"),
+        func.sum(source_model.confidence * count if is_raw else source_model.sum_confidence).label("sum_confidence"),
+        func.min(time_column if is_raw else source_model.first_seen).label("first_seen"),
+        func.max(time_column if is_raw else source_model.last_seen).label("last_seen"),
+    ]
+    aggregated = (
+        select(bucket, source_model.person_id, source_model.source, source_model.stream_id, *aggregates)
+        .where(time_column >= start, time_column < end)
+        .group_by(bucket, source_model.person_id, source_model.source, source_model.stream_id)
+    )
+
+    db.execute(delete(target_model).where(target_model.bucket_start >= start, target_model.bucket_start < end))
+    result = db.execute(insert(target_model).from_select(
+        ["bucket_start", "person_id", "source", "stream_id", "detections",
+         "max_confidence", "sum_confidence", "first_seen", "last_seen"],
+        aggregated
+    ))
+    db.commit()
+
+    buckets = int((end - start) / step)
+    logger.info(f"Agregados {granularity}: {buckets} intervalos recalculados ({result.rowcount} linhas)")
+    return buckets
@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database.models import DetectionRollupHourly, DetectionRollupDaily, Person
+from app.services.detection_rollups import as_utc
+
+
+def query_sightings(db: Session, granularity: str = "day",
+                    start_time: Optional[datetime] = None, end_time: Optional[datetime] = None,
+                    person_id: Optional[int] = None, source: Optional[str] = None,
+                    stream_id: Optional[str] = None, limit: int = 1000) -> List[Dict]:
+    """Aparições por pessoa por hora/dia, servidas a partir dos agregados"""
+    model = DetectionRollupDaily if granularity == "day" else DetectionRollupHourly
+
+    query = db.query(
+        model.bucket_start,
+        model.person_id,
+        Person.name,
+        func.sum(model.detections).label("detections"),
+        func.max(model.max_confidence).label("max_confidence"),
+        func.sum(model.sum_confidence).label("sum_confidence"),
+        func.min(model.first_seen).label("first_seen"),
+        func.max(model.last_seen).label("last_seen")
+    ).outerjoin(Person, model.person_id == Person.id)
+
+    # Limites em UTC, como bucket_start (sem fuso = UTC)
+    if start_time:
+        query = query.filter(model.bucket_start >= as_utc(start_time))
+    if end_time:
+        query = query.filter(model.bucket_start < as_utc(end_time))
+    if person_id:
+        query = query.filter(model.person_id == person_id)
+    if source:
+        query = query.filter(model.source == source)
+    if stream_id:
+        query = query.filter(model.stream_id == stream_id)
+
+    rows = (
+        query.group_by(model.bucket_start, model.person_id, Person.name)
+        .order_by(model.bucket_start.desc(), model.person_id)
+        .limit(limit)
+        .all()
+    )
+
+    return [
+        {
+            "bucket_start": row.bucket_start,
+            "person_id": row.person_id,
+            "person_name": row.name if row.name else "Desconhecido",
+            "detections": row.detections,
+            "max_confidence": row.max_confidence,
+            "average_confidence": row.sum_confidence / row.detections if row.detections else 0.0,
+            "first_seen": row.first_seen,
+            "last_seen": row.last_seen
+        }
+        for row in rows
+    ]
@@ -0,0 +1,125 @@
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from app.config import FACE_DETECTION_SIZE, ZONE_CROP_MARGIN
+
+# Recorte (x1, y1, x2, y2) do frame e tamanho de entrada (largura, altura) do detector
+Crop = Tuple[Tuple[int, int, int, int], Tuple[int, int]]
+
+
+def _align(value: float, step: int = 32) -> int:
+    """Arredonda para cima ao múltiplo de `step` (stride máximo do detector SCRFD)"""
+    return max(step, int(math.ceil(value / step)) * step)
+
+
+def zone_polygon(zone: Dict) -> List[List[int]]:
+    """Polígono de uma zona definida por `polygon` ou por `rect` [x, y, w, h]"""
+    if zone.get("polygon"):
+        return [[int(x), int(y)] for x, y in zone["polygon"]]
+    x, y, w, h = (int(v) for v in zone["rect"])
+    return [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]
+
+
+class DetectionZones:
+    """
+    Regiões de interesse de um stream
+
+    A detecção roda apenas nos recortes retangulares que envolvem as zonas
+    (com margem de ZONE_CROP_MARGIN para faces na borda; recortes que se
+    sobrepõem são unidos). Cada recorte usa a mesma escala que o frame
+    inteiro teria em FACE_DETECTION_SIZE, de modo que o custo da detecção
+    acompanha a área das zonas. As coordenadas voltam ao frame original e
+    faces com centro fora de todas as zonas são descartadas.
+    """
+
+    def __init__(self, zones: Sequence[Dict], margin: float = ZONE_CROP_MARGIN,
+                 detection_size: Tuple[int, int] = FACE_DETECTION_SIZE):
+        self.zones = [
+            {"name": zone.get("name") or f"zona{i + 1}", "polygon": zone_polygon(zone)}
+            for i, zone in enumerate(zones)
+        ]
+        self._polygons = [np.asarray(zone["polygon"], dtype=np.int32) for zone in self.zones]
+        self.margin = margin
+        self.detection_size = detection_size
+        self._frame_shape: Optional[Tuple[int, int]] = None
+        self._crops: List[Crop] = []
+        self.area_ratio = 1.0
+        self.discarded = 0
+
+    def _prepare(self, height: int, width: int):
+        """Calcula (uma vez por resolução) os recortes e o tamanho de entrada de cada um"""
+        rects = []
+        for polygon in self._polygons:
+            x, y, w, h = cv2.boundingRect(polygon)
+            pad = int(max(w, h) * self.margin)
+            rects.append([max(0, x - pad), max(0, y - pad), min(width, x + w + pad), min(height, y + h + pad)])
+
+        # Unir recortes sobrepostos (a mesma face não é detectada duas vezes)
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(rects)):
+                for j in range(i + 1, len(rects)):
+                    a, b = rects[i], rects[j]
+                    if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                        rects[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                        del rects[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+        rects = [rect for rect in rects if rect[2] > rect[0] and rect[3] > rect[1]]
+
+        # Escala do frame inteiro no detector, aplicada a cada recorte
+        scale = min(self.detection_size[0] / width, self.detection_size[1] / height)
+        self._crops = [
+            ((x1, y1, x2, y2), (_align((x2 - x1) * scale), _align((y2 - y1) * scale)))
+            for x1, y1, x2, y2 in rects
+        ]
+        self.area_ratio = sum((x2 - x1) * (y2 - y1) for (x1, y1, x2, y2), _ in self._crops) / (width * height)
+        self._frame_shape = (height, width)
+
+    def zone_of(self, x: float, y: float) -> Optional[str]:
+        """Nome da primeira zona que contém o ponto"""
+        for zone, polygon in zip(self.zones, self._polygons):
+            if cv2.pointPolygonTest(polygon, (float(x), float(y)), False) >= 0:
+                return zone["name"]
+        return None
+
+    def detect(self, frame: np.ndarray,
+               detect: Callable[[np.ndarray, Optional[Tuple[int, int]]], List[dict]]) -> List[dict]:
+        """
+        Executa `detect(recorte, input_size)` em cada recorte e retorna as faces
+        dentro das zonas, em coordenadas do frame, com o nome da zona em 'zone'
+        """
+        height, width = frame.shape[:2]
+        if self._frame_shape != (height, width):
+            self._prepare(height, width)
+
+        results = []
+        for (x1, y1, x2, y2), input_size in self._crops:
+            crop = np.ascontiguousarray(frame[y1:y2, x1:x2])
+            for region in detect(crop, input_size):
+                offset = np.array([x1, y1], dtype=region["bbox"].dtype)
+                bbox = region["bbox"] + np.tile(offset, 2)
+                center_x, center_y = (bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2
+                zone = self.zone_of(center_x, center_y)
+                if zone is None:
+                    self.discarded += 1
+                    continue
+                kps = region.get("kps")
+                results.append({
+                    **region,
+                    "bbox": bbox,
+                    "kps": kps + np.array([x1, y1], dtype=kps.dtype) if kps is not None else None,
+                    "zone": zone
+                })
+        return results
+
+    def draw(self, image: np.ndarray) -> np.ndarray:
+        """Desenha o contorno das zonas (a imagem é modificada)"""
+        cv2.polylines(image, self._polygons, True, (0, 255, 255), 2)
+        return image
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from app.config import EVENT_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Tipos de evento publicados pelos streams
+DETECTION_EVENT = "detection"
+STREAM_STATE_EVENT = "stream_state"
+SIGHTING_EVENT = "sighting"  # Aparição encerrada
+CLIP_EVENT = "clip"  # Clip gravado em disco
+
+
+class EventSubscription:
+    """
+    Fila limitada de eventos de um cliente, pertencente a um event loop
+
+    Com a fila cheia, o evento mais antigo é descartado: um cliente lento
+    perde eventos antigos, mas nunca atrasa os produtores nem os demais clientes.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, stream_ids: Optional[Set[str]] = None,
+                 event_types: Optional[Set[str]] = None, max_queue_size: int = EVENT_QUEUE_SIZE):
+        self.loop = loop
+        self.stream_ids = stream_ids
+        self.event_types = event_types
+        self.queue: "asyncio.Queue[Dict]" = asyncio.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+
+    def matches(self, event: Dict) -> bool:
+        if self.stream_ids and event.get("stream_id") not in self.stream_ids:
+            return False
+        if self.event_types and event["type"] not in self.event_types:
+            return False
+        return True
+
+    def _deliver(self, event: Dict):
+        """Executado no event loop do cliente"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Dict:
+        return await self.queue.get()
+
+
+class EventBus:
+    """
+    Barramento de eventos em tempo real (detecções, estado dos streams)
+
+    `publish` pode ser chamado de qualquer thread (captura, workers de
+    inferência); cada assinante recebe o evento no seu event loop via
+    call_soon_threadsafe. Listeners síncronos são chamados na thread do
+    produtor (ex: repasse dos processos worker para a API).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Set[EventSubscription] = set()
+        self._listeners: List[Callable[[Dict], None]] = []
+        self.published = 0
+
+    def subscribe(self, stream_ids: Optional[Iterable[str]] = None,
+                  event_types: Optional[Iterable[str]] = None) -> EventSubscription:
+        """Cria uma assinatura no event loop atual (filtros opcionais por stream e tipo)"""
+        subscription = EventSubscription(
+            asyncio.get_running_loop(),
+            set(stream_ids) if stream_ids else None,
+            set(event_types) if event_types else None
+        )
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def add_listener(self, listener: Callable[[Dict], None]):
+        """Registra função síncrona chamada com cada evento publicado"""
+        self._listeners.append(listener)
+
+    def publish(self, event_type: str, stream_id: Optional[str] = None, **payload):
+        """Publica um evento (thread-safe, não bloqueia)"""
+        self.dispatch({"type": event_type, "stream_id": stream_id, "timestamp": time.time(), **payload})
+
+    def dispatch(self, event: Dict):
+        """Entrega um evento já montado aos listeners e assinantes"""
+        self.published += 1
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Erro em listener de eventos: {e}")
+
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.matches(event)]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # Event loop do assinante já encerrado
+                self.unsubscribe(subscription)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+
+# Instância global do barramento de eventos
+event_bus = EventBus()
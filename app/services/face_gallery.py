@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.config import FACE_RECOGNITION_THRESHOLD, FACE_GALLERY_REFRESH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class FaceGallery:
+    """
+    Galeria em memória dos embeddings das pessoas ativas
+
+    Os embeddings ficam normalizados em uma única matriz, de modo que a
+    comparação com toda a galeria é um produto matriz-vetor. A galeria é
+    recarregada do banco após `invalidate` (cadastros e remoções) ou a cada
+    FACE_GALLERY_REFRESH_SECONDS (alterações feitas por outros processos,
+    ex: CLI de cadastro em lote ou processos worker); a recarga acontece em
+    background e as consultas usam o snapshot anterior até ela terminar.
+    """
+
+    def __init__(self, threshold: float = FACE_RECOGNITION_THRESHOLD,
+                 refresh_seconds: float = FACE_GALLERY_REFRESH_SECONDS):
+        self.threshold = threshold
+        self.refresh_seconds = refresh_seconds
+        # (matriz normalizada, person_id por linha, nome por person_id)
+        self._snapshot: Tuple[np.ndarray, np.ndarray, Dict[int, str]] = (
+            np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=np.int64), {}
+        )
+        self._loaded_at: Optional[float] = None
+        self._stale = True
+        self._load_lock = threading.Lock()
+        self.matches = 0
+
+    def load(self):
+        """Lê os embeddings das pessoas ativas e substitui o snapshot"""
+        from app.database.connection import SessionLocal
+        from app.database.models import Person, FaceEmbedding
+
+        self._stale = False
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(FaceEmbedding.person_id, FaceEmbedding.embedding, Person.name)
+                .join(Person, FaceEmbedding.person_id == Person.id)
+                .filter(Person.is_active == True)
+                .all()
+            )
+        finally:
+            db.close()
+
+        if rows:
+            matrix = np.stack([np.frombuffer(embedding, dtype=np.float32) for _, embedding, _ in rows])
+            matrix = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+        person_ids = np.array([person_id for person_id, _, _ in rows], dtype=np.int64)
+        names = {person_id: name for person_id, _, name in rows}
+
+        self._snapshot = (matrix.astype(np.float32), person_ids, names)
+        self._loaded_at = time.monotonic()
+        logger.info(f"Galeria de faces carregada: {len(names)} pessoas, {len(rows)} embeddings")
+
+    def invalidate(self):
+        """Marca a galeria para recarga na próxima consulta"""
+        self._stale = True
+
+    def _refresh(self):
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f"Erro ao carregar galeria de faces: {e}")
+        finally:
+            self._load_lock.release()
+
+    def _ensure_fresh(self):
+        expired = self._loaded_at is None or time.monotonic() - self._loaded_at >= self.refresh_seconds
+        if not (self._stale or expired) or not self._load_lock.acquire(blocking=False):
+            return
+        if self._loaded_at is None:
+            # Primeira carga: síncrona (sem ela nenhuma face seria reconhecida)
+            self._refresh()
+        else:
+            threading.Thread(target=self._refresh, name="face-gallery-refresh", daemon=True).start()
+
+    def match(self, embedding: np.ndarray) -> Optional[Dict]:
+        """
+        Pessoa mais parecida com o embedding (similaridade cosseno >= threshold)
+
+        Returns:
+            {'person_id', 'person_name', 'confidence'} ou None
+        """
+        self._ensure_fresh()
+        matrix, person_ids, names = self._snapshot
+        if not len(person_ids) or embedding is None or embedding.shape[0] != matrix.shape[1]:
+            return None
+
+        norm = np.linalg.norm(embedding)
+        if norm == 0:
+            return None
+        similarities = matrix @ (embedding.astype(np.float32) / norm)
+        best = int(np.argmax(similarities))
+        confidence = float(similarities[best])
+        if confidence < self.threshold:
+            return None
+
+        self.matches += 1
+        person_id = int(person_ids[best])
+        return {'person_id': person_id, 'person_name': names[person_id], 'confidence': confidence}
+
+    def stats(self) -> Dict:
+        matrix, person_ids, names = self._snapshot
+        return {
+            'persons': len(names),
+            'embeddings': len(person_ids),
+            'matches': self.matches,
+            'age_seconds': time.monotonic() - self._loaded_at if self._loaded_at is not None else None
+        }
+
+
+# Instância global da galeria (uma por processo)
+face_gallery = FaceGallery()
@@ -5,20 +5,23 @@ from insightface.app import FaceAnalysis
 from typing import List, Tuple, Optional
 import logging
 from PIL import Image
-from app.config import INSIGHTFACE_MODEL, FACE_DETECTION_THRESHOLD, FACE_RECOGNITION_THRESHOLD
+from app.config import INSIGHTFACE_MODEL, FACE_DETECTION_SIZE, FACE_DETECTION_THRESHOLD, FACE_RECOGNITION_THRESHOLD
+from app.services.face_regions import FaceRegionDetector
 
 logger = logging.getLogger(__name__)
 
 class FaceRecognitionService:
     def __init__(self):
         self.app = None
+        self.regions: Optional[FaceRegionDetector] = None
         self.initialize_model()
     
     def initialize_model(self):
         """Inicializa o modelo InsightFace"""
         try:
             self.app = FaceAnalysis(name=INSIGHTFACE_MODEL)
-            self.app.prepare(ctx_id=0, det_size=(640, 640))
+            self.app.prepare(ctx_id=0, det_size=FACE_DETECTION_SIZE)
+            self.regions = FaceRegionDetector(self.app)
             logger.info(f"Modelo {INSIGHTFACE_MODEL} inicializado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao inicializar modelo InsightFace: {e}")
@@ -39,8 +42,8 @@ class FaceRecognitionService:
             logger.error(f"Erro ao preprocessar imagem {image_path}: {e}")
             raise
     
-    def detect_faces(self, image: np.ndarray) -> List[dict]:
-        """Detecta faces na imagem e extrai embeddings"""
+    def detect_faces(self, image: np.ndarray, raise_errors: bool = False) -> List[dict]:
+        """Detecta faces na imagem e extrai embeddings (erros retornam [] salvo com raise_errors)"""
         try:
             faces = self.app.get(image)
             results = []
@@ -61,12 +64,22 @@ class FaceRecognitionService:
             return results
         except Exception as e:
             logger.error(f"Erro na detecção de faces: {e}")
+            if raise_errors:
+                raise
             return []
     
-    def extract_face_embedding(self, image_path: str) -> List[dict]:
+    def detect_face_regions(self, image: np.ndarray, input_size: Optional[Tuple[int, int]] = None) -> List[dict]:
+        """Detecta faces sem extrair embeddings (FaceRegionDetector.detect)"""
+        return self.regions.detect(image, input_size)
+    
+    def compute_embedding(self, image: np.ndarray, detection: dict) -> Optional[np.ndarray]:
+        """Extrai o embedding ArcFace de uma face de detect_face_regions (FaceRegionDetector.embedding)"""
+        return self.regions.embedding(image, detection)
+    
+    def extract_face_embedding(self, image_path: str, raise_errors: bool = False) -> List[dict]:
         """Extrai embeddings de todas as faces detectadas na imagem"""
         img = self.preprocess_image(image_path)
-        return self.detect_faces(img)
+        return self.detect_faces(img, raise_errors)
     
     def compare_embeddings(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """Compara dois embeddings e retorna a similaridade (cosine similarity)"""
@@ -119,8 +132,12 @@ class FaceRecognitionService:
             # Desenhar retângulo
             cv2.rectangle(img_copy, (bbox[0], bbox[1]), (bbox[2], bbox[3]), (0, 255, 0), 2)
             
-            # Adicionar texto com confiança
+            # Adicionar texto com confiança (ID do track, se rastreada, e nome, se identificada)
             text = f"{confidence:.2f}"
+            if detection.get('track_id') is not None:
+                text = f"#{detection['track_id']} {text}"
+            if detection.get('person_name'):
+                text = f"{detection['person_name']} ({detection.get('similarity') or confidence:.2f})"
             cv2.putText(img_copy, text, (bbox[0], bbox[1] - 10), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
         
@@ -0,0 +1,56 @@
+import numpy as np
+from insightface.app.common import Face
+from typing import List, Tuple, Optional
+import logging
+from app.config import FACE_DETECTION_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+class FaceRegionDetector:
+    """
+    Detecção e reconhecimento em duas etapas (streams e vídeos)
+    
+    A detecção roda sem extrair embeddings, e o embedding é calculado só para
+    as faces que precisam ser identificadas.
+    
+    Args:
+        analysis: FaceAnalysis inicializado (modelos de detecção e reconhecimento)
+    """
+    
+    def __init__(self, analysis):
+        self.analysis = analysis
+    
+    def detect(self, image: np.ndarray, input_size: Optional[Tuple[int, int]] = None) -> List[dict]:
+        """
+        Detecta faces sem extrair embeddings (apenas o modelo de detecção)
+        
+        input_size: (largura, altura) de entrada do detector, múltiplos de 32
+        (padrão FACE_DETECTION_SIZE); recortes menores usam entradas menores
+        """
+        try:
+            bboxes, kpss = self.analysis.det_model.detect(image, input_size=input_size, max_num=0, metric='default')
+            results = []
+            
+            for i, det in enumerate(bboxes):
+                score = float(det[4])
+                if score >= FACE_DETECTION_THRESHOLD:
+                    results.append({
+                        'bbox': det[:4].astype(int),  # [x1, y1, x2, y2]
+                        'confidence': score,
+                        'kps': kpss[i] if kpss is not None else None
+                    })
+            
+            return results
+        except Exception as e:
+            logger.error(f"Erro na detecção de faces: {e}")
+            return []
+    
+    def embedding(self, image: np.ndarray, detection: dict) -> Optional[np.ndarray]:
+        """Extrai o embedding ArcFace de uma face detectada por detect"""
+        try:
+            face = Face(bbox=detection['bbox'], kps=detection['kps'], det_score=detection['confidence'])
+            self.analysis.models['recognition'].get(image, face)
+            return face.embedding
+        except Exception as e:
+            logger.error(f"Erro ao extrair embedding: {e}")
+            return None
@@ -0,0 +1,129 @@
+import itertools
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config import FACE_TRACK_IOU_THRESHOLD, FACE_TRACK_MAX_AGE, FACE_TRACK_REVERIFY_SECONDS
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """IoU entre todas as caixas [x1, y1, x2, y2] de A (linhas) e B (colunas)"""
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)))
+    a = boxes_a[:, None, :]
+    b = boxes_b[None, :, :]
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-6)
+
+
+class FaceTrack:
+    """Face rastreada entre frames com modelo de velocidade constante"""
+
+    VELOCITY_SMOOTHING = 0.5  # Peso da nova medida na velocidade estimada
+
+    def __init__(self, track_id: int, detection: Dict, timestamp: float):
+        self.track_id = track_id
+        self.bbox = np.asarray(detection['bbox'], dtype=np.float64)
+        self.velocity = np.zeros(4)  # Deslocamento de cada coordenada por segundo
+        self.detection = detection
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.hits = 1
+        self.embedding: Optional[np.ndarray] = None
+        self.identity: Optional[Dict] = None  # {'person_id', 'person_name', 'confidence'}
+        self.last_recognized: Optional[float] = None
+
+    def predict(self, timestamp: float) -> np.ndarray:
+        """Posição prevista da caixa no instante informado"""
+        return self.bbox + self.velocity * (timestamp - self.last_seen)
+
+    def update(self, detection: Dict, timestamp: float):
+        """Incorpora uma nova detecção associada ao track"""
+        bbox = np.asarray(detection['bbox'], dtype=np.float64)
+        dt = timestamp - self.last_seen
+        if dt > 0:
+            measured = (bbox - self.bbox) / dt
+            alpha = self.VELOCITY_SMOOTHING
+            self.velocity = (1 - alpha) * self.velocity + alpha * measured
+        self.bbox = bbox
+        self.detection = detection
+        self.last_seen = timestamp
+        self.hits += 1
+
+    def set_identity(self, embedding: Optional[np.ndarray], identity: Optional[Dict], timestamp: float):
+        """Registra o resultado de um reconhecimento (mantido até o próximo)"""
+        self.embedding = embedding
+        self.identity = identity
+        self.last_recognized = timestamp
+
+
+class FaceTracker:
+    """
+    Rastreador de faces no estilo SORT (IoU + modelo de movimento)
+
+    Cada detecção é associada ao track cuja caixa prevista tem maior IoU.
+    Detecções sem correspondência abrem novos tracks e tracks sem detecção
+    por mais de `max_age` segundos são encerrados. O reconhecimento só é
+    necessário para tracks novos ou a cada `reverify_seconds`; entre
+    reconhecimentos a identidade do track é mantida.
+    """
+
+    def __init__(self, iou_threshold: float = FACE_TRACK_IOU_THRESHOLD,
+                 max_age: float = FACE_TRACK_MAX_AGE,
+                 reverify_seconds: float = FACE_TRACK_REVERIFY_SECONDS):
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.reverify_seconds = reverify_seconds
+        self.tracks: List[FaceTrack] = []
+        self.tracks_created = 0
+        self._ids = itertools.count(1)
+
+    def update(self, detections: List[Dict], timestamp: float) -> List[FaceTrack]:
+        """
+        Associa as detecções de um frame aos tracks existentes
+
+        Returns:
+            Tracks presentes no frame, na mesma ordem das detecções
+        """
+        # Encerrar tracks sem detecção há mais de max_age
+        self.tracks = [t for t in self.tracks if timestamp - t.last_seen <= self.max_age]
+
+        predicted = np.array([t.predict(timestamp) for t in self.tracks]).reshape(-1, 4)
+        boxes = np.array([d['bbox'] for d in detections], dtype=np.float64).reshape(-1, 4)
+        ious = iou_matrix(predicted, boxes)
+
+        # Associação gulosa pelos maiores IoU acima do limiar
+        assigned: Dict[int, FaceTrack] = {}
+        used_tracks = set()
+        for flat in np.argsort(-ious, axis=None):
+            t_idx, d_idx = np.unravel_index(flat, ious.shape)
+            if ious[t_idx, d_idx] < self.iou_threshold:
+                break
+            if t_idx in used_tracks or d_idx in assigned:
+                continue
+            track = self.tracks[t_idx]
+            track.update(detections[d_idx], timestamp)
+            assigned[d_idx] = track
+            used_tracks.add(t_idx)
+
+        result = []
+        for d_idx, detection in enumerate(detections):
+            track = assigned.get(d_idx)
+            if track is None:
+                track = FaceTrack(next(self._ids), detection, timestamp)
+                self.tracks.append(track)
+                self.tracks_created += 1
+            result.append(track)
+        return result
+
+    def needs_recognition(self, track: FaceTrack, timestamp: float) -> bool:
+        """Indica se o track deve passar pelo reconhecimento neste frame"""
+        return track.last_recognized is None or timestamp - track.last_recognized >= self.reverify_seconds
+
+    def reset(self):
+        """Descarta todos os tracks"""
+        self.tracks = []
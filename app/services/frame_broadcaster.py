@@ -0,0 +1,136 @@
+import asyncio
+import threading
+from typing import Callable, Dict, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+from app.config import MJPEG_DEFAULT_QUALITY
+from app.services.frame_slot import FrameSlot
+
+
+class FrameBroadcaster:
+    """
+    Distribuição de frames JPEG de um stream para múltiplos viewers
+
+    Cada versão (sequência do FrameSlot) é renderizada e codificada no máximo
+    uma vez por qualidade e mantida em cache; viewers aguardam a próxima
+    versão em um asyncio.Event acordado pela thread de captura, sem polling.
+    Viewers entram e saem por `add_viewer`/`remove_viewer` (thread-safe).
+    """
+
+    def __init__(self, slot, render: Callable[[np.ndarray], np.ndarray]):
+        self.slot = slot
+        self.render = render
+        self.closed = False
+        self.viewers = 0
+        self._viewers_lock = threading.Lock()
+        self.encodes = 0
+        self._encode_lock = threading.Lock()
+        self._cache: Dict[int, Tuple[int, bytes]] = {}  # qualidade -> (versão, jpeg)
+        self._waiters_lock = threading.Lock()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        slot.add_listener(self._on_publish)
+
+    def add_viewer(self) -> int:
+        """Registra um viewer e retorna o total"""
+        with self._viewers_lock:
+            self.viewers += 1
+            self._viewers_changed(self.viewers - 1, self.viewers)
+            return self.viewers
+
+    def remove_viewer(self) -> int:
+        """Remove um viewer e retorna o total"""
+        with self._viewers_lock:
+            previous = self.viewers
+            self.viewers = max(0, previous - 1)
+            self._viewers_changed(previous, self.viewers)
+            return self.viewers
+
+    def _viewers_changed(self, previous: int, current: int):
+        """Chamado sob o lock de viewers a cada mudança (sem efeito no processo local)"""
+
+    @property
+    def version(self) -> int:
+        return self.slot.sequence
+
+    def get_jpeg(self, quality: int = MJPEG_DEFAULT_QUALITY) -> Optional[Tuple[int, bytes]]:
+        """Retorna (versão, jpeg) do frame mais recente, codificando apenas se ainda não houver cache"""
+        with self._encode_lock:
+            sequence, frame, _ = self.slot.latest()
+            if frame is None:
+                return None
+            cached = self._cache.get(quality)
+            if cached and cached[0] == sequence:
+                return cached
+
+            _, buffer = cv2.imencode('.jpg', self.render(frame), [cv2.IMWRITE_JPEG_QUALITY, quality])
+            self.encodes += 1
+            # Descartar versões antigas de outras qualidades
+            self._cache = {q: entry for q, entry in self._cache.items() if entry[0] == sequence}
+            self._cache[quality] = (sequence, buffer.tobytes())
+            return self._cache[quality]
+
+    async def wait_newer(self, version: int, timeout: float) -> bool:
+        """Aguarda uma versão mais nova que `version` (False se expirar ou o stream fechar)"""
+        if self.closed:
+            return False
+        if self.version > version:
+            return True
+
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._waiters_lock:
+            self._waiters.add(waiter)
+        try:
+            # Rechecar após registrar: um frame pode ter chegado no intervalo
+            if self.version <= version:
+                await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._waiters_lock:
+                self._waiters.discard(waiter)
+        return not self.closed and self.version > version
+
+    def _on_publish(self, sequence: int):
+        """Chamado pela thread de captura: acorda os viewers aguardando"""
+        with self._waiters_lock:
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Event loop já encerrado
+                pass
+
+    def close(self):
+        """Encerra a distribuição e libera os viewers"""
+        self.closed = True
+        self._on_publish(self.version)
+
+
+class RemoteFrameBroadcaster(FrameBroadcaster):
+    """
+    Viewers de um stream hospedado em processo worker
+
+    O worker envia JPEGs já renderizados e codificados; a API apenas os
+    repassa aos viewers. A qualidade é a MJPEG_DEFAULT_QUALITY do worker.
+    O aviso ao worker é um envio bloqueante pelo pipe: `add_viewer` e
+    `remove_viewer` devem ser chamados fora do event loop.
+    """
+
+    def __init__(self, on_viewers: Callable[[int], None]):
+        self._on_viewers = on_viewers
+        super().__init__(FrameSlot(), render=None)
+
+    def _viewers_changed(self, previous: int, current: int):
+        # Avisar o worker apenas ao ganhar o primeiro viewer ou perder o último; o envio
+        # sob o lock de viewers mantém a ordem dos avisos
+        if bool(previous) != bool(current):
+            self._on_viewers(current)
+
+    def get_jpeg(self, quality: int = MJPEG_DEFAULT_QUALITY) -> Optional[Tuple[int, bytes]]:
+        sequence, jpeg, _ = self.slot.latest()
+        if jpeg is None:
+            return None
+        return sequence, jpeg
@@ -0,0 +1,43 @@
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+class FrameSlot:
+    """
+    Slot com o frame mais recente de um stream (semântica latest-frame)
+    
+    A thread de captura sobrescreve o frame a cada leitura e incrementa o
+    número de sequência; consumidores são notificados a cada publicação e
+    sempre recebem o frame mais recente, nunca uma fila de frames atrasados.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.frame: Optional[np.ndarray] = None
+        self.sequence = 0
+        self.timestamp = 0.0
+        self._listeners: List[Callable[[int], None]] = []
+    
+    def add_listener(self, listener: Callable[[int], None]):
+        """Registra função chamada com a sequência de cada novo frame"""
+        self._listeners.append(listener)
+    
+    def publish(self, frame: np.ndarray):
+        """Substitui o frame atual e notifica os consumidores"""
+        with self._condition:
+            self.frame = frame
+            self.sequence += 1
+            self.timestamp = time.time()
+            sequence = self.sequence
+            self._condition.notify_all()
+        # Listeners fora do lock do slot (evita inversão de locks com o escalonador)
+        for listener in self._listeners:
+            listener(sequence)
+    
+    def latest(self) -> Tuple[int, Optional[np.ndarray], float]:
+        """Retorna (sequência, frame, timestamp) do frame mais recente"""
+        with self._condition:
+            return self.sequence, self.frame, self.timestamp
@@ -0,0 +1,108 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from app.config import (
+    RTSP_INFERENCE_WORKERS, RTSP_SCHEDULING_POLICY, RTSP_TARGET_ANALYSIS_FPS, RTSP_LATENCY_BUDGET_MS
+)
+from app.services.inference_workers import InferenceWorkers
+from app.services.scheduled_stream import ScheduledStream
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceScheduler:
+    """
+    Escalonador central de inferência para todos os streams RTSP
+
+    Um número fixo de workers consome o frame mais recente de cada stream,
+    respeitando a taxa de análise adaptativa de cada stream. A ordem entre streams
+    prontos é round-robin ou justa ponderada pela prioridade (o stream com
+    menor tempo virtual = tempo de inferência acumulado / prioridade é servido
+    primeiro), de modo que um stream pesado não monopoliza os workers. As
+    threads são do colaborador InferenceWorkers, que compartilha a condição.
+    """
+
+    def __init__(self, workers: int = RTSP_INFERENCE_WORKERS, policy: str = RTSP_SCHEDULING_POLICY):
+        self.workers = max(1, workers)
+        self.policy = policy
+        self._streams: Dict[str, ScheduledStream] = {}
+        self._order: List[str] = []  # Ordem de rotação (round-robin)
+        self._condition = threading.Condition()
+        self._workers = InferenceWorkers(self._streams, self._order, self._condition, self.workers, policy)
+
+    def start(self):
+        """Inicia os workers de inferência (idempotente)"""
+        if self._workers.start():
+            logger.info(f"Escalonador de inferência iniciado ({self.workers} workers, política {self.policy})")
+
+    def stop(self):
+        """Para os workers após concluírem a inferência em andamento"""
+        self._workers.stop()
+
+    def register(self, stream_id: str, slot, analyze: Callable,
+                 priority: int = 1, target_fps: float = RTSP_TARGET_ANALYSIS_FPS,
+                 latency_budget_ms: float = RTSP_LATENCY_BUDGET_MS,
+                 on_drop: Optional[Callable[[], None]] = None):
+        """
+        Registra um stream para análise
+
+        Args:
+            slot: FrameSlot do stream (frame mais recente)
+            analyze: Função analyze(sequence, frame, timestamp) executada nos workers
+            priority: Peso relativo na divisão dos workers (>= 1)
+            target_fps: Taxa máxima de análise do stream
+            latency_budget_ms: Latência máxima aceitável entre captura e resultado
+            on_drop: Chamada a cada frame pronto sobrescrito antes da análise
+        """
+        with self._condition:
+            stream = ScheduledStream(stream_id, slot, analyze, priority, target_fps, latency_budget_ms, on_drop)
+            # Novos streams entram no tempo virtual atual para não monopolizar os workers
+            stream.virtual_time = min((s.virtual_time for s in self._streams.values()), default=0.0)
+            self._streams[stream_id] = stream
+            self._order.append(stream_id)
+            slot.add_listener(lambda sequence: self._workers.on_publish(stream, sequence))
+            self._condition.notify_all()
+        self.start()
+
+    def unregister(self, stream_id: str):
+        """Remove um stream do escalonamento"""
+        with self._condition:
+            self._streams.pop(stream_id, None)
+            if stream_id in self._order:
+                self._order.remove(stream_id)
+
+    def update(self, stream_id: str, priority: Optional[int] = None, target_fps: Optional[float] = None,
+               latency_budget_ms: Optional[float] = None):
+        """Altera prioridade, taxa alvo e/ou orçamento de latência de um stream"""
+        with self._condition:
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                return False
+            if priority is not None:
+                stream.priority = max(1, int(priority))
+            stream.rate.reset(target_fps, latency_budget_ms)
+            self._condition.notify_all()
+            return True
+
+    def get_stream_stats(self, stream_id: str) -> Optional[Dict]:
+        """Estatísticas de escalonamento de um stream"""
+        stream = self._streams.get(stream_id)
+        if stream is None:
+            return None
+        return {
+            'priority': stream.priority,
+            'target_fps': stream.rate.target_fps,
+            'effective_fps': stream.rate.effective_fps,
+            'latency_budget_ms': stream.rate.latency_budget_ms,
+            'avg_latency_ms': stream.rate.avg_latency_ms,
+            'avg_inference_ms': stream.rate.avg_inference_ms,
+            'frames_analyzed': stream.frames_analyzed,
+            'frames_dropped': stream.frames_dropped,
+            'last_inference_ms': stream.last_inference_ms,
+            'queue_depth': stream.queue_depth
+        }
+
+
+# Instância global do escalonador de inferência
+inference_scheduler = InferenceScheduler()
@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app.services.scheduled_stream import ScheduledStream
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceWorkers:
+    """
+    Threads de inferência que servem os streams de um InferenceScheduler
+
+    Args:
+        streams: Streams registrados (stream_id -> ScheduledStream)
+        order: Ordem de rotação dos streams (round-robin)
+        condition: Condição que protege `streams` e `order`
+        workers: Número de threads
+        policy: "weighted" (justa ponderada) ou "round_robin"
+    """
+
+    def __init__(self, streams: Dict[str, ScheduledStream], order: List[str], condition: threading.Condition,
+                 workers: int, policy: str):
+        self.streams = streams
+        self.order = order
+        self.condition = condition
+        self.workers = workers
+        self.policy = policy
+        self._threads: List[threading.Thread] = []
+        self._running = False
+
+    def start(self) -> bool:
+        """Inicia as threads (idempotente); retorna se foram iniciadas agora"""
+        with self.condition:
+            if self._running:
+                return False
+            self._running = True
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._loop, name=f"rtsp-inference-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return True
+
+    def stop(self):
+        """Para as threads após concluírem a inferência em andamento"""
+        with self.condition:
+            self._running = False
+            self.condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def on_publish(self, stream: ScheduledStream, sequence: int):
+        """Chamado pela thread de captura a cada novo frame"""
+        with self.condition:
+            # O frame anterior estava pronto para análise e foi sobrescrito: sobrecarga
+            dropped = sequence - 1 > stream.last_sequence and time.monotonic() >= stream.next_due
+            if dropped:
+                stream.frames_dropped += 1
+            self.condition.notify()
+        if dropped and stream.on_drop is not None:
+            stream.on_drop()
+
+    def pick(self, now: float) -> Optional[ScheduledStream]:
+        """Escolhe o próximo stream pronto conforme a política"""
+        ready = [self.streams[sid] for sid in self.order if self.streams[sid].is_ready(now)]
+        if not ready:
+            return None
+        if self.policy == "round_robin":
+            stream = ready[0]
+            self.order.remove(stream.stream_id)
+            self.order.append(stream.stream_id)
+            return stream
+        return min(ready, key=lambda s: s.virtual_time)
+
+    def _wait_timeout(self, now: float) -> float:
+        """Tempo até o próximo stream com frame novo ficar pronto"""
+        pending = [
+            s.next_due - now for s in self.streams.values()
+            if not s.in_flight and s.slot.sequence > s.last_sequence
+        ]
+        return min(max(0.001, min(pending)), 0.5) if pending else 0.5
+
+    def fair_share_fps(self, stream: ScheduledStream) -> float:
+        """Fatia da capacidade dos workers (análises/s) proporcional à prioridade"""
+        if stream.rate.avg_inference_ms <= 0:
+            return 0.0
+        capacity = self.workers * 1000.0 / stream.rate.avg_inference_ms
+        total_priority = sum(s.priority for s in self.streams.values()) or 1
+        return capacity * stream.priority / total_priority
+
+    def _loop(self):
+        while True:
+            with self.condition:
+                stream = None
+                while self._running:
+                    now = time.monotonic()
+                    stream = self.pick(now)
+                    if stream is not None:
+                        break
+                    self.condition.wait(self._wait_timeout(now))
+                if stream is None:
+                    return
+
+                sequence, frame, timestamp = stream.slot.latest()
+                stream.in_flight = True
+                stream.last_sequence = sequence
+                stream.next_due = max(stream.next_due + stream.period, now)
+
+            start = time.perf_counter()
+            try:
+                stream.analyze(sequence, frame, timestamp)
+            except Exception as e:
+                logger.error(f"Erro na inferência do stream {stream.stream_id}: {e}")
+            elapsed = time.perf_counter() - start
+
+            with self.condition:
+                stream.in_flight = False
+                stream.frames_analyzed += 1
+                stream.last_inference_ms = elapsed * 1000
+                stream.virtual_time += elapsed / stream.priority
+
+                # Profundidade da fila: streams prontos aguardando um worker livre
+                backlog = sum(1 for s in self.streams.values() if s.is_ready(time.monotonic()))
+                stream.queue_depth = backlog
+                latency_ms = (time.time() - timestamp) * 1000
+                stream.rate.update(latency_ms, elapsed * 1000, backlog, self.fair_share_fps(stream), self.workers)
+                self.condition.notify()
@@ -0,0 +1,123 @@
+import logging
+import shutil
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+from app.config import VIDEO_RESULTS_DIR
+from app.services.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class JobResultStore:
+    """
+    Armazena resultados de jobs de vídeo em disco
+
+    Estrutura por job:
+    - summary.json: informações de processamento, estatísticas e resumo por pessoa
+    - frames.ndjson + frames.idx: uma linha por frame e offsets em bytes (acesso paginado)
+    - timeline.json: aparições completas por pessoa
+    """
+
+    def __init__(self, base_dir: Path = VIDEO_RESULTS_DIR):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def _job_dir(self, job_id: str) -> Path:
+        return self.base_dir / job_id
+
+    def build_summary(self, results: Dict) -> Dict:
+        """Gera o resumo compacto de um resultado completo"""
+        stats = results["statistics"]
+        persons = [
+            {
+                "person_id": person_id,
+                "name": data["name"],
+                "appearances": len(data["appearances"]),
+                "total_time": data["total_time"],
+                "average_confidence": data["average_confidence"]
+            }
+            for person_id, data in results["person_timeline"].items()
+        ]
+        return {
+            "processing_info": results["processing_info"],
+            "faces_detected": stats["total_faces_detected"],
+            "unique_persons": len(stats["unique_persons_found"]),
+            "frames_analyzed": len(results["detections_by_frame"]),
+            "sightings": len(results.get("sightings", [])),
+            "persons": persons,
+            "errors": results["errors"]
+        }
+
+    def save(self, job_id: str, results: Dict) -> Dict:
+        """Persiste o resultado de um job e retorna o resumo compacto"""
+        job_dir = self._job_dir(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+
+        offsets = array('Q')
+        with open(job_dir / "frames.ndjson", 'wb') as f:
+            for frame in results["detections_by_frame"]:
+                offsets.append(f.tell())
+                f.write(dumps(frame))
+                f.write(b"\n")
+        with open(job_dir / "frames.idx", 'wb') as f:
+            offsets.tofile(f)
+
+        with open(job_dir / "timeline.json", 'wb') as f:
+            f.write(dumps(results["person_timeline"]))
+
+        summary = self.build_summary(results)
+        with open(job_dir / "summary.json", 'wb') as f:
+            f.write(dumps(summary))
+
+        return summary
+
+    def load_summary(self, job_id: str) -> Optional[Dict]:
+        """Carrega o resumo de um job"""
+        path = self._job_dir(job_id) / "summary.json"
+        if not path.exists():
+            return None
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    def get_frames(self, job_id: str, offset: int = 0, limit: int = 50) -> Optional[Tuple[List[Dict], int]]:
+        """Retorna uma página de detecções por frame e o total de frames"""
+        job_dir = self._job_dir(job_id)
+        idx_path = job_dir / "frames.idx"
+        if not idx_path.exists():
+            return None
+
+        offsets = array('Q')
+        with open(idx_path, 'rb') as f:
+            offsets.frombytes(f.read())
+
+        total = len(offsets)
+        frames = []
+        if offset < total and limit > 0:
+            with open(job_dir / "frames.ndjson", 'rb') as f:
+                f.seek(offsets[offset])
+                for _ in range(min(limit, total - offset)):
+                    frames.append(orjson.loads(f.readline()))
+
+        return frames, total
+
+    def get_timeline(self, job_id: str) -> Optional[Dict]:
+        """Retorna as timelines completas por pessoa (chaves como string)"""
+        path = self._job_dir(job_id) / "timeline.json"
+        if not path.exists():
+            return None
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    def delete(self, job_id: str):
+        """Remove os resultados persistidos de um job"""
+        job_dir = self._job_dir(job_id)
+        if job_dir.exists():
+            shutil.rmtree(job_dir, ignore_errors=True)
+
+
+# Instância global do armazenamento de resultados
+job_result_store = JobResultStore()
@@ -0,0 +1,96 @@
+import time
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from app.config import (
+    MOTION_SENSITIVITY, MOTION_MAX_AREA_RATIO, MOTION_PIXEL_THRESHOLD,
+    MOTION_DOWNSCALE_WIDTH, MOTION_LEARNING_RATE, MOTION_IDLE_REFRESH_SECONDS
+)
+
+# Polígono em coordenadas de pixel do frame original: [[x, y], [x, y], ...]
+Polygon = Sequence[Sequence[int]]
+
+
+class MotionDetector:
+    """
+    Pré-filtro de movimento por stream
+
+    Compara uma versão reduzida e em tons de cinza do frame com um fundo
+    médio (atualizado com accumulateWeighted). Se a fração de pixels
+    alterados fica abaixo do limiar derivado da sensibilidade, o frame é
+    considerado estático e a detecção de faces pode ser pulada. Regiões da
+    máscara (ex: árvores, relógios, monitores) são ignoradas.
+    """
+
+    def __init__(self, sensitivity: float = MOTION_SENSITIVITY,
+                 mask_polygons: Optional[List[Polygon]] = None,
+                 width: int = MOTION_DOWNSCALE_WIDTH,
+                 learning_rate: float = MOTION_LEARNING_RATE):
+        self.sensitivity = min(1.0, max(0.0, sensitivity))
+        self.mask_polygons = mask_polygons or []
+        self.width = width
+        self.learning_rate = learning_rate
+        self.background: Optional[np.ndarray] = None
+        self.mask: Optional[np.ndarray] = None
+        self.last_motion_ratio = 0.0
+        self.last_forced = time.monotonic()
+
+    @property
+    def min_area_ratio(self) -> float:
+        """Fração mínima de pixels alterados para considerar movimento"""
+        return MOTION_MAX_AREA_RATIO * (1.0 - self.sensitivity)
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        height = max(1, int(frame.shape[0] * self.width / frame.shape[1]))
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def _build_mask(self, frame: np.ndarray, shape) -> Optional[np.ndarray]:
+        """Máscara (255 = considerar) na resolução reduzida"""
+        if not self.mask_polygons:
+            return None
+        scale = self.width / frame.shape[1]
+        mask = np.full(shape, 255, dtype=np.uint8)
+        for polygon in self.mask_polygons:
+            points = np.round(np.asarray(polygon, dtype=np.float64) * scale).astype(np.int32)
+            cv2.fillPoly(mask, [points], 0)
+        return mask
+
+    def has_motion(self, frame: np.ndarray) -> bool:
+        """Indica se houve movimento desde os frames anteriores"""
+        gray = self._prepare(frame)
+
+        if self.background is None or self.background.shape != gray.shape:
+            self.background = gray.astype(np.float32)
+            self.mask = self._build_mask(frame, gray.shape)
+            return True
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        _, changed = cv2.threshold(diff, MOTION_PIXEL_THRESHOLD, 255, cv2.THRESH_BINARY)
+        if self.mask is not None:
+            changed = cv2.bitwise_and(changed, self.mask)
+            total = max(1, cv2.countNonZero(self.mask))
+        else:
+            total = changed.size
+
+        cv2.accumulateWeighted(gray, self.background, self.learning_rate)
+
+        self.last_motion_ratio = cv2.countNonZero(changed) / total
+        return cv2.countNonZero(changed) > 0 and self.last_motion_ratio >= self.min_area_ratio
+
+    def should_detect(self, frame: np.ndarray, has_tracks: bool) -> bool:
+        """
+        Decide se o frame deve passar pela detecção de faces
+
+        Faces já rastreadas continuam sendo detectadas mesmo paradas; sem
+        movimento, uma detecção é forçada a cada MOTION_IDLE_REFRESH_SECONDS.
+        """
+        motion = self.has_motion(frame)
+        now = time.monotonic()
+        if motion or has_tracks or now - self.last_forced >= MOTION_IDLE_REFRESH_SECONDS:
+            self.last_forced = now
+            return True
+        return False
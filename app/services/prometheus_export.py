@@ -0,0 +1,48 @@
+from typing import Dict, List
+
+from app.services.stream_metrics import StreamMetrics
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(streams: List[Dict], prefix: str = "newfacial_stream") -> str:
+    """Formato de exposição texto do Prometheus a partir de get_stream_info() de cada stream"""
+    gauges = ("capture_fps", "analyzed_fps", "dropped_fps", "motion_skipped_fps", "queue_depth")
+    counters = {"frames_dropped": "frames_dropped_total", "reconnects": "reconnects_total"}
+    lines: List[str] = []
+
+    for name in gauges:
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        for stream in streams:
+            metrics = stream.get("metrics") or {}
+            lines.append(f'{prefix}_{name}{{stream_id="{_label(stream["stream_id"])}"}} {metrics.get(name, 0)}')
+
+    for key, name in counters.items():
+        lines.append(f"# TYPE {prefix}_{name} counter")
+        for stream in streams:
+            metrics = stream.get("metrics") or {}
+            lines.append(f'{prefix}_{name}{{stream_id="{_label(stream["stream_id"])}"}} {metrics.get(key, 0)}')
+
+    lines.append(f"# TYPE {prefix}_up gauge")
+    for stream in streams:
+        up = 1 if stream.get("state") == "live" else 0
+        lines.append(f'{prefix}_up{{stream_id="{_label(stream["stream_id"])}",state="{_label(stream.get("state"))}"}} {up}')
+
+    # Durações como summary: quantis da janela deslizante; _count e _sum acumulados desde o início
+    # do stream, como nos clientes oficiais do Prometheus (rate(_sum) / rate(_count) = média)
+    for name in StreamMetrics.TIMINGS:
+        metric = f"{prefix}_{name[:-3]}_milliseconds"
+        lines.append(f"# TYPE {metric} summary")
+        for stream in streams:
+            summary = (stream.get("metrics") or {}).get(name)
+            if not summary:
+                continue
+            stream_id = _label(stream["stream_id"])
+            lines.append(f'{metric}{{stream_id="{stream_id}",quantile="0.5"}} {summary["p50"]}')
+            lines.append(f'{metric}{{stream_id="{stream_id}",quantile="0.95"}} {summary["p95"]}')
+            lines.append(f'{metric}_sum{{stream_id="{stream_id}"}} {summary.get("total_sum", 0.0)}')
+            lines.append(f'{metric}_count{{stream_id="{stream_id}"}} {summary.get("total_count", 0)}')
+
+    return "\n".join(lines) + "\n"
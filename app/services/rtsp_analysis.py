@@ -0,0 +1,145 @@
+import time
+import logging
+import numpy as np
+from typing import List, Optional
+from app.services.face_recognition import face_service
+from app.services.event_bus import event_bus, DETECTION_EVENT
+from app.services.face_gallery import face_gallery
+from app.services.detection_zones import DetectionZones
+from app.config import FACE_RECOGNITION_MAX_PER_FRAME
+
+logger = logging.getLogger(__name__)
+
+class FrameAnalyzer:
+    """
+    Análise dos frames de um stream: zonas, detecção, rastreamento, reconhecimento e renderização
+
+    Args:
+        detector: Serviço de detecção e embeddings (padrão face_service)
+        gallery: Galeria de identificação das pessoas cadastradas (padrão face_gallery)
+    """
+    
+    def __init__(self, detector=None, gallery=None):
+        self.detector = detector or face_service
+        self.gallery = gallery or face_gallery
+    
+    def set_zones(self, stream_id: str, stream_info: dict, zones: Optional[List[dict]]):
+        """Substitui as zonas de interesse de um stream (lista vazia = frame inteiro)"""
+        stream_info['zones'] = DetectionZones(zones) if zones else None
+        logger.info(f"Stream {stream_id}: {len(zones or [])} zona(s) de interesse")
+    
+    def render(self, stream_info: dict, frame: np.ndarray) -> np.ndarray:
+        """Desenha as zonas e as últimas detecções sobre o frame a ser exibido"""
+        detections = stream_info['last_detections']
+        zones = stream_info['zones']
+        if detections:
+            frame = self.detector.draw_face_detection(frame, detections)
+        elif zones is not None:
+            frame = frame.copy()
+        if zones is not None:
+            frame = zones.draw(frame)
+        return frame
+    
+    def analyze(self, stream_id: str, stream_info: dict, sequence: int, frame: np.ndarray, timestamp: float):
+        """
+        Detecta e rastreia faces em um frame (executado pelos workers do escalonador)
+        
+        O embedding ArcFace só é extraído e comparado com a galeria para tracks
+        novos ou a cada FACE_TRACK_REVERIFY_SECONDS, no máximo
+        FACE_RECOGNITION_MAX_PER_FRAME por frame (tracks nunca reconhecidos
+        primeiro); nos demais frames o track mantém a identidade. Cada face
+        alimenta a aparição da pessoa ou do track (gravada ao encerrar).
+        """
+        if not stream_info['active']:
+            return
+        
+        tracker = stream_info['tracker']
+        motion = stream_info['motion']
+        zones = stream_info['zones']
+        sightings = stream_info['sightings']
+        metrics = stream_info['metrics']
+        metrics.record_timing('queue_wait_ms', (time.time() - timestamp) * 1000)
+        try:
+            # Cena estática e nenhuma face rastreada: pular a detecção
+            if motion is not None and not motion.should_detect(frame, bool(tracker.tracks)):
+                stream_info['frames_motion_skipped'] += 1
+                stream_info['last_detections'] = []
+                metrics.record_motion_skip()
+                return
+            
+            start = time.perf_counter()
+            if zones is not None:
+                regions = zones.detect(frame, self.detector.detect_face_regions)
+            else:
+                regions = self.detector.detect_face_regions(frame)
+            metrics.record_timing('detection_ms', (time.perf_counter() - start) * 1000)
+            tracks = tracker.update(regions, timestamp)
+            
+            if stream_info['recognize']:
+                self._recognize(stream_info, frame, regions, tracks, timestamp)
+            
+            detections = []
+            for region, track in zip(regions, tracks):
+                identity = track.identity
+                x1, y1, x2, y2 = (int(v) for v in region['bbox'])
+                sightings.observe(
+                    timestamp,
+                    identity['confidence'] if identity else region['confidence'],
+                    (x1, y1, x2 - x1, y2 - y1),
+                    person_id=identity['person_id'] if identity else None,
+                    track_id=track.track_id,
+                    frame_ref=f"{stream_id}#{sequence}"
+                )
+                detections.append({
+                    **region,
+                    'track_id': track.track_id,
+                    'new_track': track.hits == 1,
+                    'embedding': track.embedding,
+                    'person_id': identity['person_id'] if identity else None,
+                    'person_name': identity['person_name'] if identity else None,
+                    'similarity': identity['confidence'] if identity else None
+                })
+            stream_info['last_detections'] = detections
+            
+            if detections:
+                if stream_info['clips'] is not None:
+                    stream_info['clips'].trigger(timestamp, frame_ref=f"{stream_id}#{sequence}")
+                event_bus.publish(DETECTION_EVENT, stream_id, captured_at=timestamp, faces=[
+                    {
+                        'track_id': detection['track_id'],
+                        'new_track': detection['new_track'],
+                        'bbox': [int(v) for v in detection['bbox']],
+                        'confidence': float(detection['confidence']),
+                        'zone': detection.get('zone'),
+                        'person_id': detection['person_id'],
+                        'person_name': detection['person_name'],
+                        'similarity': detection['similarity']
+                    }
+                    for detection in detections
+                ])
+                
+        except Exception as e:
+            logger.error(f"Erro ao processar frame do stream {stream_id}: {e}")
+        finally:
+            metrics.record_analysis((time.time() - timestamp) * 1000)
+    
+    def _recognize(self, stream_info: dict, frame: np.ndarray, regions: List[dict], tracks: list, timestamp: float):
+        """Extrai embeddings e identifica na galeria os tracks que precisam de reconhecimento"""
+        tracker = stream_info['tracker']
+        metrics = stream_info['metrics']
+        pending = [
+            (region, track) for region, track in zip(regions, tracks)
+            if tracker.needs_recognition(track, timestamp)
+        ]
+        # Tracks nunca reconhecidos primeiro, depois os reconhecidos há mais tempo
+        pending.sort(key=lambda item: -1.0 if item[1].last_recognized is None else item[1].last_recognized)
+        stream_info['recognitions_deferred'] += max(0, len(pending) - FACE_RECOGNITION_MAX_PER_FRAME)
+        
+        for region, track in pending[:FACE_RECOGNITION_MAX_PER_FRAME]:
+            start = time.perf_counter()
+            embedding = self.detector.compute_embedding(frame, region)
+            # Falha na extração: manter a identidade atual até o próximo reconhecimento
+            identity = self.gallery.match(embedding) if embedding is not None else track.identity
+            track.set_identity(embedding, identity, timestamp)
+            stream_info['recognitions_run'] += 1
+            metrics.record_timing('recognition_ms', (time.perf_counter() - start) * 1000)
@@ -0,0 +1,150 @@
+import threading
+import time
+import logging
+from typing import Dict, Optional
+from app.services.event_bus import event_bus, STREAM_STATE_EVENT
+from app.services.rtsp_session import (
+    STREAM_CONNECTING, STREAM_LIVE, STREAM_STALLED, STREAM_RECONNECTING, STREAM_FAILED, open_capture, read_frames
+)
+from app.config import (
+    RTSP_STALL_TIMEOUT, RTSP_RECONNECT_BASE_DELAY, RTSP_RECONNECT_MAX_DELAY, RTSP_MAX_RECONNECT_ATTEMPTS
+)
+
+logger = logging.getLogger(__name__)
+
+class CaptureSessions:
+    """Sessões de captura (conexão, leitura, reconexão e watchdog) dos streams do dicionário recebido"""
+    
+    def __init__(self, streams: Dict[str, dict]):
+        self.streams = streams
+        self._state_lock = threading.Lock()
+        self._watchdog: Optional[threading.Thread] = None
+        self._watchdog_stop = threading.Event()
+    
+    def start(self, stream_id: str, stream_info: dict):
+        """Inicia a sessão de captura e o watchdog compartilhado"""
+        self._start_capture(stream_id, stream_info)
+        self._start_watchdog()
+    
+    def restart(self, stream_id: str) -> bool:
+        """Reinicia a sessão de um stream em estado "failed" (zera o backoff)"""
+        stream_info = self.streams.get(stream_id)
+        if stream_info is None:
+            return False
+        thread = stream_info['capture_thread']
+        if thread is not None and thread.is_alive():
+            return True
+        self._set_state(stream_id, stream_info, STREAM_CONNECTING)
+        self._start_capture(stream_id, stream_info)
+        return True
+    
+    def stop(self):
+        """Encerra o watchdog (as sessões param com o stop_event de cada stream)"""
+        self._watchdog_stop.set()
+    
+    def _start_capture(self, stream_id: str, stream_info: dict):
+        """Inicia a thread que conecta, lê frames e reconecta o stream"""
+        capture_thread = threading.Thread(
+            target=self._capture_stream,
+            args=(stream_id, stream_info),
+            name=f"rtsp-capture-{stream_id}",
+            daemon=True
+        )
+        stream_info['capture_thread'] = capture_thread
+        capture_thread.start()
+    
+    def _set_state(self, stream_id: str, stream_info: dict, state: str,
+                   expected: Optional[str] = None) -> bool:
+        """Altera o estado da sessão (somente a partir de `expected`, se informado)"""
+        with self._state_lock:
+            current = stream_info['state']
+            if current == state or (expected is not None and current != expected):
+                return False
+            stream_info['state'] = state
+            stream_info['state_since'] = time.time()
+        logger.info(f"Stream {stream_id}: {current} -> {state}")
+        event_bus.publish(STREAM_STATE_EVENT, stream_id, state=state, previous=current,
+                          last_error=stream_info['last_error'])
+        return True
+    
+    def _capture_stream(self, stream_id: str, stream_info: dict):
+        """
+        Sessão de captura: conecta, lê frames e reconecta com backoff exponencial
+        
+        Falhas seguidas (conexão recusada ou sessão sem nenhum frame) dobram o
+        atraso até RTSP_RECONNECT_MAX_DELAY; após RTSP_MAX_RECONNECT_ATTEMPTS o
+        stream vai para "failed" e a thread termina.
+        """
+        stop_event = stream_info['stop_event']
+        source = stream_info['rtsp_url']
+        failures = 0
+        
+        logger.info(f"Iniciando captura do stream {stream_id}")
+        
+        try:
+            while not stop_event.is_set():
+                if failures:
+                    if RTSP_MAX_RECONNECT_ATTEMPTS and failures >= RTSP_MAX_RECONNECT_ATTEMPTS:
+                        self._set_state(stream_id, stream_info, STREAM_FAILED)
+                        logger.error(f"Stream {stream_id} desistiu após {failures} falhas seguidas: "
+                                     f"{stream_info['last_error']}")
+                        break
+                    delay = min(RTSP_RECONNECT_MAX_DELAY, RTSP_RECONNECT_BASE_DELAY * 2 ** (failures - 1))
+                    logger.warning(f"Stream {stream_id}: nova tentativa em {delay:.1f}s "
+                                   f"(falha {failures}: {stream_info['last_error']})")
+                    if stop_event.wait(delay):
+                        break
+                
+                cap = open_capture(source)
+                if cap is None:
+                    failures += 1
+                    stream_info['last_error'] = "Não foi possível conectar"
+                    continue
+                
+                stream_info['capture'] = cap
+                try:
+                    frames = read_frames(stream_info, cap, lambda: self._set_state(stream_id, stream_info, STREAM_LIVE))
+                finally:
+                    stream_info['capture'] = None
+                    cap.release()
+                
+                if stop_event.is_set():
+                    break
+                
+                # Sessão que entregou frames: reconectar imediatamente e zerar o backoff
+                failures = 0 if frames else failures + 1
+                stream_info['last_error'] = "Conexão perdida" if frames else "Nenhum frame recebido"
+                stream_info['reconnects'] += 1
+                self._set_state(stream_id, stream_info, STREAM_RECONNECTING)
+                
+        except Exception as e:
+            stream_info['last_error'] = str(e)
+            self._set_state(stream_id, stream_info, STREAM_FAILED)
+            logger.error(f"Erro crítico na captura do stream {stream_id}: {e}")
+        finally:
+            logger.info(f"Captura do stream {stream_id} finalizada")
+    
+    def _start_watchdog(self):
+        """Inicia a thread que detecta streams sem frames (idempotente)"""
+        if self._watchdog and self._watchdog.is_alive():
+            return
+        self._watchdog_stop.clear()
+        self._watchdog = threading.Thread(target=self._watch_streams, name="rtsp-watchdog", daemon=True)
+        self._watchdog.start()
+    
+    def _watch_streams(self):
+        """
+        Marca como "stalled" os streams conectados sem frames há RTSP_STALL_TIMEOUT
+        segundos, encerra aparições sem detecções recentes e grava clips cujo
+        pós-roll terminou sem novos frames
+        """
+        while not self._watchdog_stop.wait(1.0):
+            now = time.time()
+            for stream_id, stream_info in list(self.streams.items()):
+                stream_info['sightings'].sweep(now)
+                if stream_info['clips'] is not None:
+                    stream_info['clips'].flush(now)
+                last_frame = stream_info['slot'].timestamp
+                if last_frame and now - last_frame > RTSP_STALL_TIMEOUT:
+                    if self._set_state(stream_id, stream_info, STREAM_STALLED, expected=STREAM_LIVE):
+                        logger.warning(f"Stream {stream_id} sem frames há {now - last_frame:.1f}s")
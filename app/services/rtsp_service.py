@@ -1,21 +1,44 @@
-import cv2
-import asyncio
-import threading
-import time
 import logging
-from typing import Dict, Optional, Callable
-from app.services.face_recognition import face_service
-from app.config import RTSP_TIMEOUT, MAX_CONCURRENT_STREAMS
+from typing import Dict, List, Optional
+from app.services.inference_scheduler import inference_scheduler
+from app.services.frame_broadcaster import FrameBroadcaster
+from app.services.rtsp_capture import CaptureSessions
+from app.services.rtsp_analysis import FrameAnalyzer
+from app.services.rtsp_stream_state import create_stream_state, close_stream_state, describe_stream
+from app.config import (
+    MAX_CONCURRENT_STREAMS, RTSP_TARGET_ANALYSIS_FPS, RTSP_LATENCY_BUDGET_MS, MJPEG_DEFAULT_QUALITY,
+    RTSP_WORKER_PROCESSES
+)
 
 logger = logging.getLogger(__name__)
 
 class RTSPStreamProcessor:
-    def __init__(self):
+    """Streams RTSP processados por threads no processo da API (captura em CaptureSessions, análise em FrameAnalyzer)"""
+    
+    def __init__(self, analyzer: Optional[FrameAnalyzer] = None):
         self.active_streams: Dict[str, dict] = {}
         self.max_streams = MAX_CONCURRENT_STREAMS
+        self.sessions = CaptureSessions(self.active_streams)
+        self.analyzer = analyzer or FrameAnalyzer()
+        
+    def add_stream(self, stream_id: str, rtsp_url: str, priority: int = 1, target_fps: Optional[float] = None,
+                   latency_budget_ms: Optional[float] = None, motion_gating: bool = True,
+                   motion_sensitivity: Optional[float] = None,
+                   motion_mask: Optional[List[List[List[int]]]] = None, record_clips: bool = False,
+                   clip_pre_seconds: Optional[float] = None, clip_post_seconds: Optional[float] = None,
+                   zones: Optional[List[dict]] = None, recognize: bool = True) -> bool:
+        """
+        Adiciona um novo stream RTSP para processamento
+        
+        Não bloqueia: a conexão é aberta pela thread de captura, que reconecta com backoff
+        exponencial (andamento no campo `state`). Detecções e estados vão para o event_bus.
         
-    def add_stream(self, stream_id: str, rtsp_url: str, callback: Optional[Callable] = None) -> bool:
-        """Adiciona um novo stream RTSP para processamento"""
+        Args:
+            priority: Peso do stream no escalonador de inferência compartilhado
+            target_fps: Taxa máxima de análise (padrão RTSP_TARGET_ANALYSIS_FPS)
+            latency_budget_ms: Latência máxima captura -> resultado (padrão RTSP_LATENCY_BUDGET_MS)
+            demais opções: ver create_stream_state
+        """
         if len(self.active_streams) >= self.max_streams:
             logger.warning(f"Máximo de {self.max_streams} streams simultâneos atingido")
             return False
@@ -25,36 +48,31 @@ class RTSPStreamProcessor:
             return False
         
         try:
-            cap = cv2.VideoCapture(rtsp_url)
-            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduzir buffer para menor latência
-            cap.set(cv2.CAP_PROP_FPS, 30)
-            
-            if not cap.isOpened():
-                logger.error(f"Não foi possível conectar ao stream RTSP: {rtsp_url}")
-                return False
+            stream_info = create_stream_state(
+                stream_id, rtsp_url, motion_gating=motion_gating, motion_sensitivity=motion_sensitivity,
+                motion_mask=motion_mask, record_clips=record_clips, clip_pre_seconds=clip_pre_seconds,
+                clip_post_seconds=clip_post_seconds, zones=zones, recognize=recognize
+            )
             
-            stream_info = {
-                'rtsp_url': rtsp_url,
-                'capture': cap,
-                'active': True,
-                'thread': None,
-                'callback': callback,
-                'last_frame': None,
-                'fps': 0,
-                'frame_count': 0,
-                'start_time': time.time()
-            }
+            # Frames para visualização: codificados uma vez por versão e compartilhados
+            stream_info['broadcaster'] = FrameBroadcaster(
+                stream_info['slot'],
+                lambda frame: self.analyzer.render(stream_info, frame)
+            )
             
-            # Iniciar thread de processamento
-            thread = threading.Thread(
-                target=self._process_stream,
-                args=(stream_id, stream_info),
-                daemon=True
+            # Inferência: workers compartilhados consomem o frame mais recente do slot
+            inference_scheduler.register(
+                stream_id,
+                stream_info['slot'],
+                lambda sequence, frame, timestamp: self.analyzer.analyze(stream_id, stream_info, sequence, frame, timestamp),
+                priority=priority,
+                target_fps=target_fps or RTSP_TARGET_ANALYSIS_FPS,
+                latency_budget_ms=latency_budget_ms or RTSP_LATENCY_BUDGET_MS,
+                on_drop=stream_info['metrics'].record_drop
             )
-            stream_info['thread'] = thread
-            thread.start()
             
             self.active_streams[stream_id] = stream_info
+            self.sessions.start(stream_id, stream_info)
             logger.info(f"Stream {stream_id} adicionado com sucesso")
             return True
             
@@ -68,17 +86,8 @@ class RTSPStreamProcessor:
             return False
         
         try:
-            stream_info = self.active_streams[stream_id]
-            stream_info['active'] = False
-            
-            # Aguardar thread terminar
-            if stream_info['thread']:
-                stream_info['thread'].join(timeout=5)
-            
-            # Fechar captura
-            if stream_info['capture']:
-                stream_info['capture'].release()
-            
+            inference_scheduler.unregister(stream_id)
+            close_stream_state(self.active_streams[stream_id])
             del self.active_streams[stream_id]
             logger.info(f"Stream {stream_id} removido com sucesso")
             return True
@@ -87,100 +96,56 @@ class RTSPStreamProcessor:
             logger.error(f"Erro ao remover stream {stream_id}: {e}")
             return False
     
+    def restart_stream(self, stream_id: str) -> bool:
+        """Reinicia a sessão de um stream em estado "failed" (zera o backoff)"""
+        return self.sessions.restart(stream_id)
+    
+    def set_zones(self, stream_id: str, zones: Optional[List[dict]]) -> bool:
+        """Substitui as zonas de interesse de um stream (lista vazia = frame inteiro)"""
+        stream_info = self.active_streams.get(stream_id)
+        if stream_info is None:
+            return False
+        self.analyzer.set_zones(stream_id, stream_info, zones)
+        return True
+    
     def get_stream_info(self, stream_id: str) -> Optional[dict]:
         """Retorna informações sobre um stream"""
         if stream_id in self.active_streams:
             info = self.active_streams[stream_id]
-            return {
-                'stream_id': stream_id,
-                'rtsp_url': info['rtsp_url'],
-                'active': info['active'],
-                'fps': info['fps'],
-                'frame_count': info['frame_count'],
-                'uptime': time.time() - info['start_time']
-            }
+            scheduling = inference_scheduler.get_stream_stats(stream_id) or {}
+            return describe_stream(stream_id, info, scheduling)
         return None
     
     def list_streams(self) -> list:
         """Lista todos os streams ativos"""
         return [self.get_stream_info(stream_id) for stream_id in self.active_streams.keys()]
     
-    def get_latest_frame(self, stream_id: str) -> Optional[bytes]:
-        """Retorna o último frame processado de um stream"""
-        if stream_id in self.active_streams:
-            frame = self.active_streams[stream_id]['last_frame']
-            if frame is not None:
-                _, buffer = cv2.imencode('.jpg', frame)
-                return buffer.tobytes()
-        return None
+    def get_broadcaster(self, stream_id: str) -> Optional[FrameBroadcaster]:
+        """Retorna o distribuidor de frames JPEG de um stream"""
+        stream_info = self.active_streams.get(stream_id)
+        return stream_info['broadcaster'] if stream_info is not None else None
     
-    def _process_stream(self, stream_id: str, stream_info: dict):
-        """Processa frames de um stream RTSP em loop"""
-        cap = stream_info['capture']
-        callback = stream_info['callback']
-        frame_count = 0
-        start_time = time.time()
-        
-        logger.info(f"Iniciando processamento do stream {stream_id}")
-        
-        try:
-            while stream_info['active']:
-                ret, frame = cap.read()
-                
-                if not ret:
-                    logger.warning(f"Falha ao ler frame do stream {stream_id}")
-                    time.sleep(0.1)
-                    continue
-                
-                frame_count += 1
-                current_time = time.time()
-                
-                # Calcular FPS
-                if frame_count % 30 == 0:  # Atualizar FPS a cada 30 frames
-                    elapsed = current_time - start_time
-                    stream_info['fps'] = frame_count / elapsed if elapsed > 0 else 0
-                
-                stream_info['frame_count'] = frame_count
-                
-                # Processar detecção de faces a cada 5 frames (otimização)
-                if frame_count % 5 == 0:
-                    try:
-                        detections = face_service.detect_faces(frame)
-                        
-                        if detections:
-                            # Desenhar detecções no frame
-                            frame_with_detections = face_service.draw_face_detection(frame, detections)
-                            stream_info['last_frame'] = frame_with_detections
-                            
-                            # Chamar callback se fornecido
-                            if callback:
-                                asyncio.run_coroutine_threadsafe(
-                                    callback(stream_id, frame, detections),
-                                    asyncio.get_event_loop()
-                                )
-                        else:
-                            stream_info['last_frame'] = frame
-                            
-                    except Exception as e:
-                        logger.error(f"Erro ao processar frame do stream {stream_id}: {e}")
-                        stream_info['last_frame'] = frame
-                else:
-                    stream_info['last_frame'] = frame
-                
-                # Pequena pausa para não sobrecarregar CPU
-                time.sleep(0.03)  # ~33 FPS máximo
-                
-        except Exception as e:
-            logger.error(f"Erro crítico no processamento do stream {stream_id}: {e}")
-        finally:
-            logger.info(f"Processamento do stream {stream_id} finalizado")
+    def get_latest_frame(self, stream_id: str, quality: int = MJPEG_DEFAULT_QUALITY) -> Optional[bytes]:
+        """Retorna o frame mais recente de um stream (JPEG em cache) com as últimas detecções desenhadas"""
+        broadcaster = self.get_broadcaster(stream_id)
+        if broadcaster is not None:
+            result = broadcaster.get_jpeg(quality)
+            if result is not None:
+                return result[1]
+        return None
     
     def shutdown(self):
         """Para todos os streams e limpa recursos"""
         logger.info("Parando todos os streams RTSP...")
-        stream_ids = list(self.active_streams.keys())
-        for stream_id in stream_ids:
+        for stream_id in list(self.active_streams.keys()):
             self.remove_stream(stream_id)
+        self.sessions.stop()
+        inference_scheduler.stop()
 
-# Instância global do processador RTSP
-rtsp_processor = RTSPStreamProcessor() 
\ No newline at end of file
+# Instância global do processador RTSP: threads no processo da API ou
+# supervisor de processos worker (RTSP_WORKER_PROCESSES > 0), com a mesma interface
+if RTSP_WORKER_PROCESSES > 0:
+    from app.services.stream_workers import StreamWorkerPool
+    rtsp_processor = StreamWorkerPool(RTSP_WORKER_PROCESSES)
+else:
+    rtsp_processor = RTSPStreamProcessor() 
\ No newline at end of file
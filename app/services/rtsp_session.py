@@ -0,0 +1,101 @@
+import os
+import time
+from typing import Callable, Optional
+
+import cv2
+
+from app.config import RTSP_TIMEOUT, RTSP_READ_TIMEOUT
+
+# Estados da sessão de captura de um stream
+STREAM_CONNECTING = "connecting"
+STREAM_LIVE = "live"
+STREAM_STALLED = "stalled"
+STREAM_RECONNECTING = "reconnecting"
+STREAM_FAILED = "failed"
+
+def is_file_source(source: str) -> bool:
+    """Fontes locais (arquivos de vídeo) servem como substitutas de câmeras RTSP"""
+    return os.path.isfile(source)
+
+def open_capture(source: str) -> Optional[cv2.VideoCapture]:
+    """
+    Abre a captura com timeouts de abertura e leitura (backend FFmpeg)
+    
+    Bloqueia por até RTSP_TIMEOUT segundos; retorna None se não conectar.
+    """
+    params = [
+        cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(RTSP_TIMEOUT * 1000),
+        cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(RTSP_READ_TIMEOUT * 1000)
+    ]
+    cap = cv2.VideoCapture(source, cv2.CAP_ANY, params)
+    if not cap.isOpened():
+        cap.release()
+        return None
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduzir buffer para menor latência
+    return cap
+
+def probe_capture(source: str) -> dict:
+    """Abre a fonte, lê um frame e retorna o resultado (chamado fora do event loop)"""
+    cap = open_capture(source)
+    if cap is None:
+        return {"success": False, "message": "Não foi possível conectar ao stream RTSP"}
+    try:
+        ret, frame = cap.read()
+    finally:
+        cap.release()
+    if not ret:
+        return {"success": False, "message": "Conectado ao stream mas não foi possível ler frames"}
+    height, width = frame.shape[:2]
+    return {"success": True, "message": "Conexão RTSP bem-sucedida", "resolution": f"{width}x{height}"}
+
+def read_frames(stream_info: dict, cap: cv2.VideoCapture, on_live: Callable[[], None]) -> int:
+    """
+    Lê frames até a primeira falha de leitura e publica apenas o mais recente no slot
+    
+    `on_live` é chamado a cada frame enquanto o estado não for "live". Arquivos locais são lidos no ritmo do seu FPS, como uma câmera; o fim do
+    arquivo equivale a uma queda de conexão.
+    
+    Returns:
+        Número de frames lidos nesta sessão
+    """
+    stop_event = stream_info['stop_event']
+    slot = stream_info['slot']
+    metrics = stream_info['metrics']
+    clips = stream_info['clips']
+    interval = 0.0
+    if is_file_source(stream_info['rtsp_url']):
+        file_fps = cap.get(cv2.CAP_PROP_FPS)
+        interval = 1.0 / file_fps if file_fps > 0 else 1.0 / 30
+    
+    frames = 0
+    next_frame_at = time.monotonic()
+    
+    while not stop_event.is_set():
+        # grab (espera por dados/demux) e retrieve (decodificação) medidos separadamente
+        start = time.perf_counter()
+        if not cap.grab():
+            break
+        grabbed = time.perf_counter()
+        ret, frame = cap.retrieve()
+        if not ret:
+            break
+        metrics.record_capture((grabbed - start) * 1000, (time.perf_counter() - grabbed) * 1000)
+        
+        if stream_info['state'] != STREAM_LIVE:
+            on_live()
+        
+        frames += 1
+        slot.publish(frame)
+        stream_info['frame_count'] += 1
+        if clips is not None:
+            clips.push(frame, slot.timestamp)
+        
+        if interval:
+            next_frame_at += interval
+            remaining = next_frame_at - time.monotonic()
+            if remaining > 0:
+                stop_event.wait(remaining)
+            else:
+                next_frame_at = time.monotonic()
+    
+    return frames
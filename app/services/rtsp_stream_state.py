@@ -0,0 +1,131 @@
+import threading
+import time
+from typing import Dict, List, Optional
+from app.services.face_tracker import FaceTracker
+from app.services.motion_detector import MotionDetector
+from app.services.event_bus import event_bus, SIGHTING_EVENT, CLIP_EVENT
+from app.services.sighting_aggregator import SightingAggregator
+from app.services.stream_metrics import StreamMetrics
+from app.services.clip_recorder import ClipRecorder
+from app.services.detection_zones import DetectionZones
+from app.services.frame_slot import FrameSlot
+from app.services.rtsp_session import STREAM_CONNECTING
+from app.config import (
+    RTSP_TARGET_ANALYSIS_FPS, RTSP_LATENCY_BUDGET_MS, MOTION_GATING_ENABLED, MOTION_SENSITIVITY,
+    CLIP_PRE_SECONDS, CLIP_POST_SECONDS
+)
+
+def create_stream_state(stream_id: str, rtsp_url: str, motion_gating: bool = True,
+                        motion_sensitivity: Optional[float] = None,
+                        motion_mask: Optional[List[List[List[int]]]] = None, record_clips: bool = False,
+                        clip_pre_seconds: Optional[float] = None, clip_post_seconds: Optional[float] = None,
+                        zones: Optional[List[dict]] = None, recognize: bool = True) -> dict:
+    """
+    Estado de um stream do RTSPStreamProcessor
+    
+    Args:
+        motion_gating: Pular a detecção de faces quando a cena estiver estática
+        motion_sensitivity: Sensibilidade do pré-filtro de movimento (0 a 1)
+        motion_mask: Polígonos (pixels do frame) ignorados pelo pré-filtro
+        record_clips: Manter buffer de JPEGs e gravar clips em torno das detecções
+        clip_pre_seconds: Segundos antes da detecção incluídos no clip (padrão CLIP_PRE_SECONDS)
+        clip_post_seconds: Segundos após a última detecção (padrão CLIP_POST_SECONDS)
+        zones: Regiões de interesse ({name, polygon} ou {name, rect: [x, y, w, h]});
+            a detecção roda apenas nelas e faces fora das zonas são descartadas
+        recognize: Identificar as faces na galeria de pessoas cadastradas
+    """
+    return {
+        'rtsp_url': rtsp_url,
+        'capture': None,
+        'active': True,
+        'stop_event': threading.Event(),
+        'state': STREAM_CONNECTING,
+        'state_since': time.time(),
+        'reconnects': 0,
+        'last_error': None,
+        'capture_thread': None,
+        'slot': FrameSlot(),
+        'tracker': FaceTracker(),
+        'motion': MotionDetector(
+            sensitivity=MOTION_SENSITIVITY if motion_sensitivity is None else motion_sensitivity,
+            mask_polygons=motion_mask
+        ) if MOTION_GATING_ENABLED and motion_gating else None,
+        'frames_motion_skipped': 0,
+        'zones': DetectionZones(zones) if zones else None,
+        'recognize': recognize,
+        'recognitions_run': 0,
+        'recognitions_deferred': 0,
+        # Aparições gravadas em DetectionLog ao encerrar (sem a URL, que pode conter credenciais)
+        'sightings': SightingAggregator(
+            'rtsp', stream_id=stream_id,
+            on_close=lambda sighting: event_bus.publish(SIGHTING_EVENT, stream_id, **sighting.to_dict())
+        ),
+        'clips': ClipRecorder(
+            stream_id,
+            pre_seconds=CLIP_PRE_SECONDS if clip_pre_seconds is None else clip_pre_seconds,
+            post_seconds=CLIP_POST_SECONDS if clip_post_seconds is None else clip_post_seconds,
+            on_saved=lambda clip: event_bus.publish(
+                CLIP_EVENT, stream_id, **{k: v for k, v in clip.items() if k != 'stream_id'})
+        ) if record_clips else None,
+        'broadcaster': None,
+        'last_detections': [],
+        'metrics': StreamMetrics(),
+        'frame_count': 0,
+        'start_time': time.time()
+    }
+
+def close_stream_state(stream_info: dict):
+    """Para a captura e a distribuição de um stream e grava aparições e clips pendentes"""
+    stream_info['active'] = False
+    stream_info['stop_event'].set()
+    stream_info['broadcaster'].close()
+    
+    # A thread de captura fecha a captura ao sair (no máximo após RTSP_READ_TIMEOUT)
+    if stream_info['capture_thread']:
+        stream_info['capture_thread'].join(timeout=5)
+    stream_info['sightings'].close_all()
+    if stream_info['clips'] is not None:
+        stream_info['clips'].close()
+
+def describe_stream(stream_id: str, info: dict, scheduling: Dict) -> dict:
+    """Informações públicas de um stream (get_stream_info) a partir do estado e do escalonador"""
+    return {
+        'stream_id': stream_id,
+        'rtsp_url': info['rtsp_url'],
+        'active': info['active'],
+        'state': info['state'],
+        'reconnects': info['reconnects'],
+        'last_error': info['last_error'],
+        'last_frame_age': time.time() - info['slot'].timestamp if info['slot'].timestamp else None,
+        'fps': info['metrics'].capture_fps,
+        'frame_count': info['frame_count'],
+        'frames_analyzed': scheduling.get('frames_analyzed', 0),
+        'frames_dropped': scheduling.get('frames_dropped', 0),
+        'priority': scheduling.get('priority', 1),
+        'target_fps': scheduling.get('target_fps', RTSP_TARGET_ANALYSIS_FPS),
+        'effective_fps': scheduling.get('effective_fps', 0.0),
+        'latency_budget_ms': scheduling.get('latency_budget_ms', RTSP_LATENCY_BUDGET_MS),
+        'avg_latency_ms': scheduling.get('avg_latency_ms', 0.0),
+        'motion_gating': info['motion'] is not None,
+        'zones': info['zones'].zones if info['zones'] is not None else [],
+        'zone_area_ratio': info['zones'].area_ratio if info['zones'] is not None else 1.0,
+        'detections_outside_zones': info['zones'].discarded if info['zones'] is not None else 0,
+        'recognize': info['recognize'],
+        'recognitions_run': info['recognitions_run'],
+        'recognitions_deferred': info['recognitions_deferred'],
+        'frames_motion_skipped': info['frames_motion_skipped'],
+        'open_sightings': info['sightings'].open_sightings,
+        'sightings_closed': info['sightings'].sightings_closed,
+        'viewers': info['broadcaster'].viewers,
+        'record_clips': info['clips'] is not None,
+        'clip_recording': info['clips'] is not None and info['clips'].recording,
+        'clip_buffer_bytes': info['clips'].buffer_bytes if info['clips'] is not None else 0,
+        'clips_saved': info['clips'].clips_saved if info['clips'] is not None else 0,
+        'metrics': {
+            **info['metrics'].snapshot(),
+            'frames_dropped': scheduling.get('frames_dropped', 0),
+            'queue_depth': scheduling.get('queue_depth', 0),
+            'reconnects': info['reconnects']
+        },
+        'uptime': time.time() - info['start_time']
+    }
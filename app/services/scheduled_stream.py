@@ -0,0 +1,84 @@
+import time
+from typing import Callable, Optional
+
+from app.config import RTSP_LATENCY_BUDGET_MS, RTSP_MIN_ANALYSIS_FPS
+
+
+class AdaptiveRate:
+    """
+    Taxa de análise adaptativa de um stream
+
+    Parte da taxa alvo e ajusta a taxa efetiva a cada inferência: reduz
+    multiplicativamente quando a latência captura -> resultado estoura o
+    orçamento ou há streams aguardando workers, e aumenta aos poucos quando
+    há folga. A taxa também é limitada à fatia justa da capacidade medida.
+    """
+
+    DECREASE_FACTOR = 0.75
+    INCREASE_STEP = 0.1  # Fração da taxa atual somada por ajuste
+    ADJUST_INTERVAL = 0.5  # Segundos mínimos entre reduções
+    SMOOTHING = 0.2  # Peso da nova amostra nas médias móveis
+
+    def __init__(self, target_fps: float, latency_budget_ms: float = RTSP_LATENCY_BUDGET_MS):
+        self.target_fps = target_fps
+        self.latency_budget_ms = latency_budget_ms
+        self.effective_fps = target_fps
+        self.avg_latency_ms = 0.0
+        self.avg_inference_ms = 0.0
+        self._last_decrease = 0.0
+
+    def update(self, latency_ms: float, inference_ms: float, backlog: int, fair_share_fps: float, workers: int = 1):
+        """Registra uma inferência concluída e recalcula a taxa efetiva"""
+        alpha = self.SMOOTHING
+        self.avg_latency_ms = latency_ms if not self.avg_latency_ms else (1 - alpha) * self.avg_latency_ms + alpha * latency_ms
+        self.avg_inference_ms = inference_ms if not self.avg_inference_ms else (1 - alpha) * self.avg_inference_ms + alpha * inference_ms
+
+        now = time.monotonic()
+        overloaded = self.avg_latency_ms > self.latency_budget_ms or backlog >= workers
+        if overloaded:
+            if now - self._last_decrease >= self.ADJUST_INTERVAL:
+                self.effective_fps *= self.DECREASE_FACTOR
+                self._last_decrease = now
+        elif self.avg_latency_ms < self.latency_budget_ms / 2:
+            self.effective_fps += max(0.1, self.effective_fps * self.INCREASE_STEP)
+
+        if fair_share_fps > 0:
+            # Sem folga não adianta pedir mais que a fatia da capacidade dos workers
+            self.effective_fps = min(self.effective_fps, fair_share_fps * 1.2)
+        self.effective_fps = max(RTSP_MIN_ANALYSIS_FPS, min(self.target_fps, self.effective_fps))
+
+    def reset(self, target_fps: Optional[float] = None, latency_budget_ms: Optional[float] = None):
+        """Aplica nova taxa alvo e/ou orçamento de latência"""
+        if target_fps is not None:
+            self.target_fps = target_fps
+            self.effective_fps = target_fps
+        if latency_budget_ms is not None:
+            self.latency_budget_ms = latency_budget_ms
+
+
+class ScheduledStream:
+    """Estado de escalonamento de um stream registrado"""
+
+    def __init__(self, stream_id: str, slot, analyze: Callable, priority: int, target_fps: float,
+                 latency_budget_ms: float = RTSP_LATENCY_BUDGET_MS, on_drop: Optional[Callable[[], None]] = None):
+        self.stream_id = stream_id
+        self.slot = slot
+        self.analyze = analyze
+        self.on_drop = on_drop
+        self.priority = max(1, int(priority))
+        self.rate = AdaptiveRate(target_fps, latency_budget_ms)
+        self.last_sequence = 0
+        self.next_due = 0.0
+        self.virtual_time = 0.0
+        self.in_flight = False
+        self.frames_analyzed = 0
+        self.frames_dropped = 0
+        self.last_inference_ms = 0.0
+        self.queue_depth = 0
+
+    @property
+    def period(self) -> float:
+        return 1.0 / self.rate.effective_fps if self.rate.effective_fps > 0 else 0.0
+
+    def is_ready(self, now: float) -> bool:
+        return not self.in_flight and self.slot.sequence > self.last_sequence and now >= self.next_due
@@ -0,0 +1,48 @@
+from typing import Dict, Hashable, Optional, Sequence
+
+
+class Sighting:
+    """Aparição contínua de uma identidade (pessoa reconhecida ou track desconhecido)"""
+
+    def __init__(self, key: Hashable, timestamp: float, person_id: Optional[int], track_id: Optional[int]):
+        self.key = key
+        self.person_id = person_id
+        self.track_id = track_id
+        self.started_at = timestamp
+        self.last_seen = timestamp
+        self.detections = 0
+        self.best_confidence = 0.0
+        self.best_bbox: Optional[Sequence[int]] = None
+        self.best_frame_ref: Optional[str] = None
+
+    def add(self, timestamp: float, confidence: float, bbox: Optional[Sequence[int]], frame_ref: Optional[str]):
+        self.detections += 1
+        self.started_at = min(self.started_at, timestamp)
+        self.last_seen = max(self.last_seen, timestamp)
+        if confidence >= self.best_confidence:
+            self.best_confidence = float(confidence)
+            self.best_bbox = bbox
+            self.best_frame_ref = frame_ref
+
+    def merge(self, other: "Sighting"):
+        """Incorpora outra aparição (ex: track desconhecido que acabou de ser identificado)"""
+        self.detections += other.detections
+        self.started_at = min(self.started_at, other.started_at)
+        self.last_seen = max(self.last_seen, other.last_seen)
+        if other.best_confidence > self.best_confidence:
+            self.best_confidence = other.best_confidence
+            self.best_bbox = other.best_bbox
+            self.best_frame_ref = other.best_frame_ref
+
+    def to_dict(self) -> Dict:
+        return {
+            "person_id": self.person_id,
+            "track_id": self.track_id,
+            "started_at": self.started_at,
+            "ended_at": self.last_seen,
+            "duration": self.last_seen - self.started_at,
+            "detections": self.detections,
+            "best_confidence": self.best_confidence,
+            "best_bbox": [int(v) for v in self.best_bbox] if self.best_bbox is not None else None,
+            "best_frame_ref": self.best_frame_ref
+        }
@@ -0,0 +1,119 @@
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, Optional, Sequence
+
+from app.config import SIGHTING_GAP_SECONDS, SIGHTING_MAX_DURATION
+from app.services.detection_log_writer import detection_log_writer
+from app.services.sighting import Sighting
+
+logger = logging.getLogger(__name__)
+
+
+class SightingAggregator:
+    """
+    Agrupa detecções consecutivas da mesma identidade em aparições
+
+    Detecções de uma pessoa reconhecida (ou do mesmo track desconhecido)
+    separadas por menos de `gap_seconds` formam uma única aparição, com início,
+    fim, melhor confiança, bounding box e referência do melhor frame. A aparição
+    é gravada em DetectionLog (uma linha) apenas ao ser encerrada; aparições
+    mais longas que `max_duration` são encerradas e reabertas.
+
+    Os timestamps são segundos; `time_origin` é somado ao gravar (vídeos usam
+    segundos desde o início do arquivo).
+    """
+
+    def __init__(self, source: str, stream_id: Optional[str] = None, source_info: Optional[str] = None,
+                 gap_seconds: float = SIGHTING_GAP_SECONDS, max_duration: float = SIGHTING_MAX_DURATION,
+                 time_origin: float = 0.0, persist: bool = True,
+                 on_close: Optional[Callable[[Sighting], None]] = None):
+        self.source = source
+        self.stream_id = stream_id
+        self.source_info = source_info
+        self.gap_seconds = gap_seconds
+        self.max_duration = max_duration
+        self.time_origin = time_origin
+        self.persist = persist
+        self.on_close = on_close
+        self._lock = threading.Lock()
+        self._open: Dict[Hashable, Sighting] = {}
+        self.observations = 0
+        self.sightings_closed = 0
+
+    def observe(self, timestamp: float, confidence: float, bbox: Optional[Sequence[int]] = None,
+                person_id: Optional[int] = None, track_id: Optional[int] = None,
+                frame_ref: Optional[str] = None):
+        """Registra uma detecção; bbox em (x, y, w, h)"""
+        expired = []
+        with self._lock:
+            self.observations += 1
+            key = ("person", person_id) if person_id is not None else ("track", track_id)
+            sighting = self._open.get(key)
+            if sighting is not None and (timestamp - sighting.last_seen > self.gap_seconds
+                                         or timestamp - sighting.started_at > self.max_duration):
+                expired.append(self._open.pop(key))
+                sighting = None
+            if sighting is None:
+                sighting = self._open[key] = Sighting(key, timestamp, person_id, track_id)
+
+            # Track identificado: a aparição anônima passa a ser da pessoa
+            if person_id is not None and track_id is not None:
+                anonymous = self._open.pop(("track", track_id), None)
+                if anonymous is not None:
+                    sighting.merge(anonymous)
+                sighting.track_id = track_id
+
+            sighting.add(timestamp, confidence, bbox, frame_ref)
+
+        for sighting in expired:
+            self._close(sighting)
+
+    def sweep(self, now: float) -> int:
+        """Encerra aparições sem detecções há mais de gap_seconds (ou longas demais)"""
+        with self._lock:
+            expired = [
+                key for key, sighting in self._open.items()
+                if now - sighting.last_seen > self.gap_seconds or now - sighting.started_at > self.max_duration
+            ]
+            sightings = [self._open.pop(key) for key in expired]
+        for sighting in sightings:
+            self._close(sighting)
+        return len(sightings)
+
+    def close_all(self) -> int:
+        """Encerra todas as aparições abertas (fim do vídeo ou do stream)"""
+        with self._lock:
+            sightings = list(self._open.values())
+            self._open.clear()
+        for sighting in sightings:
+            self._close(sighting)
+        return len(sightings)
+
+    @property
+    def open_sightings(self) -> int:
+        return len(self._open)
+
+    def _to_datetime(self, timestamp: float) -> datetime:
+        return datetime.fromtimestamp(self.time_origin + timestamp, tz=timezone.utc)
+
+    def _close(self, sighting: Sighting):
+        self.sightings_closed += 1
+        if self.persist:
+            detection_log_writer.submit(
+                person_id=sighting.person_id,
+                confidence=sighting.best_confidence,
+                source=self.source,
+                source_info=self.source_info,
+                bbox=sighting.best_bbox,
+                detected_at=self._to_datetime(sighting.started_at),
+                stream_id=self.stream_id,
+                ended_at=self._to_datetime(sighting.last_seen),
+                detection_count=sighting.detections,
+                frame_ref=sighting.best_frame_ref
+            )
+        if self.on_close is not None:
+            try:
+                self.on_close(sighting)
+            except Exception as e:
+                logger.error(f"Erro ao notificar aparição encerrada: {e}")
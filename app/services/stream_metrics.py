@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+from app.config import METRICS_WINDOW_SECONDS, METRICS_LATENCY_BUCKETS_MS
+
+
+class RollingWindow:
+    """Amostras (timestamp, valor) dos últimos `window` segundos, com contagem e soma acumuladas"""
+
+    def __init__(self, window: float = METRICS_WINDOW_SECONDS):
+        self.window = window
+        self._samples: deque = deque()
+        self._lock = threading.Lock()
+        self._total_count = 0
+        self._total_sum = 0.0
+
+    def add(self, value: float = 0.0, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._samples.append((now, value))
+            self._total_count += 1
+            self._total_sum += value
+            self._expire(now)
+
+    def totals(self) -> Dict:
+        """Contagem e soma desde a criação (não expiram com a janela)"""
+        with self._lock:
+            return {"total_count": self._total_count, "total_sum": self._total_sum}
+
+    def _expire(self, now: float):
+        cutoff = now - self.window
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+    def values(self, now: Optional[float] = None) -> List[float]:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._expire(now)
+            return [value for _, value in self._samples]
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Amostras por segundo na janela (janela menor enquanto ainda não encheu)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._expire(now)
+            if not self._samples:
+                return 0.0
+            span = min(max(now - self._samples[0][0], 1.0), self.window)
+            return len(self._samples) / span
+
+
+def summarize(values: Sequence[float], buckets: Sequence[float] = METRICS_LATENCY_BUCKETS_MS) -> Dict:
+    """Percentis e histograma (contagem por faixa, em ms) de uma lista de durações"""
+    if not values:
+        return {"count": 0, "p50": 0.0, "p95": 0.0, "max": 0.0, "histogram": {}}
+    ordered = sorted(values)
+    histogram = {f"<={bound:g}": 0 for bound in buckets}
+    histogram[f">{buckets[-1]:g}"] = 0
+    for value in ordered:
+        for bound in buckets:
+            if value <= bound:
+                histogram[f"<={bound:g}"] += 1
+                break
+        else:
+            histogram[f">{buckets[-1]:g}"] += 1
+    return {
+        "count": len(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+        "histogram": histogram
+    }
+
+
+class StreamMetrics:
+    """
+    Telemetria de um stream em janela deslizante
+
+    Separa as etapas para localizar gargalos: espera por dados da rede
+    (`read_wait_ms`, grab), decodificação (`decode_ms`, retrieve), espera por
+    um worker (`queue_wait_ms`), detecção, reconhecimento e latência total
+    captura -> resultado (`end_to_end_ms`).
+    """
+
+    TIMINGS = ("read_wait_ms", "decode_ms", "queue_wait_ms", "detection_ms", "recognition_ms", "end_to_end_ms")
+
+    def __init__(self, window: float = METRICS_WINDOW_SECONDS):
+        self.window = window
+        self.captured = RollingWindow(window)
+        self.analyzed = RollingWindow(window)
+        self.dropped = RollingWindow(window)
+        self.motion_skipped = RollingWindow(window)
+        self.timings = {name: RollingWindow(window) for name in self.TIMINGS}
+
+    def record_capture(self, read_wait_ms: float, decode_ms: float):
+        now = time.monotonic()
+        self.captured.add(now=now)
+        self.timings["read_wait_ms"].add(read_wait_ms, now)
+        self.timings["decode_ms"].add(decode_ms, now)
+
+    def record_timing(self, name: str, value_ms: float):
+        self.timings[name].add(value_ms)
+
+    def record_analysis(self, end_to_end_ms: float):
+        now = time.monotonic()
+        self.analyzed.add(now=now)
+        self.timings["end_to_end_ms"].add(end_to_end_ms, now)
+
+    def record_drop(self):
+        self.dropped.add()
+
+    def record_motion_skip(self):
+        self.motion_skipped.add()
+
+    @property
+    def capture_fps(self) -> float:
+        return self.captured.rate()
+
+    def snapshot(self) -> Dict:
+        """Taxas (por segundo) e resumo das durações na janela, com totais acumulados"""
+        now = time.monotonic()
+        return {
+            "window_seconds": self.window,
+            "capture_fps": self.captured.rate(now),
+            "analyzed_fps": self.analyzed.rate(now),
+            "dropped_fps": self.dropped.rate(now),
+            "motion_skipped_fps": self.motion_skipped.rate(now),
+            **{name: {**summarize(window.values(now)), **window.totals()} for name, window in self.timings.items()}
+        }
@@ -0,0 +1,107 @@
+import logging
+import signal
+import threading
+import time
+from typing import Dict
+
+from app.config import MJPEG_DEFAULT_QUALITY, MJPEG_MAX_FPS, RTSP_WORKER_INFO_INTERVAL, RTSP_WORKER_IDLE_FRAME_INTERVAL
+from app.services.detection_log_writer import detection_log_writer
+from app.services.event_bus import event_bus
+from app.services.rtsp_service import RTSPStreamProcessor
+
+
+class StreamHost:
+    """
+    Lado do processo worker: hospeda um RTSPStreamProcessor próprio
+
+    Captura, decodificação, inferência e codificação JPEG acontecem aqui. O
+    loop principal atende comandos da API e envia periodicamente estatísticas
+    e frames JPEG (na taxa MJPEG com viewers, em ritmo reduzido sem); eventos
+    do event_bus local são repassados à API assim que publicados.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.processor = RTSPStreamProcessor()
+        self._send_lock = threading.Lock()
+        self._viewers: Dict[str, int] = {}
+        self._sent_versions: Dict[str, int] = {}
+        self._sent_at: Dict[str, float] = {}
+        event_bus.add_listener(lambda event: self.send(("event", event)))
+
+    def send(self, message: tuple):
+        with self._send_lock:
+            self.conn.send(message)
+
+    def run(self):
+        tick = 1.0 / MJPEG_MAX_FPS
+        next_info = 0.0
+        try:
+            while True:
+                if self.conn.poll(tick):
+                    message = self.conn.recv()
+                    if message[0] == "stop":
+                        break
+                    self._handle(message)
+
+                now = time.monotonic()
+                self._push_frames(now)
+                if now >= next_info:
+                    self.send(("info", {sid: self.processor.get_stream_info(sid)
+                                        for sid in list(self.processor.active_streams)}))
+                    next_info = now + RTSP_WORKER_INFO_INTERVAL
+        except (EOFError, OSError):
+            # Processo da API encerrado
+            pass
+        finally:
+            # A thread do writer é daemon: sem stop() as aparições encerradas
+            # no shutdown se perderiam com o fim do processo
+            self.processor.shutdown()
+            detection_log_writer.stop()
+
+    def _handle(self, message: tuple):
+        command, request_id, stream_id = message[:3]
+        result = None
+        if command == "add":
+            rtsp_url, options = message[3:]
+            result = self.processor.add_stream(stream_id, rtsp_url, **options)
+        elif command == "remove":
+            result = self.processor.remove_stream(stream_id)
+            self._viewers.pop(stream_id, None)
+            self._sent_versions.pop(stream_id, None)
+            self._sent_at.pop(stream_id, None)
+        elif command == "restart":
+            result = self.processor.restart_stream(stream_id)
+        elif command == "zones":
+            result = self.processor.set_zones(stream_id, message[3])
+        elif command == "viewers":
+            self._viewers[stream_id] = message[3]
+        if request_id is not None:
+            self.send(("result", request_id, result, self.processor.get_stream_info(stream_id)))
+
+    def _push_frames(self, now: float):
+        """Envia o JPEG mais recente de cada stream respeitando o ritmo por demanda"""
+        for stream_id in list(self.processor.active_streams):
+            broadcaster = self.processor.get_broadcaster(stream_id)
+            if broadcaster is None or broadcaster.version == self._sent_versions.get(stream_id):
+                continue
+            interval = 1.0 / MJPEG_MAX_FPS if self._viewers.get(stream_id) else RTSP_WORKER_IDLE_FRAME_INTERVAL
+            if now - self._sent_at.get(stream_id, 0.0) < interval:
+                continue
+            result = broadcaster.get_jpeg(MJPEG_DEFAULT_QUALITY)
+            if result is None:
+                continue
+            self._sent_versions[stream_id], jpeg = result
+            self._sent_at[stream_id] = now
+            self.send(("frame", stream_id, jpeg))
+
+
+def worker_main(conn, worker_index: int):
+    """Ponto de entrada do processo worker"""
+    # O encerramento é conduzido pela API (Ctrl+C chega a todo o grupo de processos)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f'%(asctime)s - worker-{worker_index} - %(name)s - %(levelname)s - %(message)s'
+    )
+    StreamHost(conn).run()
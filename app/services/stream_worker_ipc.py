@@ -0,0 +1,86 @@
+import itertools
+import logging
+import threading
+from typing import Dict, Optional
+
+from app.services.event_bus import event_bus
+
+logger = logging.getLogger(__name__)
+
+# Tempo máximo aguardando a resposta de um comando enviado ao worker
+_CALL_TIMEOUT = 10.0
+
+
+class WorkerHandle:
+    """
+    Lado da API de um processo worker: pipe, comandos e respostas pendentes
+
+    Mensagens da API: comandos (com request_id quando aguardam resposta),
+    "viewers" e "stop". Mensagens do worker: "result", "info" (estatísticas),
+    "frame" (JPEG) e "event" (repassado ao event_bus da API).
+    """
+
+    def __init__(self, index: int, process, conn):
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.streams: set = set()
+        self.alive = True
+        self.reader: Optional[threading.Thread] = None
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, list] = {}  # request_id -> [Event, resposta]
+        self._request_ids = itertools.count(1)
+
+    def send(self, message: tuple):
+        with self._send_lock:
+            self.conn.send(message)
+
+    def call(self, command: str, stream_id: str, *args):
+        """Envia um comando e aguarda (resultado, info do stream)"""
+        request_id = next(self._request_ids)
+        pending = [threading.Event(), (None, None)]
+        self._pending[request_id] = pending
+        try:
+            self.send((command, request_id, stream_id, *args))
+            if not pending[0].wait(_CALL_TIMEOUT):
+                logger.error(f"Worker {self.index} não respondeu a '{command}' ({stream_id})")
+            return pending[1]
+        except (OSError, EOFError) as e:
+            logger.error(f"Falha ao enviar '{command}' ao worker {self.index}: {e}")
+            return None, None
+        finally:
+            self._pending.pop(request_id, None)
+
+    def read(self, streams: Dict[str, dict]):
+        """
+        Recebe respostas, estatísticas e frames até o pipe fechar
+
+        Frames e estatísticas atualizam os streams do dicionário recebido. Ao
+        sair, o worker é marcado como morto e os comandos pendentes são liberados.
+        """
+        try:
+            while True:
+                message = self.conn.recv()
+                kind = message[0]
+                if kind == "frame":
+                    stream = streams.get(message[1])
+                    if stream is not None:
+                        stream['broadcaster'].slot.publish(message[2])
+                elif kind == "event":
+                    event_bus.dispatch(message[1])
+                elif kind == "info":
+                    for stream_id, info in message[1].items():
+                        stream = streams.get(stream_id)
+                        if stream is not None and info is not None:
+                            stream['info'] = info
+                elif kind == "result":
+                    pending = self._pending.get(message[1])
+                    if pending is not None:
+                        pending[1] = (message[2], message[3])
+                        pending[0].set()
+        except (EOFError, OSError):
+            pass
+
+        self.alive = False
+        for pending in list(self._pending.values()):
+            pending[0].set()
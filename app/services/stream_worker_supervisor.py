@@ -0,0 +1,149 @@
+import logging
+import multiprocessing
+import threading
+import time
+from typing import Dict, List
+
+from app.config import MAX_CONCURRENT_STREAMS, RTSP_RECONNECT_BASE_DELAY
+from app.services.event_bus import event_bus, STREAM_STATE_EVENT
+from app.services.rtsp_session import STREAM_RECONNECTING
+from app.services.stream_worker_host import worker_main
+from app.services.stream_worker_ipc import WorkerHandle
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerSupervisor:
+    """
+    Processos worker de um StreamWorkerPool: criação, atribuição e rebalanceamento
+    de streams, recuperação de workers que morrem e encerramento
+
+    Args:
+        processes: Número de processos worker
+        streams: Streams do pool (stream_id -> estado), atualizados pelos workers
+    """
+
+    def __init__(self, processes: int, streams: Dict[str, dict]):
+        self.processes = processes
+        self.streams = streams
+        self.workers: List[WorkerHandle] = []
+        self._lock = threading.RLock()
+        self._closing = False
+        # spawn evita herdar estado do ONNX Runtime e threads da API
+        self._ctx = multiprocessing.get_context("spawn")
+
+    def ensure_started(self):
+        with self._lock:
+            if not self.workers:
+                self._closing = False
+                self.workers = [self._spawn(index) for index in range(self.processes)]
+
+    def _spawn(self, index: int) -> WorkerHandle:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=worker_main, args=(child_conn, index), name=f"rtsp-worker-{index}", daemon=True
+        )
+        process.start()
+        child_conn.close()
+
+        worker = WorkerHandle(index, process, parent_conn)
+        worker.reader = threading.Thread(
+            target=self._read, args=(worker,), name=f"rtsp-worker-{index}-reader", daemon=True
+        )
+        worker.reader.start()
+        logger.info(f"Worker de streams {index} iniciado (pid {process.pid})")
+        return worker
+
+    def _read(self, worker: WorkerHandle):
+        worker.read(self.streams)
+        if not self._closing:
+            self._recover(worker)
+
+    def _recover(self, worker: WorkerHandle):
+        """Recria um worker que morreu e redistribui os seus streams"""
+        worker.process.join(timeout=1)
+        logger.error(f"Worker de streams {worker.index} encerrado inesperadamente "
+                     f"(código {worker.process.exitcode}); {len(worker.streams)} streams afetados")
+        time.sleep(RTSP_RECONNECT_BASE_DELAY)
+        with self._lock:
+            if self._closing:
+                return
+            self.workers[worker.index] = self._spawn(worker.index)
+            orphans = list(worker.streams)
+
+        for stream_id in orphans:
+            stream = self.streams.get(stream_id)
+            if stream is None:
+                continue
+            event_bus.publish(STREAM_STATE_EVENT, stream_id, state=STREAM_RECONNECTING,
+                              previous=stream['info'].get('state'), last_error="Worker encerrado")
+            stream['info']['state'] = STREAM_RECONNECTING
+            if not self.assign(stream_id, stream):
+                logger.error(f"Stream {stream_id} sem worker disponível após falha do worker {worker.index}")
+
+    def assign(self, stream_id: str, stream: dict) -> bool:
+        """Hospeda o stream no worker vivo com menos streams"""
+        with self._lock:
+            candidates = [w for w in self.workers if w.alive and len(w.streams) < MAX_CONCURRENT_STREAMS]
+            if not candidates:
+                return False
+            worker = min(candidates, key=lambda w: len(w.streams))
+            worker.streams.add(stream_id)
+            stream['worker'] = worker
+
+        success, info = worker.call("add", stream_id, stream['rtsp_url'], stream['options'])
+        if not success:
+            worker.streams.discard(stream_id)
+            return False
+        if stream['broadcaster'].viewers:
+            worker.send(("viewers", None, stream_id, stream['broadcaster'].viewers))
+        if info:
+            stream['info'] = info
+        logger.info(f"Stream {stream_id} atribuído ao worker {worker.index}")
+        return True
+
+    def rebalance(self) -> int:
+        """
+        Move streams do worker mais carregado ao menos carregado até a diferença ser
+        de no máximo 1 (a captura reconecta no novo worker); retorna quantos moveu
+        """
+        moved = 0
+        for _ in range(len(self.streams)):
+            with self._lock:
+                alive = [w for w in self.workers if w.alive]
+                if self._closing or len(alive) < 2:
+                    break
+                source = max(alive, key=lambda w: len(w.streams))
+                if len(source.streams) - min(len(w.streams) for w in alive) <= 1:
+                    break
+                stream_id = next(iter(source.streams))
+                source.streams.discard(stream_id)
+                stream = self.streams.get(stream_id)
+            source.call("remove", stream_id)
+            if stream is None:
+                continue
+            if not self.assign(stream_id, stream):
+                logger.error(f"Stream {stream_id} sem worker disponível ao rebalancear")
+                break
+            moved += 1
+        return moved
+
+    def detach(self) -> List[WorkerHandle]:
+        """Marca o encerramento e retira os workers do supervisor (recuperação desativada)"""
+        with self._lock:
+            self._closing = True
+            workers, self.workers = self.workers, []
+        return workers
+
+    def stop_workers(self, workers: List[WorkerHandle]):
+        """Pede o encerramento dos workers e aguarda (terminate após 10s)"""
+        for worker in workers:
+            try:
+                worker.send(("stop",))
+            except (OSError, EOFError):
+                pass
+        for worker in workers:
+            worker.process.join(timeout=10)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
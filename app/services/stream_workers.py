@@ -0,0 +1,141 @@
+import logging
+from typing import Dict, Optional
+
+from app.config import MAX_CONCURRENT_STREAMS, MJPEG_DEFAULT_QUALITY
+from app.services.frame_broadcaster import FrameBroadcaster, RemoteFrameBroadcaster
+from app.services.rtsp_session import STREAM_CONNECTING
+from app.services.stream_worker_supervisor import WorkerSupervisor
+
+logger = logging.getLogger(__name__)
+
+
+class StreamWorkerPool:
+    """
+    Supervisor de streams hospedados em processos worker
+
+    Cada processo hospeda um subconjunto dos streams com captura e inferência
+    próprias, sem disputar o GIL da API. O supervisor atribui streams ao worker
+    menos carregado (WorkerSupervisor), rebalanceia após remoções, recebe estatísticas e frames JPEG pelo
+    pipe de cada worker e, se um worker morrer, o recria e redistribui seus streams.
+
+    Expõe a mesma interface de RTSPStreamProcessor.
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self.max_streams = processes * MAX_CONCURRENT_STREAMS
+        self.active_streams: Dict[str, dict] = {}
+        self.supervisor = WorkerSupervisor(processes, self.active_streams)
+
+    def add_stream(self, stream_id: str, rtsp_url: str, **options) -> bool:
+        """Adiciona um stream ao worker menos carregado (mesmos parâmetros de RTSPStreamProcessor.add_stream)"""
+        if len(self.active_streams) >= self.max_streams:
+            logger.warning(f"Máximo de {self.max_streams} streams simultâneos atingido")
+            return False
+
+        if stream_id in self.active_streams:
+            logger.warning(f"Stream {stream_id} já existe")
+            return False
+
+        self.supervisor.ensure_started()
+        stream = {
+            'rtsp_url': rtsp_url,
+            'options': options,
+            'worker': None,
+            'info': {'stream_id': stream_id, 'rtsp_url': rtsp_url, 'active': True,
+                     'state': STREAM_CONNECTING, 'fps': 0.0, 'frame_count': 0, 'uptime': 0.0},
+            'broadcaster': RemoteFrameBroadcaster(lambda viewers: self._notify_viewers(stream_id, viewers))
+        }
+        self.active_streams[stream_id] = stream
+        if not self.supervisor.assign(stream_id, stream):
+            del self.active_streams[stream_id]
+            return False
+        return True
+
+    def remove_stream(self, stream_id: str) -> bool:
+        """Remove um stream do worker que o hospeda"""
+        stream = self.active_streams.pop(stream_id, None)
+        if stream is None:
+            return False
+
+        stream['broadcaster'].close()
+        worker = stream['worker']
+        if worker is not None:
+            worker.streams.discard(stream_id)
+            if worker.alive:
+                worker.call("remove", stream_id)
+        # Remoções podem desequilibrar os workers (atribuições só ocorrem na adição)
+        self.supervisor.rebalance()
+        logger.info(f"Stream {stream_id} removido com sucesso")
+        return True
+
+    def restart_stream(self, stream_id: str) -> bool:
+        """Reinicia a sessão de um stream em estado "failed" no seu worker"""
+        stream = self.active_streams.get(stream_id)
+        if stream is None or stream['worker'] is None:
+            return False
+        success, info = stream['worker'].call("restart", stream_id)
+        if info:
+            stream['info'] = info
+        return bool(success)
+
+    def set_zones(self, stream_id: str, zones) -> bool:
+        """Substitui as zonas de interesse de um stream (mantidas se o worker for recriado)"""
+        stream = self.active_streams.get(stream_id)
+        if stream is None or stream['worker'] is None:
+            return False
+        stream['options']['zones'] = zones
+        success, info = stream['worker'].call("zones", stream_id, zones)
+        if info:
+            stream['info'] = info
+        return bool(success)
+
+    def get_stream_info(self, stream_id: str) -> Optional[dict]:
+        """Última estatística enviada pelo worker (atraso de até RTSP_WORKER_INFO_INTERVAL)"""
+        stream = self.active_streams.get(stream_id)
+        if stream is None:
+            return None
+        worker = stream['worker']
+        return {
+            **stream['info'],
+            'viewers': stream['broadcaster'].viewers,
+            'worker': worker.index if worker is not None else None
+        }
+
+    def list_streams(self) -> list:
+        """Lista todos os streams ativos"""
+        return [self.get_stream_info(stream_id) for stream_id in list(self.active_streams)]
+
+    def get_broadcaster(self, stream_id: str) -> Optional[FrameBroadcaster]:
+        """Retorna o distribuidor de frames JPEG recebidos do worker"""
+        stream = self.active_streams.get(stream_id)
+        return stream['broadcaster'] if stream is not None else None
+
+    def get_latest_frame(self, stream_id: str, quality: int = MJPEG_DEFAULT_QUALITY) -> Optional[bytes]:
+        """Retorna o JPEG mais recente recebido do worker"""
+        broadcaster = self.get_broadcaster(stream_id)
+        if broadcaster is not None:
+            result = broadcaster.get_jpeg(quality)
+            if result is not None:
+                return result[1]
+        return None
+
+    def shutdown(self):
+        """Para todos os streams e encerra os processos worker"""
+        workers = self.supervisor.detach()
+        if not workers:
+            return
+        logger.info("Parando workers de streams RTSP...")
+        for stream in self.active_streams.values():
+            stream['broadcaster'].close()
+        self.active_streams.clear()
+        self.supervisor.stop_workers(workers)
+
+    def _notify_viewers(self, stream_id: str, viewers: int):
+        stream = self.active_streams.get(stream_id)
+        if stream is None or stream.get('worker') is None:
+            return
+        try:
+            stream['worker'].send(("viewers", None, stream_id, viewers))
+        except (OSError, EOFError):
+            pass
@@ -6,9 +6,12 @@ import tempfile
 import asyncio
 from typing import List, Dict, Optional, Tuple, Generator
 from pathlib import Path
-import json
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from app.config import SIGHTING_GAP_SECONDS
+from app.services.serialization import dumps
+from app.services.video_results import VideoResultBuilder
 
 logger = logging.getLogger(__name__)
 
@@ -125,7 +128,8 @@ class VideoProcessingService:
         return frames
     
     def process_video_faces(self, video_path: str, known_persons: List[Dict] = None,
-                           frame_interval: float = 1.0, max_frames: int = 300) -> Dict:
+                           frame_interval: float = 1.0, max_frames: int = 300,
+                           log_source_info: Optional[str] = None) -> Dict:
         """
         Processa vídeo completo para reconhecimento facial
         
@@ -134,114 +138,64 @@ class VideoProcessingService:
             known_persons: Lista de pessoas conhecidas com embeddings
             frame_interval: Intervalo entre frames analisados
             max_frames: Máximo de frames a processar
+            log_source_info: Se informado, grava as aparições em DetectionLog com esta origem
         
         Returns:
             Resultado completo do processamento
         """
         from app.services.face_recognition import face_service
+        from app.services.face_tracker import FaceTracker
+        from app.services.sighting_aggregator import SightingAggregator
         
         start_time = time.time()
         
         # Extrair frames
         frames = self.extract_frames(video_path, frame_interval, max_frames)
         
-        results = {
-            "video_path": video_path,
-            "processing_info": {
-                "total_frames_analyzed": len(frames),
-                "frame_interval_seconds": frame_interval,
-                "processing_start": datetime.now().isoformat(),
-                "processing_duration": 0
-            },
-            "detections_by_frame": [],
-            "person_timeline": {},
-            "statistics": {
-                "total_faces_detected": 0,
-                "unique_persons_found": set(),
-                "faces_per_second": {},
-                "recognition_accuracy": 0.0
-            },
-            "errors": []
-        }
+        # Tracks sobrevivem a até dois frames analisados sem detecção (tempo do vídeo)
+        tracker = FaceTracker(max_age=frame_interval * 2.5)
+        builder = VideoResultBuilder(video_path, len(frames), frame_interval, start_time)
+        
+        # Detecções consecutivas da mesma pessoa/track viram uma aparição (instantes = início + tempo do vídeo)
+        sightings = SightingAggregator(
+            'video_processing', source_info=log_source_info,
+            gap_seconds=max(SIGHTING_GAP_SECONDS, frame_interval * 2.5),
+            time_origin=start_time, persist=log_source_info is not None,
+            on_close=lambda sighting: builder.add_sighting(sighting.to_dict())
+        )
         
         logger.info(f"Iniciando processamento de {len(frames)} frames")
         
         # Processar cada frame
         for i, (frame, timestamp) in enumerate(frames):
             try:
-                # Detectar faces no frame
-                face_detections = face_service.detect_faces(frame)
-                
-                frame_result = {
-                    "frame_index": i,
-                    "timestamp": timestamp,
-                    "timestamp_formatted": str(timedelta(seconds=int(timestamp))),
-                    "faces": [],
-                    "recognized_persons": []
-                }
+                # Detectar faces no frame (sem embeddings) e associar aos tracks
+                face_detections = face_service.detect_face_regions(frame)
+                tracks = tracker.update(face_detections, timestamp)
+                frame_result = builder.new_frame(i, timestamp)
                 
                 # Processar cada face detectada
-                for face in face_detections:
-                    face_info = {
-                        "bbox": face["bbox"],
-                        "confidence": face["confidence"],
-                        "recognition": None
-                    }
+                for face, track in zip(face_detections, tracks):
+                    # Reconhecer apenas tracks novos ou periodicamente; a identidade é herdada
+                    recognized_now = bool(known_persons) and tracker.needs_recognition(track, timestamp)
+                    if recognized_now:
+                        embedding = face_service.compute_embedding(frame, face)
+                        match = self._match_person(face_service, embedding, known_persons) if embedding is not None else None
+                        track.set_identity(embedding, match, timestamp)
+                        builder.statistics["recognitions_run"] += 1
                     
-                    # Tentar reconhecimento se há pessoas conhecidas
-                    if known_persons:
-                        best_match = None
-                        best_confidence = 0.0
-                        
-                        for person in known_persons:
-                            try:
-                                similarity = face_service.compare_embeddings(
-                                    face["embedding"], 
-                                    person["embedding"]
-                                )
-                                
-                                if similarity > best_confidence and similarity >= 0.4:
-                                    best_confidence = similarity
-                                    best_match = person
-                            except Exception as e:
-                                logger.warning(f"Erro ao comparar embedding: {e}")
-                        
-                        if best_match:
-                            face_info["recognition"] = {
-                                "person_id": best_match["id"],
-                                "person_name": best_match["name"],
-                                "confidence": best_confidence
-                            }
-                            
-                            # Adicionar à timeline da pessoa
-                            person_id = best_match["id"]
-                            if person_id not in results["person_timeline"]:
-                                results["person_timeline"][person_id] = {
-                                    "name": best_match["name"],
-                                    "appearances": [],
-                                    "total_time": 0,
-                                    "average_confidence": 0.0
-                                }
-                            
-                            results["person_timeline"][person_id]["appearances"].append({
-                                "timestamp": timestamp,
-                                "confidence": best_confidence,
-                                "frame_index": i
-                            })
-                            
-                            results["statistics"]["unique_persons_found"].add(person_id)
-                            frame_result["recognized_persons"].append(best_match["name"])
-                    
-                    frame_result["faces"].append(face_info)
-                    results["statistics"]["total_faces_detected"] += 1
-                
-                # Contar faces por segundo
-                second = int(timestamp)
-                if second not in results["statistics"]["faces_per_second"]:
-                    results["statistics"]["faces_per_second"][second] = 0
-                results["statistics"]["faces_per_second"][second] += len(face_detections)
+                    x1, y1, x2, y2 = (int(v) for v in face["bbox"])
+                    sightings.observe(
+                        timestamp,
+                        track.identity["confidence"] if track.identity else face["confidence"],
+                        (x1, y1, x2 - x1, y2 - y1),
+                        person_id=track.identity["person_id"] if track.identity else None,
+                        track_id=track.track_id,
+                        frame_ref=f"frame:{i}@{timestamp:.1f}s"
+                    )
+                    builder.add_face(frame_result, face, track.track_id, track.identity, not recognized_now)
                 
-                results["detections_by_frame"].append(frame_result)
+                builder.end_frame(frame_result, len(face_detections))
                 
                 # Log de progresso
                 if i % 10 == 0:
@@ -251,33 +205,40 @@ class VideoProcessingService:
             except Exception as e:
                 error_msg = f"Erro no frame {i} (timestamp: {timestamp:.1f}s): {str(e)}"
                 logger.error(error_msg)
-                results["errors"].append(error_msg)
-        
-        # Calcular estatísticas finais
-        processing_time = time.time() - start_time
-        results["processing_info"]["processing_duration"] = processing_time
-        results["processing_info"]["processing_end"] = datetime.now().isoformat()
-        
-        # Converter set para lista para JSON
-        results["statistics"]["unique_persons_found"] = list(results["statistics"]["unique_persons_found"])
-        
-        # Calcular estatísticas de timeline
-        for person_id, timeline in results["person_timeline"].items():
-            appearances = timeline["appearances"]
-            if appearances:
-                # Tempo total de aparição (aproximado)
-                timeline["total_time"] = len(appearances) * frame_interval
-                
-                # Confiança média
-                total_confidence = sum(app["confidence"] for app in appearances)
-                timeline["average_confidence"] = total_confidence / len(appearances)
+                builder.add_error(error_msg)
+        
+        sightings.close_all()
+        results = builder.finish(tracker.tracks_created)
         
-        logger.info(f"Processamento concluído em {processing_time:.1f}s")
+        logger.info(f"Processamento concluído em {results['processing_info']['processing_duration']:.1f}s")
         logger.info(f"Total de faces: {results['statistics']['total_faces_detected']}")
         logger.info(f"Pessoas únicas: {len(results['statistics']['unique_persons_found'])}")
         
         return results
     
+    def _match_person(self, face_service, embedding: np.ndarray, known_persons: List[Dict]) -> Optional[Dict]:
+        """Compara um embedding com as pessoas conhecidas e retorna o melhor match"""
+        best_match = None
+        best_confidence = 0.0
+        
+        for person in known_persons:
+            try:
+                similarity = face_service.compare_embeddings(embedding, person["embedding"])
+                
+                if similarity > best_confidence and similarity >= 0.4:
+                    best_confidence = similarity
+                    best_match = person
+            except Exception as e:
+                logger.warning(f"Erro ao comparar embedding: {e}")
+        
+        if best_match is None:
+            return None
+        return {
+            "person_id": best_match["id"],
+            "person_name": best_match["name"],
+            "confidence": best_confidence
+        }
+    
     def create_annotated_video(self, video_path: str, detection_results: Dict, 
                               output_path: str = None) -> str:
         """
@@ -401,8 +362,8 @@ class VideoProcessingService:
         
         if format == "json":
             report_path = self.temp_dir / f"report_{timestamp}.json"
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(detection_results, f, indent=2, ensure_ascii=False, default=str)
+            with open(report_path, 'wb') as f:
+                f.write(dumps(detection_results, indent=True))
         
         elif format == "html":
             report_path = self.temp_dir / f"report_{timestamp}.html"
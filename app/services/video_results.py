@@ -0,0 +1,115 @@
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+
+class VideoResultBuilder:
+    """
+    Monta o resultado completo de VideoProcessingService.process_video_faces
+
+    Estrutura: processing_info, detections_by_frame, person_timeline,
+    sightings, statistics e errors. O resumo compacto e a persistência ficam
+    em JobResultStore (job_results.py).
+    """
+
+    def __init__(self, video_path: str, frames_analyzed: int, frame_interval: float,
+                 start_time: Optional[float] = None):
+        self.frame_interval = frame_interval
+        self.start_time = time.time() if start_time is None else start_time
+        self._persons = set()
+        self.results = {
+            "video_path": video_path,
+            "processing_info": {
+                "total_frames_analyzed": frames_analyzed,
+                "frame_interval_seconds": frame_interval,
+                "processing_start": datetime.now().isoformat(),
+                "processing_duration": 0
+            },
+            "detections_by_frame": [],
+            "person_timeline": {},
+            "sightings": [],
+            "statistics": {
+                "total_faces_detected": 0,
+                "unique_persons_found": [],
+                "faces_per_second": {},
+                "recognition_accuracy": 0.0,
+                "tracks": 0,
+                "recognitions_run": 0,
+                "sightings": 0
+            },
+            "errors": []
+        }
+        self.statistics = self.results["statistics"]
+
+    def new_frame(self, index: int, timestamp: float) -> Dict:
+        """Resultado vazio de um frame analisado (preenchido com add_face)"""
+        return {
+            "frame_index": index,
+            "timestamp": timestamp,
+            "timestamp_formatted": str(timedelta(seconds=int(timestamp))),
+            "faces": [],
+            "recognized_persons": []
+        }
+
+    def add_face(self, frame_result: Dict, face: Dict, track_id: int, identity: Optional[Dict],
+                 inherited: bool):
+        """Registra uma face no frame e, se identificada, na timeline da pessoa"""
+        frame_result["faces"].append({
+            "bbox": face["bbox"],
+            "confidence": face["confidence"],
+            "track_id": track_id,
+            # Cópia por frame; "inherited" indica identidade herdada do track
+            "recognition": {**identity, "inherited": inherited} if identity else None
+        })
+        self.statistics["total_faces_detected"] += 1
+        if not identity:
+            return
+
+        person_id = identity["person_id"]
+        timeline = self.results["person_timeline"].setdefault(person_id, {
+            "name": identity["person_name"],
+            "appearances": [],
+            "total_time": 0,
+            "average_confidence": 0.0
+        })
+        timeline["appearances"].append({
+            "timestamp": frame_result["timestamp"],
+            "confidence": identity["confidence"],
+            "frame_index": frame_result["frame_index"],
+            "track_id": track_id
+        })
+        self._persons.add(person_id)
+        frame_result["recognized_persons"].append(identity["person_name"])
+
+    def end_frame(self, frame_result: Dict, faces_detected: int):
+        """Conclui um frame: faces por segundo do vídeo e lista de frames"""
+        faces_per_second = self.statistics["faces_per_second"]
+        second = int(frame_result["timestamp"])
+        faces_per_second[second] = faces_per_second.get(second, 0) + faces_detected
+        self.results["detections_by_frame"].append(frame_result)
+
+    def add_sighting(self, sighting: Dict):
+        self.results["sightings"].append(sighting)
+
+    def add_error(self, message: str):
+        self.results["errors"].append(message)
+
+    def finish(self, tracks_created: int) -> Dict:
+        """Calcula as estatísticas finais e retorna o resultado completo"""
+        sightings: List[Dict] = self.results["sightings"]
+        sightings.sort(key=lambda sighting: sighting["started_at"])
+        self.statistics["sightings"] = len(sightings)
+        self.statistics["unique_persons_found"] = list(self._persons)
+        self.statistics["tracks"] = tracks_created
+
+        info = self.results["processing_info"]
+        info["processing_duration"] = time.time() - self.start_time
+        info["processing_end"] = datetime.now().isoformat()
+
+        for timeline in self.results["person_timeline"].values():
+            appearances = timeline["appearances"]
+            if appearances:
+                # Tempo total de aparição (aproximado) e confiança média
+                timeline["total_time"] = len(appearances) * self.frame_interval
+                timeline["average_confidence"] = sum(a["confidence"] for a in appearances) / len(appearances)
+        return self.results
@@ -283,7 +283,8 @@ class NewFacialApp {
                 streamDiv.innerHTML = `
                     <div>
                         <strong>${stream.stream_id}</strong>
-                        <br><small class="text-muted">FPS: ${stream.fps.toFixed(1)} | Frames: ${stream.frame_count}</small>
+                        <span class="badge ${stream.state === 'live' ? 'bg-success' : stream.state === 'failed' ? 'bg-danger' : 'bg-warning text-dark'} ms-1">${stream.state}</span>
+                        <br><small class="text-muted">FPS: ${stream.fps.toFixed(1)} | Análise: ${stream.effective_fps.toFixed(1)}/s | Frames: ${stream.frame_count}</small>
                     </div>
                     <div>
                         <button class="btn btn-sm btn-primary me-2" onclick="app.viewStream('${stream.stream_id}')">
@@ -3,16 +3,21 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 import time
 import atexit
 
-from app.config import APP_NAME, APP_VERSION, DEBUG
-from app.database.connection import init_database, get_db
-from app.database.models import Person, FaceEmbedding, DetectionLog
-from app.api import persons, recognition, rtsp, multimodal, video
+from app.config import APP_NAME, APP_VERSION, DEBUG, JSON_COMPRESSION_ENABLED
+from app.database.connection import (
+    init_database, get_async_db, get_async_engine, dispose_async_engine, SessionLocal
+)
+from app.api import persons, recognition, rtsp, rtsp_live, rtsp_clips, multimodal, video, video_results, logs, log_analytics
 from app.services.rtsp_service import rtsp_processor
+from app.services.detection_log_writer import detection_log_writer
+from app.services.counters import counter_service, PERSONS_ACTIVE, FACE_EMBEDDINGS, DETECTION_LOGS
+from app.services.detection_retention import detection_retention
+from app.api.responses import FastJSONResponse, JSONCompressionMiddleware
 from app.models.schemas import SystemStats
 
 # Configurar logging
@@ -39,6 +44,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compressão de respostas JSON grandes (jobs de vídeo, logs)
+if JSON_COMPRESSION_ENABLED:
+    app.add_middleware(JSONCompressionMiddleware)
+
 # Montar arquivos estáticos
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -49,8 +58,13 @@ templates = Jinja2Templates(directory="app/templates")
 app.include_router(persons.router, prefix="/api")
 app.include_router(recognition.router, prefix="/api")
 app.include_router(rtsp.router, prefix="/api")
+app.include_router(rtsp_live.router, prefix="/api")
+app.include_router(rtsp_clips.router, prefix="/api")
 app.include_router(multimodal.router, prefix="/api")
 app.include_router(video.router, prefix="/api")
+app.include_router(video_results.router, prefix="/api")
+app.include_router(logs.router, prefix="/api")
+app.include_router(log_analytics.router, prefix="/api")
 
 # Variável para controlar tempo de início
 start_time = time.time()
@@ -63,6 +77,17 @@ async def startup_event():
     # Inicializar banco de dados
     try:
         init_database()
+        
+        # Reconciliar contadores de estatísticas com as tabelas
+        db = SessionLocal()
+        try:
+            counter_service.reconcile(db)
+        finally:
+            db.close()
+        
+        # Engine assíncrono das rotas (falha aqui se o driver assíncrono não estiver instalado)
+        get_async_engine()
+        
         logger.info("Banco de dados inicializado com sucesso")
     except Exception as e:
         logger.error(f"Erro ao inicializar banco de dados: {e}")
@@ -70,6 +95,8 @@ async def startup_event():
     
     # Inicializar serviços
     try:
+        detection_log_writer.start()
+        detection_retention.start()
         logger.info("Serviços inicializados com sucesso")
     except Exception as e:
         logger.error(f"Erro ao inicializar serviços: {e}")
@@ -85,10 +112,18 @@ async def shutdown_event():
     # Parar todos os streams RTSP
     rtsp_processor.shutdown()
     
+    # Gravar logs de detecção pendentes
+    detection_retention.stop()
+    detection_log_writer.stop()
+    
+    # Fechar conexões do engine assíncrono
+    await dispose_async_engine()
+    
     logger.info("NewFacial encerrado com sucesso")
 
 # Registrar função de cleanup no exit
 atexit.register(lambda: rtsp_processor.shutdown())
+atexit.register(lambda: detection_log_writer.stop())
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -102,16 +137,18 @@ async def health_check():
         "status": "healthy",
         "app_name": APP_NAME,
         "version": APP_VERSION,
-        "timestamp": time.time()
+        "timestamp": time.time(),
+        "detection_log_writer": detection_log_writer.get_status()
     }
 
-@app.get("/api/stats", response_model=SystemStats)
-async def get_system_stats(db: Session = Depends(get_db)):
+@app.get("/api/stats", response_model=SystemStats, response_class=FastJSONResponse)
+async def get_system_stats(db: AsyncSession = Depends(get_async_db)):
     """Retorna estatísticas do sistema"""
-    # Contar registros no banco
-    total_persons = db.query(Person).filter(Person.is_active == True).count()
-    total_embeddings = db.query(FaceEmbedding).count()
-    total_detections = db.query(DetectionLog).count()
+    # Contadores mantidos incrementalmente (sem COUNT(*) nas tabelas)
+    counters = await db.run_sync(counter_service.get_all)
+    total_persons = counters.get(PERSONS_ACTIVE, 0)
+    total_embeddings = counters.get(FACE_EMBEDDINGS, 0)
+    total_detections = counters.get(DETECTION_LOGS, 0)
     
     # Contar streams ativos
     active_streams = len(rtsp_processor.active_streams)
@@ -127,42 +164,6 @@ async def get_system_stats(db: Session = Depends(get_db)):
         uptime=uptime
     )
 
-@app.get("/api/logs")
-async def get_detection_logs(
-    skip: int = 0,
-    limit: int = 100,
-    person_id: int = None,
-    db: Session = Depends(get_db)
-):
-    """Retorna logs de detecção"""
-    query = db.query(DetectionLog, Person).outerjoin(
-        Person, DetectionLog.person_id == Person.id
-    ).order_by(DetectionLog.detected_at.desc())
-    
-    if person_id:
-        query = query.filter(DetectionLog.person_id == person_id)
-    
-    logs = query.offset(skip).limit(limit).all()
-    
-    result = []
-    for log, person in logs:
-        log_data = {
-            "id": log.id,
-            "person_id": log.person_id,
-            "person_name": person.name if person else "Desconhecido",
-            "confidence": log.confidence,
-            "source": log.source,
-            "source_info": log.source_info,
-            "detected_at": log.detected_at,
-            "bounding_box": log.get_bounding_box()
-        }
-        result.append(log_data)
-    
-    return {
-        "logs": result,
-        "total": db.query(DetectionLog).count()
-    }
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
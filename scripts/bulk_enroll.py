@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+NewFacial - Cadastro offline em lote
+
+Uso:
+    python scripts/bulk_enroll.py /caminho/dataset [--workers 4] [--batch-size 256]
+
+O dataset deve seguir a estrutura `nome_da_pessoa/*.jpg`. Execuções
+interrompidas retomam a partir do checkpoint (imagens do checkpoint ou já
+cadastradas no banco são puladas). Com --reset todas as imagens são
+reprocessadas e seus embeddings existentes substituídos.
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Permitir execução a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import BULK_ENROLL_WORKERS, BULK_ENROLL_BATCH_SIZE, BULK_ENROLL_CHECKPOINT  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Cadastro em lote de pessoas a partir de diretórios de imagens")
+    parser.add_argument("dataset_dir", type=Path, help="Diretório raiz com subpastas por pessoa")
+    parser.add_argument("--workers", type=int, default=BULK_ENROLL_WORKERS, help="Processos de extração")
+    parser.add_argument("--batch-size", type=int, default=BULK_ENROLL_BATCH_SIZE, help="Imagens por commit")
+    parser.add_argument("--checkpoint", type=Path, default=BULK_ENROLL_CHECKPOINT, help="Arquivo de checkpoint")
+    parser.add_argument("--all-faces", action="store_true", help="Cadastrar todas as faces de cada imagem")
+    parser.add_argument("--reset", action="store_true",
+                        help="Reprocessar todas as imagens, substituindo os embeddings já cadastrados")
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = parse_args()
+
+    if not args.dataset_dir.is_dir():
+        print(f"❌ Diretório não encontrado: {args.dataset_dir}")
+        return 1
+
+    if args.reset and args.checkpoint.exists():
+        args.checkpoint.unlink()
+
+    from app.database.connection import init_database, SessionLocal
+    from app.services.bulk_enrollment import BulkEnrollmentService
+
+    init_database()
+    db = SessionLocal()
+    try:
+        service = BulkEnrollmentService(
+            db,
+            checkpoint_path=args.checkpoint,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            all_faces=args.all_faces,
+            resume=not args.reset
+        )
+        stats = service.run(args.dataset_dir)
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrompido. Execute novamente para retomar do checkpoint.")
+        return 130
+    finally:
+        db.close()
+
+    print("")
+    print("✅ Cadastro em lote concluído")
+    print(f"   Imagens processadas: {stats['images_processed']} (puladas: {stats['images_skipped']})")
+    print(f"   Sem face: {stats['images_without_face']}  |  Com erro: {stats['images_failed']}")
+    print(f"   Embeddings adicionados: {stats['embeddings_added']}  |  Pessoas: {stats['persons']}")
+    print(f"   Tempo: {stats['duration_seconds']:.1f}s  |  {stats['images_per_second']:.2f} imagens/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
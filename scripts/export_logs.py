@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+NewFacial - Exportação de logs de detecção
+
+Uso:
+    python scripts/export_logs.py --format csv --output logs.csv [--start 2024-01-01] [--end 2024-02-01]
+
+Sem --output o conteúdo é escrito na saída padrão. Parquet requer pyarrow.
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Permitir execução a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import EXPORT_FORMATS  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Exportação em streaming de logs de detecção")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv", help="Formato de saída")
+    parser.add_argument("--output", type=Path, help="Arquivo de saída (padrão: stdout)")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Início do intervalo (ISO 8601)")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Fim do intervalo, exclusivo (ISO 8601)")
+    parser.add_argument("--person-id", type=int, help="Filtrar por pessoa")
+    parser.add_argument("--source", help="Filtrar por origem (upload, rtsp, video...)")
+    parser.add_argument("--stream-id", help="Filtrar por stream RTSP")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    from app.database.connection import init_database
+    from app.services.detection_export import detection_export_service
+
+    try:
+        detection_export_service.validate_format(args.format)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    init_database()
+    stats = {}
+    start = time.perf_counter()
+    chunks = detection_export_service.stream(
+        args.format, stats=stats, person_id=args.person_id, source=args.source,
+        start_time=args.start, end_time=args.end, stream_id=args.stream_id
+    )
+
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+    except KeyboardInterrupt:
+        print("\n⚠️  Exportação interrompida", file=sys.stderr)
+        return 130
+    finally:
+        if args.output:
+            output.close()
+
+    duration = time.perf_counter() - start
+    rate = stats["rows"] / duration if duration > 0 else 0.0
+    print(f"✅ {stats['rows']} logs exportados em {duration:.1f}s ({rate:.0f} linhas/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Banco SQLite temporário: definido antes de importar app.config
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="newfacial-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR / 'test.db'}"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from app.database.connection import SessionLocal, engine, init_database
+from app.database.models import Base
+from app.services.counters import counter_service
+
+
+@pytest.fixture
+def db():
+    """Sessão em um banco recriado para cada teste"""
+    Base.metadata.drop_all(bind=engine)
+    init_database()
+    session = SessionLocal()
+    counter_service.reconcile(session)
+    try:
+        yield session
+    finally:
+        session.close()
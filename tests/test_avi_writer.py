@@ -0,0 +1,63 @@
+import struct
+
+import cv2
+import numpy as np
+
+from app.services.avi_writer import write_mjpeg_avi
+
+
+def encode_frames(count, width=64, height=48):
+    frames = []
+    for i in range(count):
+        image = np.full((height, width, 3), i * 20, dtype=np.uint8)
+        ok, buffer = cv2.imencode(".jpg", image)
+        assert ok
+        frames.append(buffer.tobytes())
+    return frames
+
+
+def test_written_avi_is_readable_by_opencv(tmp_path):
+    path = tmp_path / "clip.avi"
+    frames = encode_frames(10)
+    # JPEG de tamanho ímpar exige padding do chunk
+    frames[3] += b"\0"
+    write_mjpeg_avi(path, frames, fps=7.5, width=64, height=48)
+
+    capture = cv2.VideoCapture(str(path))
+    try:
+        assert capture.isOpened()
+        assert capture.get(cv2.CAP_PROP_FRAME_WIDTH) == 64
+        assert capture.get(cv2.CAP_PROP_FRAME_HEIGHT) == 48
+        assert abs(capture.get(cv2.CAP_PROP_FPS) - 7.5) < 0.01
+        decoded = []
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            decoded.append(int(frame.mean()))
+    finally:
+        capture.release()
+
+    assert len(decoded) == 10
+    assert all(abs(value - i * 20) <= 2 for i, value in enumerate(decoded))
+
+
+def test_riff_sizes_and_index(tmp_path):
+    path = tmp_path / "clip.avi"
+    frames = encode_frames(3)
+    write_mjpeg_avi(path, frames, fps=10, width=64, height=48)
+    data = path.read_bytes()
+
+    assert data[:4] == b"RIFF" and data[8:12] == b"AVI "
+    assert struct.unpack("<I", data[4:8])[0] == len(data) - 8
+    idx = data.index(b"idx1")
+    assert struct.unpack("<I", data[idx + 4:idx + 8])[0] == 16 * len(frames)
+
+    # Cada entrada do índice aponta para o chunk '00dc' do frame correspondente
+    movi = data.index(b"movi")
+    for i, frame in enumerate(frames):
+        entry = data[idx + 8 + 16 * i:idx + 24 + 16 * i]
+        fourcc, flags, offset, size = struct.unpack("<4sIII", entry)
+        assert (fourcc, flags, size) == (b"00dc", 0x10, len(frame))
+        assert data[movi + offset:movi + offset + 4] == b"00dc"
+        assert data[movi + offset + 8:movi + offset + 8 + size] == frame
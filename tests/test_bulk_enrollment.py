@@ -0,0 +1,82 @@
+import numpy as np
+
+from app.database.models import FaceEmbedding, Person
+from app.services import bulk_enrollment, bulk_enrollment_worker
+from app.services.bulk_enrollment import BulkEnrollmentService
+
+EMBEDDING = np.ones(512, dtype=np.float32).tobytes()
+
+
+def make_dataset(root, images):
+    for name, files in images.items():
+        (root / name).mkdir(parents=True)
+        for file_name in files:
+            (root / name / file_name).write_bytes(b"")
+    return root
+
+
+def fake_extract(failures=()):
+    """Substitui o pool de processos: falha nas imagens indicadas, uma face nas demais"""
+    seen = []
+
+    def extract(tasks, workers):
+        for person_name, image_path, _ in tasks:
+            seen.append(image_path)
+            if image_path.endswith(tuple(failures)):
+                yield person_name, image_path, [], "detector indisponível"
+            else:
+                yield person_name, image_path, [(EMBEDDING, 0.9)], None
+
+    return extract, seen
+
+
+def test_failed_images_are_not_checkpointed_and_retried_on_resume(db, tmp_path, monkeypatch):
+    root = make_dataset(tmp_path / "dataset", {"ana": ["1.jpg", "2.jpg"], "bia": ["1.jpg"]})
+    checkpoint = tmp_path / "bulk.checkpoint"
+    extract, seen = fake_extract(failures=["bia/1.jpg"])
+    monkeypatch.setattr(bulk_enrollment, "extract_images", extract)
+
+    stats = BulkEnrollmentService(db, checkpoint, workers=1).run(root)
+
+    assert stats["images_failed"] == 1
+    assert stats["embeddings_added"] == 2
+    assert sorted(checkpoint.read_text().split()) == sorted(p for p in seen if "ana" in p)
+    assert [p.name for p in db.query(Person).all()] == ["ana"]
+
+    extract, seen = fake_extract()
+    monkeypatch.setattr(bulk_enrollment, "extract_images", extract)
+    stats = BulkEnrollmentService(db, checkpoint, workers=1).run(root)
+
+    assert stats["images_skipped"] == 2
+    assert seen == [str((root / "bia" / "1.jpg").resolve())]
+    assert db.query(FaceEmbedding).count() == 3
+
+
+def test_reset_replaces_embeddings_of_reprocessed_images(db, tmp_path, monkeypatch):
+    root = make_dataset(tmp_path / "dataset", {"ana": ["1.jpg"]})
+    checkpoint = tmp_path / "bulk.checkpoint"
+    extract, seen = fake_extract()
+    monkeypatch.setattr(bulk_enrollment, "extract_images", extract)
+
+    BulkEnrollmentService(db, checkpoint, workers=1).run(root)
+    stats = BulkEnrollmentService(db, checkpoint, workers=1, resume=False).run(root)
+
+    assert stats["images_skipped"] == 0
+    assert len(seen) == 2
+    assert db.query(FaceEmbedding).count() == 1
+
+
+class RaisingFaceService:
+    def extract_face_embedding(self, image_path, raise_errors=False):
+        if raise_errors:
+            raise RuntimeError("falha no ONNX Runtime")
+        return []
+
+
+def test_extract_image_reports_detector_errors(monkeypatch):
+    monkeypatch.setattr(bulk_enrollment_worker, "_worker_face_service", RaisingFaceService())
+
+    person_name, image_path, faces, error = bulk_enrollment_worker.extract_image(("ana", "/x/1.jpg", False))
+
+    assert (person_name, image_path, faces) == ("ana", "/x/1.jpg", [])
+    assert error == "falha no ONNX Runtime"
@@ -0,0 +1,76 @@
+import threading
+
+import cv2
+import numpy as np
+
+from app.services.clip_encoder import ClipEncoder
+from app.services.clip_recorder import ClipRecorder
+
+FRAME = b"j" * 100  # JPEG simulado: o orçamento considera apenas o tamanho
+
+
+def make_recorder(tmp_path, **kwargs):
+    recorder = ClipRecorder("cam1", clips_dir=tmp_path, **kwargs)
+    saved = []
+    recorder._save_async = saved.append
+    return recorder, saved
+
+
+def append(recorder, *timestamps):
+    for timestamp in timestamps:
+        recorder._append(timestamp, FRAME, (64, 48))
+
+
+def test_encoder_compresses_on_its_own_thread():
+    encoded = []
+    encoder = ClipEncoder("clip-encoder-test", 75,
+                          lambda ts, jpeg, size: encoded.append((threading.current_thread().name, ts, jpeg, size)))
+    encoder.submit(np.zeros((48, 64, 3), np.uint8), 1.5)
+    encoder.stop()
+
+    name, timestamp, jpeg, size = encoded[0]
+    assert (name, timestamp, size) == ("clip-encoder-test", 1.5, (64, 48))
+    assert cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR).shape == (48, 64, 3)
+
+
+def test_push_hands_frames_to_encoder_at_buffer_fps(tmp_path):
+    recorder, _ = make_recorder(tmp_path, fps=10.0)
+    submitted = []
+    recorder.encoder.submit = lambda frame, timestamp: submitted.append(timestamp)
+
+    for i in range(10):
+        recorder.push(np.zeros((4, 4, 3), np.uint8), 100 + i * 0.06)
+    assert submitted == [100 + i * 0.06 for i in (0, 2, 4, 6, 8)]
+
+
+def test_preroll_is_capped_by_budget_without_clip(tmp_path):
+    recorder, _ = make_recorder(tmp_path, pre_seconds=100, max_bytes=500)
+    append(recorder, *range(10))
+    assert recorder.buffer_bytes == 500
+
+
+def test_shared_frames_count_once_and_clip_closes_at_budget(tmp_path):
+    recorder, saved = make_recorder(tmp_path, pre_seconds=0.25, post_seconds=100, max_bytes=1000)
+    append(recorder, 0.0, 0.1, 0.2)
+    recorder.trigger(0.2)
+    assert recorder.buffer_bytes == 300
+
+    # Frames fora do pré-roll continuam contando enquanto o clip os mantém
+    append(recorder, *(0.3 + 0.1 * i for i in range(6)))
+    assert recorder.buffer_bytes == 900 and not saved
+
+    append(recorder, 0.9, 1.0)
+    assert len(saved) == 1 and len(saved[0]["frames"]) == 11
+    assert not recorder.recording
+    assert recorder.buffer_bytes == 300  # Apenas o pré-roll atual
+
+
+def test_finished_clip_releases_its_frames(tmp_path):
+    recorder, saved = make_recorder(tmp_path, pre_seconds=0.25, post_seconds=0.3)
+    append(recorder, 0.0, 0.1)
+    recorder.trigger(0.1)
+    append(recorder, 0.2, 0.3, 0.4, 0.5)
+
+    assert len(saved) == 1
+    assert [ts for ts, _ in saved[0]["frames"]] == [0.0, 0.1, 0.2, 0.3, 0.4, 0.5]
+    assert recorder.buffer_bytes == 300
@@ -0,0 +1,121 @@
+import json
+from datetime import datetime, timezone
+
+import app.database.connection as connection
+from app.database.models import DetectionLog
+from app.services.detection_log_writer import DetectionLogWriter
+
+
+def make_writer(tmp_path, **kwargs):
+    options = {"max_queue_size": 100, "batch_size": 4, "flush_interval": 0.01, "overflow_policy": "spill"}
+    options.update(kwargs)
+    return DetectionLogWriter(spill_path=tmp_path / "spill.jsonl", **options)
+
+
+def break_database(monkeypatch):
+    """Sessões cujo insert falha (banco indisponível)"""
+    real_session = connection.SessionLocal
+
+    def broken_session():
+        session = real_session()
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("banco indisponível")
+
+        session.execute = fail
+        return session
+
+    monkeypatch.setattr(connection, "SessionLocal", broken_session)
+
+
+def event(confidence=0.9):
+    return {
+        "person_id": None, "confidence": confidence, "source": "rtsp", "source_info": None,
+        "stream_id": "cam1", "detected_at": datetime(2024, 1, 1, tzinfo=timezone.utc), "ended_at": None,
+        "detection_count": None, "frame_ref": None, "bbox_x": 1, "bbox_y": 2, "bbox_w": 3, "bbox_h": 4
+    }
+
+
+def test_failed_batch_is_spilled_and_kept_until_written(db, tmp_path, monkeypatch):
+    writer = make_writer(tmp_path)
+    break_database(monkeypatch)
+
+    writer.flusher._write_or_spill([event() for _ in range(10)])
+    writer.flusher._drain_spill()
+    assert writer.get_status()["spilled"] == 10
+    assert writer.spill.draining_path.exists()
+    assert len(writer.spill.pending_lines()) == 10
+
+    monkeypatch.undo()
+    writer.flusher._drain_spill()
+    assert not writer.spill.draining_path.exists()
+    assert db.query(DetectionLog).count() == 10
+
+
+def test_partial_drain_keeps_only_unwritten_lines(db, tmp_path, monkeypatch):
+    writer = make_writer(tmp_path)
+    writer.flusher.spill_events([event(confidence=i / 10) for i in range(10)])
+
+    calls = []
+    real_write = writer.flusher._write
+
+    def write_first_batch_only(rows):
+        calls.append(len(rows))
+        return real_write(rows) if len(calls) == 1 else False
+
+    monkeypatch.setattr(writer.flusher, "_write", write_first_batch_only)
+    writer.flusher._drain_spill()
+    assert db.query(DetectionLog).count() == 4
+    remaining = [json.loads(line)["confidence"] for line in writer.spill.pending_lines()]
+    assert remaining == [i / 10 for i in range(4, 10)]
+
+    monkeypatch.undo()
+    writer.flusher._drain_spill()
+    assert db.query(DetectionLog).count() == 10
+    assert not writer.spill.draining_path.exists()
+
+
+def test_leftover_draining_file_is_appended_not_replaced(db, tmp_path):
+    writer = make_writer(tmp_path)
+    legacy = {
+        "person_id": None, "confidence": 0.5, "source": "upload", "source_info": None, "stream_id": None,
+        "detected_at": "2024-01-01T00:00:00+00:00", "bounding_box": json.dumps({"x": 5, "y": 6, "w": 7, "h": 8})
+    }
+    writer.spill.draining_path.write_text(json.dumps(legacy) + "\n", encoding="utf-8")
+    writer.flusher.spill_events([event(), event()])
+
+    writer.flusher._drain_spill()
+    assert db.query(DetectionLog).count() == 3
+    row = db.query(DetectionLog).filter(DetectionLog.source == "upload").one()
+    assert (row.bbox_x, row.bbox_y, row.bbox_w, row.bbox_h) == (5, 6, 7, 8)
+
+
+def test_invalid_spill_line_is_counted_and_skipped(db, tmp_path):
+    writer = make_writer(tmp_path)
+    writer.flusher.spill_events([event()])
+    with open(writer.spill.path, "a", encoding="utf-8") as f:
+        f.write("{não é json\n")
+
+    writer.flusher._drain_spill()
+    assert db.query(DetectionLog).count() == 1
+    assert writer.get_status()["errors"] == 1
+
+
+def test_overflow_spills_and_stop_writes_everything(db, tmp_path):
+    writer = make_writer(tmp_path, max_queue_size=2)
+    accepted = [writer.submit(None, 0.9, "rtsp", bbox=(1, 2, 3, 4)) for _ in range(20)]
+    writer.stop()
+
+    assert all(accepted)
+    assert db.query(DetectionLog).count() == 20
+    assert not writer.spill.path.exists() and not writer.spill.draining_path.exists()
+
+
+def test_submit_after_stop_is_rejected(db, tmp_path):
+    writer = make_writer(tmp_path)
+    writer.start()
+    writer.stop()
+
+    assert writer.submit(None, 0.9, "rtsp") is False
+    assert writer.get_status()["rejected"] == 1
+    assert writer._thread is None
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import DETECTION_LOG_RETENTION_DAYS, ROLLUP_HOURLY_RETENTION_DAYS
+from app.database.models import DetectionLog, DetectionRollupDaily, DetectionRollupHourly
+from app.services.counters import counter_service, DETECTION_LOGS
+from app.services.detection_retention import DetectionRetentionService
+from app.services.detection_rollups import as_utc, rollup
+
+NOW = datetime(2024, 6, 1, 12, 30, tzinfo=timezone.utc)
+OLD = NOW - timedelta(days=DETECTION_LOG_RETENTION_DAYS + 5)
+
+
+def add_log(db, detected_at, person_id=1, detection_count=None, confidence=0.8):
+    db.add(DetectionLog(person_id=person_id, confidence=confidence, source="rtsp", stream_id="cam1",
+                        detected_at=detected_at, detection_count=detection_count))
+    db.commit()
+
+
+def remaining_logs(db):
+    return sorted(as_utc(row.detected_at) for row in db.query(DetectionLog).all())
+
+
+def test_raw_logs_are_kept_until_rolled_up(db):
+    add_log(db, OLD)
+    add_log(db, NOW - timedelta(hours=3))
+    service = DetectionRetentionService()
+
+    # Sem agregados não há marca d'água: nada é apagado
+    assert service._purge_raw(db, NOW) == 0
+    assert db.query(DetectionLog).count() == 2
+
+    result = service.run_once(NOW)
+    assert result["raw_logs_removed"] == 1
+    assert remaining_logs(db) == [NOW - timedelta(hours=3)]
+    assert db.query(DetectionRollupDaily).one().detections == 1
+
+
+def test_last_rolled_up_bucket_keeps_its_raw_logs(db):
+    # O último intervalo agregado é recalculado a partir dos logs brutos no próximo ciclo
+    add_log(db, OLD)
+    add_log(db, OLD + timedelta(minutes=5))
+    service = DetectionRetentionService()
+
+    assert service.run_once(NOW)["raw_logs_removed"] == 0
+    assert db.query(DetectionRollupHourly).one().detections == 2
+
+    add_log(db, OLD + timedelta(hours=2))
+    assert service.run_once(NOW)["raw_logs_removed"] == 2
+    assert remaining_logs(db) == [OLD + timedelta(hours=2)]
+
+
+def test_purge_updates_detection_log_counter(db):
+    add_log(db, OLD)
+    add_log(db, NOW - timedelta(hours=2))
+    counter_service.reconcile(db)
+
+    DetectionRetentionService().run_once(NOW)
+    assert counter_service.get_all(db)[DETECTION_LOGS] == 1
+
+
+def test_hourly_rollups_are_kept_until_rolled_into_days(db):
+    very_old = NOW - timedelta(days=ROLLUP_HOURLY_RETENTION_DAYS + 5)
+    add_log(db, very_old)
+    add_log(db, very_old)
+    add_log(db, NOW - timedelta(days=2))
+    service = DetectionRetentionService()
+
+    rollup(db, DetectionLog, DetectionRollupHourly, DetectionLog.detected_at, "hour", NOW)
+    assert service._purge_hourly(db, NOW) == 0
+
+    result = service.run_once(NOW)
+    assert result["hourly_rollups_removed"] == 1
+    hourly = [as_utc(row.bucket_start) for row in db.query(DetectionRollupHourly).all()]
+    assert hourly == [(NOW - timedelta(days=2)).replace(minute=0)]
+    daily = {as_utc(row.bucket_start).date(): row.detections for row in db.query(DetectionRollupDaily).all()}
+    assert daily == {very_old.date(): 2, (NOW - timedelta(days=2)).date(): 1}
+
+
+def test_rollup_counts_detections_of_each_sighting(db):
+    hour = NOW - timedelta(hours=3)
+    add_log(db, hour, detection_count=5, confidence=0.9)
+    add_log(db, hour + timedelta(minutes=1), confidence=0.6)  # Detecção avulsa (sem detection_count)
+
+    rollup(db, DetectionLog, DetectionRollupHourly, DetectionLog.detected_at, "hour", NOW)
+
+    row = db.query(DetectionRollupHourly).one()
+    assert row.detections == 6
+    assert row.sum_confidence / row.detections == pytest.approx((5 * 0.9 + 0.6) / 6)
+
+
+def test_late_sightings_inside_lookback_are_rolled_up(db):
+    service = DetectionRetentionService(lookback=timedelta(hours=3))
+    add_log(db, NOW - timedelta(minutes=20))
+    service.run_once(NOW + timedelta(hours=1))
+
+    # Aparição gravada ao encerrar, com início em um intervalo anterior ao último agregado
+    late = NOW - timedelta(minutes=50)
+    add_log(db, late, detection_count=40)
+    service.run_once(NOW + timedelta(minutes=70))
+
+    hourly = {as_utc(row.bucket_start): row.detections for row in db.query(DetectionRollupHourly).all()}
+    assert hourly[late.replace(minute=0)] == 40
+    assert sum(hourly.values()) == 41
@@ -0,0 +1,68 @@
+import numpy as np
+
+from app.services.detection_zones import DetectionZones, zone_polygon
+
+
+def crops(zones):
+    return [rect for rect, _ in zones._crops]
+
+
+def square(x, y, w, h):
+    """Zona poligonal cobrindo os pixels [x, x + w) x [y, y + h)"""
+    return {"polygon": [[x, y], [x + w - 1, y], [x + w - 1, y + h - 1], [x, y + h - 1]]}
+
+
+def test_zone_polygon_from_rect():
+    assert zone_polygon({"rect": [10, 20, 30, 40]}) == [[10, 20], [40, 20], [40, 60], [10, 60]]
+
+
+def test_overlapping_crops_are_merged():
+    zones = DetectionZones([square(0, 0, 100, 100), square(50, 50, 100, 100)], margin=0.0)
+    zones._prepare(480, 640)
+    assert crops(zones) == [(0, 0, 150, 150)]
+
+
+def test_disjoint_crops_are_kept_apart():
+    zones = DetectionZones([square(0, 0, 100, 100), square(400, 300, 100, 100)], margin=0.0)
+    zones._prepare(480, 640)
+    assert sorted(crops(zones)) == [(0, 0, 100, 100), (400, 300, 500, 400)]
+    assert zones.area_ratio == 2 * 100 * 100 / (640 * 480)
+
+
+def test_merging_is_transitive():
+    # A e C só se tocam por meio de B, que aparece depois na lista
+    zones = DetectionZones([
+        square(0, 0, 100, 100),
+        square(300, 0, 100, 100),
+        square(90, 0, 220, 50)
+    ], margin=0.0)
+    zones._prepare(480, 640)
+    assert crops(zones) == [(0, 0, 400, 100)]
+
+
+def test_margin_is_clamped_to_frame_and_input_sizes_are_aligned():
+    zones = DetectionZones([square(0, 0, 100, 100)], margin=0.1, detection_size=(640, 640))
+    zones._prepare(480, 640)
+    (rect, input_size), = zones._crops
+    assert rect == (0, 0, 110, 110)
+    assert all(size % 32 == 0 and size >= 32 for size in input_size)
+
+
+def test_detect_maps_back_to_frame_and_discards_faces_outside_zones():
+    zones = DetectionZones([{"name": "porta", **square(100, 100, 200, 200)}], margin=0.0)
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def detect(crop, input_size):
+        assert crop.shape[:2] == (200, 200)
+        return [
+            {"bbox": np.array([10, 10, 50, 50]), "confidence": 0.9, "kps": np.zeros((5, 2), dtype=np.float32)},
+            # Centro fora do retângulo da zona (não há zona no recorte inteiro)
+            {"bbox": np.array([-40, -40, -10, -10]), "confidence": 0.9, "kps": None}
+        ]
+
+    results = zones.detect(frame, detect)
+    assert len(results) == 1
+    assert results[0]["bbox"].tolist() == [110, 110, 150, 150]
+    assert results[0]["kps"][0].tolist() == [100, 100]
+    assert results[0]["zone"] == "porta"
+    assert zones.discarded == 1
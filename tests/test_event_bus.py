@@ -0,0 +1,96 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.event_bus import EventBus, EventSubscription, event_bus
+
+
+async def drain(subscription):
+    """Eventos entregues até agora (call_soon_threadsafe roda na próxima iteração do loop)"""
+    await asyncio.sleep(0)
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_fan_out_with_stream_and_type_filters():
+    async def scenario():
+        bus = EventBus()
+        everything = bus.subscribe()
+        cam1 = bus.subscribe(stream_ids=["cam1"])
+        states = bus.subscribe(event_types=["stream_state"])
+
+        # Produtores publicam de outras threads (captura, inferência)
+        threads = [
+            threading.Thread(target=bus.publish, args=("detection", "cam1"), kwargs={"person_id": 1}),
+            threading.Thread(target=bus.publish, args=("stream_state", "cam2"), kwargs={"state": "live"}),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert {(e["type"], e["stream_id"]) for e in await drain(everything)} == {
+            ("detection", "cam1"), ("stream_state", "cam2")}
+        assert [e["person_id"] for e in await drain(cam1)] == [1]
+        assert [e["state"] for e in await drain(states)] == ["live"]
+        assert bus.published == 2
+
+        bus.unsubscribe(cam1)
+        assert bus.subscribers == 2
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_drops_oldest_events():
+    async def scenario():
+        subscription = EventSubscription(asyncio.get_running_loop(), max_queue_size=2)
+        for index in range(5):
+            subscription._deliver({"type": "detection", "index": index})
+        assert [e["index"] for e in await drain(subscription)] == [3, 4]
+        assert subscription.dropped == 3
+
+    asyncio.run(scenario())
+
+
+def test_listener_errors_and_closed_loops_do_not_block_delivery():
+    bus = EventBus()
+    received = []
+    bus.add_listener(lambda event: 1 / 0)
+    bus.add_listener(received.append)
+
+    loop = asyncio.new_event_loop()
+    subscription = EventSubscription(loop)
+    bus._subscriptions.add(subscription)
+    loop.close()
+
+    bus.publish("detection", "cam1")
+    assert [e["type"] for e in received] == ["detection"]
+    assert bus.subscribers == 0
+
+
+def test_websocket_filters_events_by_stream_and_type():
+    pytest.importorskip("insightface")
+    from app.api import rtsp_live
+
+    app = FastAPI()
+    app.include_router(rtsp_live.router, prefix="/api")
+    subscribers = event_bus.subscribers
+    with TestClient(app) as client:
+        with client.websocket_connect("/api/rtsp/events?stream_id=cam1&types=sighting") as websocket:
+            # A assinatura é criada logo após o accept
+            deadline = time.monotonic() + 5
+            while event_bus.subscribers == subscribers and time.monotonic() < deadline:
+                time.sleep(0.01)
+            event_bus.publish("detection", "cam1")
+            event_bus.publish("sighting", "cam2")
+            event_bus.publish("sighting", "cam1", person_id=5)
+            event = json.loads(websocket.receive_text())
+
+    assert (event["type"], event["stream_id"], event["person_id"]) == ("sighting", "cam1", 5)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from app.database.models import FaceEmbedding, Person
+from app.services.face_gallery import FaceGallery
+
+
+def enroll(db, name, vector, active=True):
+    person = Person(name=name, is_active=active)
+    db.add(person)
+    db.flush()
+    db.add(FaceEmbedding(person_id=person.id, embedding=np.asarray(vector, np.float32).tobytes(),
+                         image_path=f"{name}.jpg", confidence=0.9))
+    db.commit()
+    return person
+
+
+def wait_refresh(gallery):
+    """Aguarda a recarga em background (o lock é liberado ao final dela)"""
+    with gallery._load_lock:
+        pass
+
+
+def test_match_returns_closest_active_person(db):
+    ana = enroll(db, "Ana", [1, 0, 0])
+    enroll(db, "Bruno", [0, 1, 0])
+    enroll(db, "Inativo", [0.9, 0.1, 0], active=False)
+    gallery = FaceGallery(threshold=0.5, refresh_seconds=3600)
+
+    match = gallery.match(np.array([2.0, 0.2, 0.0]))
+    assert (match["person_id"], match["person_name"]) == (ana.id, "Ana")
+    assert match["confidence"] == pytest.approx(2 / np.linalg.norm([2, 0.2]))
+
+    # Abaixo do threshold, vetor nulo ou dimensão diferente: sem identificação
+    assert gallery.match(np.array([0.0, 0.0, 1.0])) is None
+    assert gallery.match(np.zeros(3)) is None
+    assert gallery.match(np.ones(4)) is None
+    assert gallery.stats()["persons"] == 2 and gallery.matches == 1
+
+
+def test_invalidate_reloads_in_background(db):
+    enroll(db, "Ana", [1, 0, 0])
+    gallery = FaceGallery(threshold=0.5, refresh_seconds=3600)
+    assert gallery.match(np.array([0.0, 1.0, 0.0])) is None
+
+    bruno = enroll(db, "Bruno", [0, 1, 0])
+    assert gallery.match(np.array([0.0, 1.0, 0.0])) is None  # Snapshot ainda válido
+
+    gallery.invalidate()
+    gallery.match(np.array([0.0, 1.0, 0.0]))
+    wait_refresh(gallery)
+    assert gallery.match(np.array([0.0, 1.0, 0.0]))["person_id"] == bruno.id
+    assert gallery.stats()["embeddings"] == 2
+
+
+def test_expired_snapshot_is_refreshed(db):
+    gallery = FaceGallery(threshold=0.5, refresh_seconds=0)
+    assert gallery.match(np.array([1.0, 0.0, 0.0])) is None
+    assert gallery.stats()["persons"] == 0
+
+    ana = enroll(db, "Ana", [1, 0, 0])
+    gallery.match(np.array([1.0, 0.0, 0.0]))
+    wait_refresh(gallery)
+    assert gallery.match(np.array([1.0, 0.0, 0.0]))["person_id"] == ana.id
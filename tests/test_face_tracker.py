@@ -0,0 +1,64 @@
+import numpy as np
+
+from app.services.face_tracker import FaceTracker, iou_matrix
+
+
+def face(x1, y1, x2, y2):
+    return {"bbox": np.array([x1, y1, x2, y2]), "confidence": 0.9}
+
+
+def test_iou_matrix():
+    a = np.array([[0, 0, 10, 10]], dtype=np.float64)
+    b = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]], dtype=np.float64)
+    assert np.allclose(iou_matrix(a, b), [[1.0, 50 / 150, 0.0]])
+    assert iou_matrix(a, np.zeros((0, 4))).shape == (1, 0)
+
+
+def test_detections_keep_their_tracks_between_frames():
+    tracker = FaceTracker(iou_threshold=0.3, max_age=1.0)
+    first = tracker.update([face(0, 0, 50, 50), face(200, 200, 250, 250)], 0.0)
+    # Ordem das detecções invertida e pequeno deslocamento
+    second = tracker.update([face(205, 202, 255, 252), face(3, 1, 53, 51)], 0.1)
+
+    assert [t.track_id for t in first] == [1, 2]
+    assert [t.track_id for t in second] == [2, 1]
+    assert tracker.tracks_created == 2
+    assert second[1].hits == 2
+
+
+def test_unmatched_detection_opens_new_track():
+    tracker = FaceTracker()
+    tracker.update([face(0, 0, 50, 50)], 0.0)
+    tracks = tracker.update([face(0, 0, 50, 50), face(300, 300, 350, 350)], 0.1)
+    assert [t.track_id for t in tracks] == [1, 2]
+
+
+def test_motion_prediction_bridges_missed_frames():
+    tracker = FaceTracker(iou_threshold=0.3)
+    for step in range(5):
+        x = step * 15
+        tracker.update([face(x, 0, x + 50, 50)], step * 0.1)
+
+    # Dois frames sem detecção: a face andou 45 px (IoU 0.05 com a última posição)
+    tracks = tracker.update([face(105, 0, 155, 50)], 0.7)
+    assert tracks[0].track_id == 1
+    assert tracker.tracks_created == 1
+
+
+def test_stale_tracks_expire_after_max_age():
+    tracker = FaceTracker(max_age=1.0)
+    tracker.update([face(0, 0, 50, 50)], 0.0)
+    tracks = tracker.update([face(0, 0, 50, 50)], 2.0)
+    assert tracks[0].track_id == 2
+    assert len(tracker.tracks) == 1
+
+
+def test_recognition_only_for_new_or_due_tracks():
+    tracker = FaceTracker(reverify_seconds=3.0)
+    track = tracker.update([face(0, 0, 50, 50)], 0.0)[0]
+    assert tracker.needs_recognition(track, 0.0)
+
+    track.set_identity(None, {"person_id": 1, "person_name": "Ana", "confidence": 0.8}, 0.0)
+    track = tracker.update([face(1, 1, 51, 51)], 1.0)[0]
+    assert not tracker.needs_recognition(track, 1.0)
+    assert tracker.needs_recognition(track, 3.0)
@@ -0,0 +1,94 @@
+import threading
+import time
+
+import numpy as np
+
+from app.config import RTSP_MIN_ANALYSIS_FPS
+from app.services.frame_slot import FrameSlot
+from app.services.inference_scheduler import InferenceScheduler
+from app.services.scheduled_stream import AdaptiveRate, ScheduledStream
+
+
+class _Slot:
+    """Slot que sempre tem um frame novo"""
+    sequence = 10 ** 9
+
+
+def make_scheduler(policy, priorities):
+    scheduler = InferenceScheduler(workers=1, policy=policy)
+    for stream_id, priority in priorities.items():
+        scheduler._streams[stream_id] = ScheduledStream(stream_id, _Slot(), None, priority, target_fps=1000)
+        scheduler._order.append(stream_id)
+    return scheduler
+
+
+def simulate(scheduler, picks, cost=0.01):
+    """Escolhas sucessivas com custo de inferência fixo; retorna a contagem por stream"""
+    counts = {stream_id: 0 for stream_id in scheduler._streams}
+    for _ in range(picks):
+        stream = scheduler._workers.pick(time.monotonic())
+        stream.virtual_time += cost / stream.priority
+        counts[stream.stream_id] += 1
+    return counts
+
+
+def test_adaptive_rate_decreases_when_over_budget():
+    rate = AdaptiveRate(target_fps=10, latency_budget_ms=100)
+    rate.update(latency_ms=500, inference_ms=20, backlog=0, fair_share_fps=0)
+    assert rate.effective_fps == 10 * AdaptiveRate.DECREASE_FACTOR
+
+    # Reduções seguidas respeitam ADJUST_INTERVAL
+    rate.update(latency_ms=500, inference_ms=20, backlog=0, fair_share_fps=0)
+    assert rate.effective_fps == 10 * AdaptiveRate.DECREASE_FACTOR
+
+
+def test_adaptive_rate_recovers_and_respects_limits():
+    rate = AdaptiveRate(target_fps=10, latency_budget_ms=100)
+    rate.effective_fps = 5
+    rate.update(latency_ms=10, inference_ms=10, backlog=0, fair_share_fps=0)
+    assert 5 < rate.effective_fps <= 10
+
+    for _ in range(100):
+        rate.update(latency_ms=10, inference_ms=10, backlog=0, fair_share_fps=0)
+    assert rate.effective_fps == 10
+
+    rate.update(latency_ms=10, inference_ms=10, backlog=0, fair_share_fps=2)
+    assert rate.effective_fps == 2 * 1.2
+
+    rate.effective_fps = RTSP_MIN_ANALYSIS_FPS
+    rate._last_decrease = 0.0
+    rate.update(latency_ms=10_000, inference_ms=10, backlog=5, fair_share_fps=0)
+    assert rate.effective_fps == RTSP_MIN_ANALYSIS_FPS
+
+
+def test_weighted_policy_follows_priorities():
+    scheduler = make_scheduler("weighted", {"low": 1, "high": 3})
+    counts = simulate(scheduler, 400)
+    assert abs(counts["high"] / counts["low"] - 3) < 0.1
+
+
+def test_round_robin_policy_alternates():
+    scheduler = make_scheduler("round_robin", {"a": 1, "b": 3, "c": 1})
+    order = [scheduler._workers.pick(time.monotonic()).stream_id for _ in range(6)]
+    assert order == ["a", "b", "c", "a", "b", "c"]
+
+
+def test_workers_analyze_latest_frame_of_registered_streams():
+    scheduler = InferenceScheduler(workers=2)
+    slot = FrameSlot()
+    analyzed = []
+    done = threading.Event()
+
+    def analyze(sequence, frame, timestamp):
+        analyzed.append(sequence)
+        done.set()
+
+    scheduler.register("cam1", slot, analyze, target_fps=1000)
+    try:
+        slot.publish(np.zeros((4, 4, 3), dtype=np.uint8))
+        assert done.wait(2)
+        assert analyzed == [1]
+        assert scheduler.get_stream_stats("cam1")["frames_analyzed"] == 1
+    finally:
+        scheduler.unregister("cam1")
+        scheduler.stop()
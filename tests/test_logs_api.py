@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.api import log_filters, logs
+from app.api.log_filters import decode_cursor, encode_cursor
+from app.database.connection import engine
+from app.database.migrations import normalize_sqlite_timestamps
+from app.database.models import DetectionLog, Person
+from app.services.counters import counter_service
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def client(db):
+    log_filters._total_cache.clear()
+    app = FastAPI()
+    app.include_router(logs.router, prefix="/api")
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def add_logs(db, count, person_id=None, source="rtsp", tie_every=3):
+    """Logs com detected_at repetido a cada `tie_every` registros (empates resolvidos pelo id)"""
+    for i in range(count):
+        db.add(DetectionLog(person_id=person_id, confidence=0.9, source=source,
+                            detected_at=BASE_TIME + timedelta(seconds=i // tie_every)))
+    db.commit()
+    counter_service.reconcile(db)
+
+
+def fetch_all(client, limit, **params):
+    pages, cursor = [], None
+    while True:
+        query = {"limit": limit, "include_total": False, **params}
+        if cursor:
+            query["cursor"] = cursor
+        body = client.get("/api/logs", params=query).json()
+        pages.append([log["id"] for log in body["logs"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    detected_at = datetime(2024, 5, 6, 7, 8, 9, 123456, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(detected_at, 42)) == (detected_at, 42)
+    with pytest.raises(HTTPException):
+        decode_cursor("inválido")
+
+
+def test_keyset_pages_cover_every_row_once_in_order(db, client):
+    add_logs(db, 10)
+
+    pages = fetch_all(client, limit=4)
+    ids = [log_id for page in pages for log_id in page]
+    assert [len(page) for page in pages] == [4, 4, 2]
+    assert ids == list(range(10, 0, -1))
+
+
+def test_cursor_is_stable_when_new_rows_arrive(db, client):
+    add_logs(db, 6)
+    first = client.get("/api/logs", params={"limit": 3, "include_total": False}).json()
+
+    # Logs novos entram no topo e não deslocam as páginas seguintes
+    db.add(DetectionLog(confidence=0.9, source="rtsp", detected_at=BASE_TIME + timedelta(days=1)))
+    db.commit()
+    second = client.get("/api/logs", params={"limit": 3, "include_total": False,
+                                             "cursor": first["next_cursor"]}).json()
+    assert [log["id"] for log in first["logs"]] == [6, 5, 4]
+    assert [log["id"] for log in second["logs"]] == [3, 2, 1]
+
+
+def test_filters_and_total(db, client):
+    person = Person(name="Ana")
+    db.add(person)
+    db.commit()
+    add_logs(db, 4, person_id=person.id)
+    add_logs(db, 3, source="upload")
+
+    body = client.get("/api/logs", params={"person_id": person.id}).json()
+    assert body["total"] == 4
+    assert {log["person_name"] for log in body["logs"]} == {"Ana"}
+    assert client.get("/api/logs").json()["total"] == 7
+    assert fetch_all(client, limit=2, source="upload") == [[7, 6], [5]]
+
+
+@pytest.mark.parametrize("start_time", ["2023-12-31T21:00:02-03:00", "2024-01-01T00:00:02"])
+def test_time_bounds_are_compared_in_utc(db, client, start_time):
+    add_logs(db, 5, tie_every=1)
+
+    body = client.get("/api/logs", params={"start_time": start_time}).json()
+    assert [log["id"] for log in body["logs"]] == [5, 4, 3]
+    assert body["total"] == 3
+
+
+def test_timestamp_normalization_runs_once(db):
+    insert = text("INSERT INTO detection_logs (confidence, source, detected_at) "
+                  "VALUES (0.9, 'rtsp', '2024-01-01 00:00:00')")
+    stored = text("SELECT detected_at FROM detection_logs ORDER BY id")
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA user_version = 0"))
+        conn.execute(insert)
+    normalize_sqlite_timestamps(engine)
+
+    with engine.begin() as conn:
+        assert conn.execute(text("PRAGMA user_version")).scalar() == 1
+        conn.execute(insert)
+    normalize_sqlite_timestamps(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(stored).scalars().all() == ["2024-01-01 00:00:00.000000", "2024-01-01 00:00:00"]
@@ -0,0 +1,92 @@
+import gzip
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.api.responses import FastJSONResponse, JSONCompressionMiddleware, parse_accept_encoding
+from app.services.serialization import dumps
+
+LARGE = {"values": list(range(2000))}
+
+
+def make_client(minimum_size=500):
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(JSONCompressionMiddleware, minimum_size=minimum_size)
+
+    @app.get("/large")
+    def large():
+        return LARGE
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([orjson.dumps(LARGE)]), media_type="application/json")
+
+    return TestClient(app)
+
+
+def test_parse_accept_encoding_weights():
+    assert parse_accept_encoding("gzip;q=0.5, br, *;q=0") == {"gzip": 0.5, "br": 1.0, "*": 0.0}
+    assert parse_accept_encoding("gzip;q=abc") == {"gzip": 0.0}
+    assert parse_accept_encoding("") == {}
+
+
+@pytest.mark.parametrize("accept, compressed", [
+    ("gzip", True),
+    ("br, *;q=0.1", True),
+    ("gzip;q=0", False),
+    ("br", False),
+    ("identity", False),
+])
+def test_gzip_negotiation(accept, compressed):
+    response = make_client().get("/large", headers={"Accept-Encoding": accept})
+
+    assert (response.headers.get("content-encoding") == "gzip") is compressed
+    assert response.json() == LARGE
+    if compressed:
+        assert "Accept-Encoding" in response.headers["vary"]
+
+
+def test_small_and_streaming_responses_are_not_compressed():
+    client = make_client()
+    for path in ("/small", "/stream"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+
+def test_compressed_body_is_gzip():
+    with make_client().stream("GET", "/large", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert orjson.loads(gzip.decompress(raw)) == LARGE
+
+
+def test_dumps_supported_types():
+    person = uuid.UUID(int=1)
+    payload = {
+        1: np.float32(0.5),
+        "array": np.arange(3, dtype=np.int64),
+        "strided": np.arange(6)[::2],
+        "at": datetime(2024, 6, 1, 12, tzinfo=timezone.utc),
+        "day": datetime(2024, 6, 1).date(),
+        "price": Decimal("1.25"),
+        "id": person,
+    }
+    assert orjson.loads(dumps(payload)) == {
+        "1": 0.5, "array": [0, 1, 2], "strided": [0, 2, 4], "at": "2024-06-01T12:00:00+00:00",
+        "day": "2024-06-01", "price": 1.25, "id": str(person),
+    }
+
+
+def test_dumps_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
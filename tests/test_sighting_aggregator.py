@@ -0,0 +1,49 @@
+from app.services.sighting_aggregator import SightingAggregator
+
+
+def make_aggregator(**kwargs):
+    closed = []
+    aggregator = SightingAggregator("rtsp", stream_id="cam1", persist=False, on_close=closed.append, **kwargs)
+    return aggregator, closed
+
+
+def test_anonymous_track_is_merged_when_identified():
+    aggregator, closed = make_aggregator(gap_seconds=2.0)
+    aggregator.observe(0.0, 0.70, bbox=(0, 0, 10, 10), track_id=7, frame_ref="cam1#1")
+    aggregator.observe(0.5, 0.95, bbox=(1, 1, 10, 10), track_id=7, frame_ref="cam1#2")
+    aggregator.observe(1.0, 0.80, bbox=(2, 2, 10, 10), person_id=5, track_id=7, frame_ref="cam1#3")
+    aggregator.observe(1.5, 0.60, person_id=5, track_id=7)
+
+    assert aggregator.open_sightings == 1
+    assert aggregator.close_all() == 1
+    sighting = closed[0].to_dict()
+    assert sighting["person_id"] == 5
+    assert sighting["track_id"] == 7
+    assert sighting["started_at"] == 0.0
+    assert sighting["ended_at"] == 1.5
+    assert sighting["detections"] == 4
+    assert sighting["best_confidence"] == 0.95
+    assert sighting["best_bbox"] == [1, 1, 10, 10]
+    assert sighting["best_frame_ref"] == "cam1#2"
+
+
+def test_gap_splits_sightings():
+    aggregator, closed = make_aggregator(gap_seconds=2.0)
+    aggregator.observe(0.0, 0.9, person_id=1)
+    aggregator.observe(1.0, 0.9, person_id=1)
+    aggregator.observe(5.0, 0.9, person_id=1)
+    aggregator.close_all()
+
+    assert [(s.started_at, s.last_seen, s.detections) for s in closed] == [(0.0, 1.0, 2), (5.0, 5.0, 1)]
+
+
+def test_sweep_closes_idle_and_long_sightings():
+    aggregator, closed = make_aggregator(gap_seconds=2.0, max_duration=10.0)
+    aggregator.observe(0.0, 0.9, person_id=1)
+    for t in range(10):
+        aggregator.observe(float(t), 0.9, person_id=2)
+
+    # Pessoa 1 sem detecções há mais de gap_seconds; pessoa 2 além de max_duration
+    assert aggregator.sweep(10.5) == 2
+    assert {s.person_id for s in closed} == {1, 2}
+    assert aggregator.open_sightings == 0
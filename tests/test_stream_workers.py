@@ -0,0 +1,90 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("insightface")
+
+from app.database.models import DetectionLog
+from app.services.detection_log_writer import detection_log_writer
+from app.services.frame_broadcaster import FrameBroadcaster
+from app.services.rtsp_stream_state import create_stream_state
+from app.services.stream_worker_host import StreamHost
+from app.services.stream_worker_supervisor import WorkerSupervisor
+
+
+class StopConn:
+    """Pipe falso da API: envia apenas "stop" e descarta as mensagens do worker"""
+
+    def poll(self, timeout):
+        return True
+
+    def recv(self):
+        return ("stop",)
+
+    def send(self, message):
+        pass
+
+
+class FakeWorker:
+    """WorkerHandle sem processo: aceita todos os comandos"""
+
+    def __init__(self, index, streams=()):
+        self.index = index
+        self.streams = set(streams)
+        self.alive = True
+        self.calls = []
+
+    def call(self, command, stream_id, *args):
+        self.calls.append((command, stream_id))
+        return True, None
+
+    def send(self, message):
+        pass
+
+
+def make_stream():
+    return {'rtsp_url': 'rtsp://cam', 'options': {}, 'worker': None, 'info': {},
+            'broadcaster': SimpleNamespace(viewers=0)}
+
+
+def test_worker_stop_flushes_open_sightings(db):
+    detection_log_writer.start()
+    host = StreamHost(StopConn())
+    state = create_stream_state("cam1", "rtsp://cam1", motion_gating=False)
+    state['broadcaster'] = FrameBroadcaster(state['slot'], lambda frame: frame)
+    host.processor.active_streams["cam1"] = state
+    now = time.time()
+    state['sightings'].observe(now, 0.8, bbox=(1, 2, 3, 4), track_id=3)
+    state['sightings'].observe(now + 0.5, 0.9, bbox=(2, 3, 4, 5), track_id=3)
+
+    host.run()
+
+    rows = db.query(DetectionLog).filter(DetectionLog.stream_id == "cam1").all()
+    assert len(rows) == 1
+    assert rows[0].detection_count == 2
+    assert rows[0].confidence == pytest.approx(0.9)
+
+
+def test_rebalance_moves_streams_to_least_loaded_worker():
+    streams = {f"s{i}": make_stream() for i in range(4)}
+    supervisor = WorkerSupervisor(2, streams)
+    busy, idle = FakeWorker(0, streams), FakeWorker(1)
+    supervisor.workers = [busy, idle]
+
+    assert supervisor.rebalance() == 2
+    assert len(busy.streams) == len(idle.streams) == 2
+    moved = [stream_id for command, stream_id in idle.calls if command == "add"]
+    assert [c for c in busy.calls if c[0] == "remove"] == [("remove", stream_id) for stream_id in moved]
+    assert all(streams[stream_id]['worker'] is idle for stream_id in moved)
+
+
+def test_rebalance_ignores_dead_workers_and_small_differences():
+    streams = {f"s{i}": make_stream() for i in range(3)}
+    supervisor = WorkerSupervisor(3, streams)
+    dead = FakeWorker(2)
+    dead.alive = False
+    supervisor.workers = [FakeWorker(0, ["s0", "s1"]), FakeWorker(1, ["s2"]), dead]
+
+    assert supervisor.rebalance() == 0
+    assert not dead.streams
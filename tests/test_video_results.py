@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import video_results
+from app.api.video import processing_jobs
+from app.services.job_results import JobResultStore
+from app.services.video_results import VideoResultBuilder
+
+ANA = {"person_id": 7, "person_name": "Ana", "confidence": 0.8}
+
+
+def build_results(frames=5):
+    """Resultado de um vídeo em que a Ana aparece nos frames pares"""
+    builder = VideoResultBuilder("/tmp/video.mp4", frames, frame_interval=1.0, start_time=0.0)
+    for index in range(frames):
+        frame = builder.new_frame(index, float(index))
+        identity = ANA if index % 2 == 0 else None
+        builder.add_face(frame, {"bbox": np.array([0, 0, 10, 10]), "confidence": 0.9}, 1, identity,
+                         inherited=index > 0)
+        builder.end_frame(frame, 1)
+    builder.add_sighting({"started_at": 0.0})
+    return builder.finish(tracks_created=1)
+
+
+def test_builder_assembles_timeline_and_statistics():
+    results = build_results()
+
+    timeline = results["person_timeline"][7]
+    assert [a["frame_index"] for a in timeline["appearances"]] == [0, 2, 4]
+    assert timeline["total_time"] == 3.0
+    assert timeline["average_confidence"] == pytest.approx(0.8)
+    assert results["statistics"]["unique_persons_found"] == [7]
+    assert results["statistics"]["total_faces_detected"] == 5
+    assert results["detections_by_frame"][1]["faces"][0]["recognition"] is None
+    assert results["detections_by_frame"][2]["faces"][0]["recognition"]["inherited"] is True
+
+
+def test_store_persists_pages_and_deletes(tmp_path):
+    store = JobResultStore(tmp_path)
+    summary = store.save("job1", build_results())
+
+    assert summary["frames_analyzed"] == 5
+    assert summary["persons"] == [{"person_id": 7, "name": "Ana", "appearances": 3, "total_time": 3.0,
+                                   "average_confidence": pytest.approx(0.8)}]
+    assert JobResultStore(tmp_path).load_summary("job1") == summary
+
+    frames, total = store.get_frames("job1", offset=3, limit=10)
+    assert total == 5
+    assert [f["frame_index"] for f in frames] == [3, 4]
+    assert frames[0]["faces"][0]["bbox"] == [0, 0, 10, 10]
+    assert store.get_frames("job1", offset=9) == ([], 5)
+    assert list(store.get_timeline("job1")) == ["7"]
+
+    store.delete("job1")
+    assert store.load_summary("job1") is None
+    assert store.get_frames("job1") is None
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = JobResultStore(tmp_path)
+    monkeypatch.setattr(video_results, "job_result_store", store)
+    store.save("done", build_results())
+    monkeypatch.setitem(processing_jobs, "done", {"status": "completed"})
+    monkeypatch.setitem(processing_jobs, "busy", {"status": "processing"})
+
+    app = FastAPI()
+    app.include_router(video_results.router, prefix="/api")
+    return TestClient(app)
+
+
+def test_frames_pagination(client):
+    page = client.get("/api/video/job/done/frames", params={"offset": 2, "limit": 2}).json()
+    assert [f["frame_index"] for f in page["frames"]] == [2, 3]
+    assert (page["total"], page["next_offset"]) == (5, 4)
+
+    last = client.get("/api/video/job/done/frames", params={"offset": 4, "limit": 2}).json()
+    assert last["next_offset"] is None
+
+
+def test_timeline_routes(client):
+    persons = client.get("/api/video/job/done/timeline").json()["persons"]
+    assert persons[0]["timeline_url"] == "/api/video/job/done/timeline/7"
+
+    page = client.get("/api/video/job/done/timeline/7", params={"limit": 2}).json()
+    assert [a["frame_index"] for a in page["appearances"]] == [0, 2]
+    assert (page["name"], page["total"], page["next_offset"]) == ("Ana", 3, 2)
+
+    assert client.get("/api/video/job/done/timeline/99").status_code == 404
+
+
+def test_unfinished_and_unknown_jobs(client):
+    assert client.get("/api/video/job/busy/summary").status_code == 400
+    assert client.get("/api/video/job/missing/summary").status_code == 404
+    assert client.get("/api/video/job/done/summary").json()["job_id"] == "done"